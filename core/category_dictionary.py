@@ -0,0 +1,73 @@
+import os
+import json
+import pandas as pd
+from core.funnel_schema import CATEGORICAL_COLUMNS
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY_ROOT = os.path.join(_PROJECT_ROOT, "storage", "dictionaries")
+
+# Every Funnel Import frame loaded for a client encodes its categorical breakdowns against one dictionary per
+# column, so frames from the mirror, a stored snapshot and a fresh download share the same categories and
+# concat, merge and isin stay on integer codes. A dictionary only grows: values seen once stay in it. It is
+# kept sorted so categorical ordering (pivots, sort_values) matches plain string ordering.
+_DICTIONARIES = {}
+
+
+def _path(client_name):
+    safe = "".join(c if c.isalnum() or c in " -_." else "_" for c in str(client_name))
+    return os.path.join(DICTIONARY_ROOT, f"{safe}.json")
+
+
+def load_dictionary(client_name):
+    """The client's {column: [values]} dictionary, read from disk once per process."""
+    if client_name not in _DICTIONARIES:
+        try:
+            with open(_path(client_name), "r") as f:
+                _DICTIONARIES[client_name] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _DICTIONARIES[client_name] = {}
+    return _DICTIONARIES[client_name]
+
+
+def _save_dictionary(client_name, dictionary):
+    os.makedirs(DICTIONARY_ROOT, exist_ok=True)
+    path = _path(client_name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(dictionary, f, indent=1)
+    os.replace(tmp, path)
+
+
+def encode_dimensions(client_name, df):
+    """df with the categoricals apply_schema made of its breakdowns (CATEGORICAL_COLUMNS, matched on stripped
+    header) set to the client's dictionary. Values the dictionary has not seen are added to it and saved.
+
+    Frames held in a cache or the window memo were encoded against the dictionary as it was then, so they
+    are passed through here again when read: old and new frames then share one category list and concat
+    stays categorical. Columns already on the current dictionary are left as they are."""
+    dictionary = load_dictionary(client_name)
+    columns = [
+        col for col in df.columns
+        if str(col).strip() in CATEGORICAL_COLUMNS and isinstance(df[col].dtype, pd.CategoricalDtype)
+    ]
+    if not columns:
+        return df
+
+    grown = False
+    for col in columns:
+        name = str(col).strip()
+        known = dictionary.get(name, [])
+        new = set(map(str, df[col].cat.categories)).difference(known)
+        if new:
+            dictionary[name] = sorted(new.union(known))
+            grown = True
+    if grown:
+        _save_dictionary(client_name, dictionary)
+
+    stale = [col for col in columns if not df[col].cat.categories.equals(pd.Index(dictionary[str(col).strip()]))]
+    if not stale:
+        return df
+    df = df.copy(deep=False)
+    for col in stale:
+        df[col] = df[col].cat.set_categories(dictionary[str(col).strip()])
+    return df
@@ -0,0 +1,41 @@
+import os
+import copy
+import json
+import threading
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(_PROJECT_ROOT, "storage", "config.json")
+
+# storage/config.json parsed once per process and indexed by client name. The file is re-read only when its
+# mtime or size changes (init_clients rewrites it), so the long-running MCP server validates client names
+# without touching the disk on every tool call.
+_state = {"stamp": None, "clients": [], "by_name": {}}
+_lock = threading.Lock()
+
+
+def _load():
+    st = os.stat(CONFIG_PATH)
+    stamp = (CONFIG_PATH, st.st_mtime_ns, st.st_size)
+    with _lock:
+        if _state["stamp"] != stamp:
+            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                clients = json.load(f)
+            _state["clients"] = clients
+            _state["by_name"] = {c["name"]: c for c in clients}
+            _state["stamp"] = stamp
+        return _state
+
+
+def get_clients():
+    """Every client config in file order. Each dict is a copy the caller is free to modify."""
+    return copy.deepcopy(_load()["clients"])
+
+
+def get_client_config(client_name):
+    """The config for client_name (a copy), or None if no client has that name."""
+    client = _load()["by_name"].get(client_name)
+    return copy.deepcopy(client) if client is not None else None
+
+
+def client_names():
+    return [c["name"] for c in _load()["clients"]]
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+# Set in DataFrame.attrs on frames sort_by_date has ordered. pandas carries attrs through row subsets and
+# column assignments, so the cube and everything filtered from it skip the sortedness check.
+SORTED_BY_DATE = 'sorted_by_date'
+
+
+def sort_by_date(df):
+    """df ordered by Date, NaT last. The sort is stable, so rows on the same day keep their order, and a frame
+    that is already in date order (the Funnel Import normally is) comes back with its rows untouched."""
+    if df.attrs.get(SORTED_BY_DATE):
+        return df
+    if df['Date'].is_monotonic_increasing:
+        df = df.copy(deep=False)
+    else:
+        df = df.sort_values('Date', kind='stable', na_position='last')
+    df.attrs[SORTED_BY_DATE] = True
+    return df
+
+
+def date_span(df, start, end):
+    """(first, stop) row positions of the days in [start, end] in a frame sorted by Date, by binary search."""
+    dates = df['Date'].to_numpy()
+    first = dates.searchsorted(np.datetime64(pd.Timestamp(start)), side='left')
+    stop = dates.searchsorted(np.datetime64(pd.Timestamp(end)), side='right')
+    return int(first), int(max(first, stop))
+
+
+def window_rows(df, ranges):
+    """Row positions, ascending, of a Date-sorted frame that fall in any of the (start, end) ranges.
+    Overlapping ranges are merged so a row is only returned once."""
+    spans = sorted(date_span(df, start, end) for start, end in ranges)
+    merged = []
+    for first, stop in spans:
+        if merged and first <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], stop)
+        else:
+            merged.append([first, stop])
+    if not merged:
+        return np.arange(0)
+    return np.concatenate([np.arange(first, stop) for first, stop in merged])
+
+
+def date_ranges(date_range):
+    """The (start, end) ranges set_date_range describes: the primary window plus the compare window if set."""
+    ranges = [(date_range['start_date'], date_range['end_date'])]
+    if date_range.get('compare_start_date') and date_range.get('compare_end_date'):
+        ranges.append((date_range['compare_start_date'], date_range['compare_end_date']))
+    return ranges
@@ -0,0 +1,66 @@
+import numpy as np
+
+# Derived metrics as (name, numerator, denominator, multiplier) over additive measures. Every ratio the
+# reports show is declared here once and evaluated by add_derived, on grouped rows and total rows alike.
+CTR = ('CTR', 'Clicks', 'Impressions', 100)
+CPC = ('CPC', 'Cost', 'Clicks', 1)
+CPA = ('CPA', 'Cost', 'Conversions', 1)
+ROAS = ('ROAS', 'Transaction Revenue', 'Cost', 100)
+AOV = ('AOV', 'Transaction Revenue', 'Transactions', 1)
+TRANSACTION_RATE = ('Conversion Rate', 'Transactions', 'Clicks', 100)
+CONVERSION_RATE = ('Conversion Rate', 'Conversions', 'Clicks', 100)
+SESSION_TRANSACTION_RATE = ('Conversion Rate', 'Transactions', 'Sessions', 100)
+SESSION_CONVERSION_RATE = ('Conversion Rate', 'Conversions', 'Sessions', 100)
+IMPRESSION_SHARE = ('Impression Share', 'Search Impressions', 'Total Eligible Impressions – Estimated', 100)
+ABS_TOP_IMPRESSION_SHARE = ('Abs. Top Impression Share', 'Total Absolute Top Impressions', 'Search Impressions', 100)
+VIEW_RATE = ('View Rate', 'Views', 'Impressions', 100)
+HOOK_RATE = ('Hook Rate', 'Hooks', 'Impressions', 100)
+HOLD_RATE = ('Hold Rate', 'Holds', 'Impressions', 100)
+CPV = ('CPV', 'Cost', 'Views', 1)
+COST_PER_HOOK = ('Cost Per Hook', 'Cost', 'Hooks', 1)
+
+# Every derived metric in output order. A name declared more than once (Conversion Rate) resolves to the
+# first definition whose inputs the frame has: transactions before conversions, clicks before sessions.
+DERIVED_METRICS = [
+    ROAS, CPA, CTR, CPC,
+    TRANSACTION_RATE, CONVERSION_RATE, SESSION_TRANSACTION_RATE, SESSION_CONVERSION_RATE,
+    AOV, VIEW_RATE, HOOK_RATE, HOLD_RATE, CPV, COST_PER_HOOK,
+    IMPRESSION_SHARE, ABS_TOP_IMPRESSION_SHARE,
+]
+
+
+def resolve_derived(columns, names=None):
+    """The registry definitions computable from columns, one per name, optionally limited to names."""
+    available = set(columns)
+    resolved = {}
+    for definition in DERIVED_METRICS:
+        name, numerator, denominator, _ = definition
+        if name in resolved or (names is not None and name not in names):
+            continue
+        if numerator in available and denominator in available:
+            resolved[name] = definition
+    return list(resolved.values())
+
+
+def add_derived(df, derived=None, default=0.0):
+    """df with derived metric columns added, in order.
+
+    derived is a list of registry definitions; by default every one the frame's columns can feed. All the
+    ratios are computed in one numpy division. As with safe_div, a zero or missing denominator (or a
+    missing numerator) gives default. A definition may use a metric derived earlier in the same list."""
+    derived = resolve_derived(df.columns) if derived is None else list(derived)
+    while derived:
+        # Each pass takes every ratio whose inputs already exist, so chained ratios come in later passes
+        ready = [d for d in derived if d[1] in df.columns and d[2] in df.columns]
+        if not ready:
+            missing = sorted({c for _, n, d, _ in derived for c in (n, d) if c not in df.columns})
+            raise KeyError(f"Derived metrics need missing columns: {missing}")
+        numerators = df[[d[1] for d in ready]].to_numpy(dtype='float64')
+        denominators = df[[d[2] for d in ready]].to_numpy(dtype='float64')
+        multipliers = np.array([d[3] for d in ready], dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = numerators / np.where(denominators == 0, np.nan, denominators) * multipliers
+        values[np.isnan(values)] = default
+        df = df.assign(**{name: values[:, i] for i, (name, _, _, _) in enumerate(ready)})
+        derived = [d for d in derived if d not in ready]
+    return df
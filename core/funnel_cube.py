@@ -0,0 +1,31 @@
+from core.funnel_schema import metric_columns
+from core.date_index import sort_by_date
+
+# The breakdowns nearly every report query rolls up to. Funnel Import rows are at ad/asset grain, so summing
+# them to one row per day and breakdown leaves a far smaller frame for every later filter and groupby.
+CUBE_DIMENSIONS = ('Date', 'Ad Channel', 'Ad Platform', 'Channel', 'Campaign', 'Week number (ISO)', 'Month', 'Year')
+
+
+def build_cube(df, dimensions=()):
+    """Roll a Funnel Import frame up to one row per day and breakdown, summing only the additive metrics.
+
+    The keys are CUBE_DIMENSIONS plus any extra dimensions (a client's configured dimension, a cut's
+    dimension or filter columns), matched on their stripped header. The cube keeps the sheet's column order,
+    so positional readers such as the generate_df builders and the traps checks run on it unchanged.
+    Columns that are neither keys nor metrics are left blank. Blank and missing key values form their own
+    rows. The cube is sorted by Date so date windows can be sliced by binary search; rows on the same day
+    keep the order they first appear in."""
+    wanted = {*CUBE_DIMENSIONS, *(str(d).strip() for d in dimensions)}
+    keys = [col for col in df.columns if str(col).strip() in wanted]
+    metrics = [col for col in metric_columns(df) if col not in keys]
+    if not keys:
+        return df
+
+    cube = (
+        df.groupby(keys, sort=False, dropna=False, observed=True)[metrics]
+        .sum()
+        .reset_index()
+    )
+    blanks = {col: '' for col in df.columns if col not in keys and col not in metrics}
+    cube = cube.assign(**blanks).reindex(columns=df.columns)
+    return sort_by_date(cube) if 'Date' in keys else cube
@@ -0,0 +1,188 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import glob
+import json
+import argparse
+import pandas as pd
+from datetime import datetime, timedelta
+from core.error_logger import log_error
+from core.client_config import client_names
+from core.sheets_session import get_worksheet
+from core.sheet_reader import column_letter, first_row_on_or_after
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIRROR_ROOT = os.path.join(_PROJECT_ROOT, "storage", "mirror")
+
+# Days before the last synced date that are pulled again on every sync, so GA4 restatements land in the mirror.
+MIRROR_LOOKBACK_DAYS = int(os.environ.get("FUNNEL_MIRROR_LOOKBACK_DAYS", 7))
+# A mirror older than this is ignored by initialise_df, which falls back to the live sheet.
+MIRROR_MAX_AGE_HOURS = float(os.environ.get("FUNNEL_MIRROR_MAX_AGE_HOURS", 12))
+
+
+def _open_worksheet(worksheet):
+    return get_worksheet(worksheet)
+
+
+def _client_dir(client_name):
+    return os.path.join(MIRROR_ROOT, client_name)
+
+
+def _state_path(client_name):
+    return os.path.join(_client_dir(client_name), "_state.json")
+
+
+def _load_state(client_name):
+    try:
+        with open(_state_path(client_name), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _save_state(client_name, state):
+    with open(_state_path(client_name), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def _normalise_for_storage(df):
+    """Give every column a single Parquet type: numeric where every non-blank cell parses, text otherwise."""
+    df = df.copy()
+    for col in df.columns:
+        if col == 'Date' or pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        blank = df[col].isna() | (df[col] == '')
+        numeric = pd.to_numeric(df[col].where(~blank), errors='coerce')
+        if numeric.notna().sum() == (~blank).sum():
+            df[col] = numeric
+        else:
+            df[col] = df[col].where(~blank, '').astype(str)
+    return df
+
+
+def _records_to_df(header, rows):
+    width = len(header)
+    rows = [(row + [''] * width)[:width] for row in rows]
+    df = pd.DataFrame(rows, columns=header)
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
+    return df.loc[df['Date'].notna()]
+
+
+def _pull_rows_since(ws, header, cutoff):
+    """Read only the sheet rows from the first row dated on/after cutoff downwards (the tab is appended in date order)."""
+    first_row = first_row_on_or_after(ws, column_letter(header.index('Date')), cutoff)
+    rows = ws.get(f"A{first_row}:{column_letter(len(header) - 1)}")
+    df = _records_to_df(header, rows)
+    return df.loc[df['Date'] >= cutoff]
+
+
+def _write_partitions(client_name, df):
+    for month, part in df.groupby(df['Date'].dt.strftime('%Y-%m'), sort=True):
+        part.to_parquet(os.path.join(_client_dir(client_name), f"{month}.parquet"), index=False)
+
+
+def _read_partitions(client_name, since_month=None):
+    paths = sorted(glob.glob(os.path.join(_client_dir(client_name), "*.parquet")))
+    if since_month is not None:
+        paths = [p for p in paths if os.path.basename(p)[:7] >= since_month]
+    if not paths:
+        return None
+    return pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+
+
+def sync_client(client_name, lookback_days=None, full=False):
+    """Mirror '{client_name} Funnel Import' into storage/mirror/{client_name}/YYYY-MM.parquet.
+
+    The first sync (or a header change) pulls the whole tab. Later syncs pull only rows dated on or after
+    last_synced_date - lookback_days and rewrite the month partitions they touch.
+
+    A whole-tab pull starts a new generation (see mirror_generation) and clears the client's window memo,
+    whose closed segments may have been restated further back than the look-back reaches."""
+    lookback_days = MIRROR_LOOKBACK_DAYS if lookback_days is None else lookback_days
+    ws = _open_worksheet(f"{client_name} Funnel Import")
+    header = ws.row_values(1)
+    state = _load_state(client_name)
+    os.makedirs(_client_dir(client_name), exist_ok=True)
+
+    if full or state is None or state.get("columns") != header:
+        # window_memo imports this module for the look-back
+        from core.window_memo import invalidate
+
+        for path in glob.glob(os.path.join(_client_dir(client_name), "*.parquet")):
+            os.remove(path)
+        df = pd.DataFrame(ws.get_all_records())
+        df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+        df = _normalise_for_storage(df)
+        _write_partitions(client_name, df)
+        pulled = len(df)
+        generation = datetime.now().isoformat()
+        invalidate(client_name)
+    else:
+        cutoff = (pd.Timestamp(state["last_synced_date"]) - pd.DateOffset(days=lookback_days)).normalize()
+        fresh = _normalise_for_storage(_pull_rows_since(ws, header, cutoff))
+        kept = _read_partitions(client_name, since_month=cutoff.strftime('%Y-%m'))
+        if kept is not None:
+            kept = kept.loc[kept['Date'] < cutoff]
+            fresh = pd.concat([kept, fresh], ignore_index=True)
+        _write_partitions(client_name, fresh)
+        df = fresh
+        pulled = len(fresh) - (0 if kept is None else len(kept))
+        generation = state.get("generation")
+
+    last_date = df['Date'].max() if not df.empty else pd.Timestamp(state["last_synced_date"])
+    _save_state(client_name, {
+        "columns": header,
+        "last_synced_date": last_date.strftime('%Y-%m-%d'),
+        "synced_at": datetime.now().isoformat(),
+        "generation": generation,
+    })
+    return pulled
+
+
+def mirror_generation(client_name):
+    """When the client's mirror last pulled its whole tab (None if it never has since generations were
+    recorded). Incremental syncs keep it, so data derived from days outside the look-back stays valid until
+    it changes."""
+    state = _load_state(client_name)
+    return None if state is None else state.get("generation")
+
+
+def mirror_is_fresh(client_name, max_age_hours=None):
+    """True when the client has a mirror synced within max_age_hours."""
+    max_age_hours = MIRROR_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    state = _load_state(client_name)
+    if state is None:
+        return False
+    return datetime.now() - datetime.fromisoformat(state["synced_at"]) <= timedelta(hours=max_age_hours)
+
+
+def load_mirror(client_name, max_age_hours=None):
+    """Return the mirrored Funnel Import frame, or None when there is no mirror or it is older than max_age_hours."""
+    if not mirror_is_fresh(client_name, max_age_hours):
+        return None
+    state = _load_state(client_name)
+    df = _read_partitions(client_name)
+    if df is None:
+        return None
+    return df[state["columns"]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync Funnel Import tabs into the local Parquet mirror")
+    parser.add_argument("--client", help="Client name as it appears in config.json (default: every client)")
+    parser.add_argument("--lookback-days", type=int, default=None, help="Days re-pulled before the last synced date")
+    parser.add_argument("--full", action="store_true", help="Ignore the existing mirror and pull the whole tab")
+    args = parser.parse_args()
+
+    if args.client:
+        names = [args.client]
+    else:
+        names = client_names()
+
+    for name in names:
+        try:
+            rows = sync_client(name, lookback_days=args.lookback_days, full=args.full)
+            print(f"{name}: {rows} rows pulled")
+        except Exception as e:
+            log_error(f"{name} funnel_mirror: sync failed: {e}")
@@ -0,0 +1,25 @@
+import pandas as pd
+
+# Periods that get a total row, and the breakdown label it carries
+TOTAL_PERIODS = ("Current", "Previous")
+TOTAL_LABEL = "Total"
+
+
+def rollup(df, keys, metrics):
+    """Sum metrics by keys ([period column, breakdown]) and add a Total row for each period, like SQL
+    GROUPING SETS ((period, breakdown), (period)). Rows outside TOTAL_PERIODS are dropped."""
+    df_grouped = df.groupby(keys, as_index=False, observed=True)[metrics].sum()
+    return rollup_totals(df_grouped, keys, metrics)
+
+
+def rollup_totals(df_grouped, keys, metrics):
+    """The (period) grouping set for a frame already summed by keys. Totals are rolled up from the grouped
+    rows rather than the raw ones, and every period gets one (zero when it has no rows)."""
+    df_grouped = df_grouped.loc[df_grouped[keys[0]].isin(TOTAL_PERIODS)]
+    totals = (
+        df_grouped.groupby(keys[0], observed=True)[metrics].sum()
+        .reindex(list(TOTAL_PERIODS), fill_value=0)
+        .reset_index(names=keys[0])
+    )
+    totals.insert(1, keys[1], TOTAL_LABEL)
+    return pd.concat([df_grouped, totals], ignore_index=True)
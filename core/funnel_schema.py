@@ -0,0 +1,75 @@
+import os
+import pandas as pd
+
+# Declared layout of a "{client} Funnel Import" tab. Columns are matched on their stripped header text.
+DATE_COLUMNS = ('Date',)
+
+# Breakdowns the reports filter and group on, stored as categoricals (blanks stay as ''). The high-cardinality
+# ones repeat a few thousand names across millions of rows, so integer codes are far smaller than strings
+CATEGORICAL_COLUMNS = ('Ad Channel', 'Ad Platform', 'Channel', 'Campaign', 'Campaign Group', 'Asset')
+
+# Free-text breakdowns -- kept as strings, blanks stay as ''
+TEXT_COLUMNS = ('Department',)
+
+# Time buckets Funnel exports next to Date; left exactly as the sheet provides them
+TIME_COLUMNS = ('Week number (ISO)', 'Month', 'Year')
+
+METRIC_COLUMNS = (
+    'Sessions', 'Impressions', 'Clicks', 'Cost (GBP)', 'Cost', 'Conversions', 'Transactions',
+    'Transaction Revenue (GBP)', 'Transaction Revenue', 'Search Impressions',
+    'Total Eligible Impressions – Estimated', 'Total Absolute Top Impressions', 'Views', 'Hooks', 'Holds',
+)
+
+# The metric block starts at column 8 in every tab (generate_df indexes into it by position). Undeclared
+# columns from here on are treated as metrics when every non-blank cell is numeric.
+METRIC_START = 8
+
+# float64 by default; set FUNNEL_METRIC_DTYPE=float32 to halve metric memory on the largest accounts
+METRIC_DTYPE = os.environ.get('FUNNEL_METRIC_DTYPE', 'float64')
+
+
+def _is_numeric_column(series):
+    blank = series.isna() | (series == '')
+    parsed = pd.to_numeric(series.where(~blank), errors='coerce')
+    return parsed.notna().sum() == (~blank).sum()
+
+
+def metric_columns(df):
+    """Return the columns of a Funnel Import frame that hold metrics, in sheet order."""
+    declared_other = set(DATE_COLUMNS + CATEGORICAL_COLUMNS + TEXT_COLUMNS + TIME_COLUMNS)
+    metrics = []
+    for i, col in enumerate(df.columns):
+        name = str(col).strip()
+        if name in METRIC_COLUMNS:
+            metrics.append(col)
+        elif i >= METRIC_START and name not in declared_other and _is_numeric_column(df[col]):
+            metrics.append(col)
+    return metrics
+
+
+def apply_schema(df, metric_dtype=None):
+    """Coerce a raw Funnel Import frame to its declared types in one pass.
+
+    Date becomes datetime64, the report breakdowns become categoricals, free-text breakdowns
+    become strings with '' for blanks, and every metric column becomes metric_dtype (blank cells -> NaN)."""
+    metric_dtype = METRIC_DTYPE if metric_dtype is None else metric_dtype
+    df = df.copy()
+    columns = {str(col).strip(): col for col in df.columns}
+
+    for name in DATE_COLUMNS:
+        if name in columns and not pd.api.types.is_datetime64_any_dtype(df[columns[name]]):
+            df[columns[name]] = pd.to_datetime(df[columns[name]], format='%Y-%m-%d', errors='coerce')
+
+    metrics = metric_columns(df)
+    if metrics:
+        df[metrics] = df[metrics].apply(pd.to_numeric, errors='coerce').astype(metric_dtype)
+
+    for name in CATEGORICAL_COLUMNS:
+        if name in columns and columns[name] not in metrics:
+            df[columns[name]] = df[columns[name]].fillna('').astype(str).astype('category')
+
+    for name in TEXT_COLUMNS:
+        if name in columns and columns[name] not in metrics:
+            df[columns[name]] = df[columns[name]].fillna('').astype(str)
+
+    return df
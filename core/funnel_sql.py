@@ -0,0 +1,142 @@
+import os
+import numpy as np
+import pandas as pd
+from core.date_index import sort_by_date, date_ranges
+from core.funnel_rollup import TOTAL_LABEL, TOTAL_PERIODS
+
+# 'pandas' runs every funnel query on the in-memory frame as before. 'duckdb' compiles the window and cut
+# aggregations to one SQL query each, run by DuckDB in-process over the same frame (no copy) on every core;
+# worth it for clients with millions of rows. DuckDB is optional: pip install duckdb to use it.
+QUERY_ENGINE = os.environ.get('FUNNEL_QUERY_ENGINE', 'pandas')
+
+
+def use_sql():
+    """Whether funnel queries go to DuckDB; raises if it is selected but not installed."""
+    if QUERY_ENGINE == 'pandas':
+        return False
+    if QUERY_ENGINE != 'duckdb':
+        raise ValueError(f"Unknown query engine '{QUERY_ENGINE}'. Must be 'pandas' or 'duckdb'")
+    try:
+        import duckdb  # noqa: F401
+    except ImportError as e:
+        raise ImportError("FUNNEL_QUERY_ENGINE=duckdb needs the duckdb package (pip install duckdb)") from e
+    return True
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sums(df, metrics):
+    # Floats are summed with DuckDB's compensated fsum, as pandas does, and ints stay ints. An empty or
+    # all-missing group sums to 0, like groupby
+    sums = []
+    for col in metrics:
+        if df[col].dtype.kind == 'f':
+            sums.append(f"COALESCE(fsum({_quote(col)}), 0) AS {_quote(col)}")
+        else:
+            sums.append(f"COALESCE(CAST(SUM({_quote(col)}) AS BIGINT), 0) AS {_quote(col)}")
+    return sums
+
+
+def _query(tables, sql, params=None):
+    """Run sql with each {name: frame} in tables registered as a view and return the result as a frame."""
+    import duckdb
+
+    with duckdb.connect() as con:
+        for name, frame in tables.items():
+            con.register(name, frame)
+        return con.execute(sql, params or []).df()
+
+
+def _restore_dtypes(result, df, columns):
+    # DuckDB hands ints back as int64 or float64 and strings as str; the builders expect df's own dtypes
+    return result.astype({col: df[col].dtype for col in columns if result[col].dtype != df[col].dtype})
+
+
+def sql_aggregate_segments(df, segments, keys, metrics):
+    """aggregate_segments (see funnel_windows) as one query. Every segment is joined to its rows by date
+    range, so a row shared by several segments is read once. Groups come back in the order pandas gives
+    them (by segment, then by each group's first row) and blank or missing keys form their own groups."""
+    if not segments:
+        return {}
+    df = sort_by_date(df)
+    funnel = df[['Date'] + keys + metrics].assign(__row=np.arange(len(df)))
+    bounds = pd.DataFrame({
+        '__segment': np.arange(len(segments)),
+        '__start': pd.to_datetime([start for start, _, _ in segments]),
+        '__end': pd.to_datetime([end for _, end, _ in segments]),
+    })
+    columns = ', '.join(f"f.{_quote(key)}" for key in keys)
+    grouped = _query({'funnel': funnel, 'segments': bounds}, f"""
+        SELECT s.__segment, {columns}{', ' if keys else ''}{', '.join(_sums(df, metrics))}, MIN(f.__row) AS __first
+        FROM funnel f JOIN segments s ON f."Date" BETWEEN s.__start AND s.__end
+        GROUP BY s.__segment{', ' if keys else ''}{columns}
+        ORDER BY s.__segment, __first
+    """)
+    grouped = _restore_dtypes(grouped.drop(columns='__first'), df, keys + metrics)
+    parts = grouped.groupby('__segment', sort=False).indices
+    return {
+        segment: grouped.iloc[parts.get(i, [])].drop(columns='__segment').reset_index(drop=True)
+        for i, segment in enumerate(segments)
+    }
+
+
+def _filter_clauses(df, filters):
+    # _apply_scope_filters as SQL: list values are IN, anything else equality, columns not in df ignored.
+    # Columns are compared as text so a value outside a categorical's categories simply matches nothing
+    clauses, params = [], []
+    for col, val in (filters or {}).items():
+        if col not in df.columns:
+            continue
+        values = val if isinstance(val, list) else [val]
+        if not values:
+            clauses.append('FALSE')
+            continue
+        clauses.append(f"CAST({_quote(col)} AS VARCHAR) IN ({', '.join('?' * len(values))})")
+        params += [str(v) for v in values]
+    return clauses, params
+
+
+def sql_rollup_periods(df, date_range, period_start, breakdown, metrics, nonblank=(), filters=None):
+    """One query for a Period comparison table: rows in date_range's windows (see date_ranges) with a
+    breakdown value, nonblank columns set and the scope filters matched, tagged Current from period_start
+    on and Previous before it, then summed by GROUPING SETS ((Period, breakdown), (Period)).
+
+    Returns exactly what rollup(df, ['Period', breakdown], metrics) gives for the same rows: the grouped
+    rows sorted by Period and breakdown, then a Total row for each of TOTAL_PERIODS."""
+    windows = date_ranges(date_range)
+    clauses = [' OR '.join('("Date" BETWEEN ? AND ?)' for _ in windows)]
+    params = [pd.Timestamp(day) for window in windows for day in window]
+    for col in [breakdown, *nonblank]:
+        if col in df.columns:
+            clauses.append(f"CAST({_quote(col)} AS VARCHAR) <> ''")
+    scope, scope_params = _filter_clauses(df, filters)
+    clauses += scope
+    params += scope_params
+
+    filtered = [col for col in [*nonblank, *(filters or {})] if col in df.columns]
+    columns = list(dict.fromkeys(['Date', breakdown, *filtered, *metrics]))
+    grouped = _query({'funnel': df[columns]}, f"""
+        WITH tagged AS (
+            SELECT CASE WHEN "Date" >= ? THEN 'Current' ELSE 'Previous' END AS "Period", *
+            FROM funnel WHERE {' AND '.join(f'({c})' for c in clauses)}
+        )
+        SELECT "Period", {_quote(breakdown)}, {', '.join(_sums(df, metrics))},
+               GROUPING({_quote(breakdown)}) AS __total
+        FROM tagged
+        GROUP BY GROUPING SETS (("Period", {_quote(breakdown)}), ("Period"))
+        ORDER BY __total, "Period", {_quote(breakdown)}
+    """, [pd.Timestamp(period_start)] + params)
+
+    detail = grouped.loc[grouped['__total'] == 0].drop(columns='__total')
+    detail = _restore_dtypes(detail, df, [breakdown, *metrics]).reset_index(drop=True)
+    totals = (
+        grouped.loc[grouped['__total'] == 1, ['Period', *metrics]]
+        .set_index('Period')
+        .reindex(list(TOTAL_PERIODS), fill_value=0)
+        .reset_index()
+    )
+    totals = _restore_dtypes(totals, df, metrics)
+    totals.insert(1, breakdown, TOTAL_LABEL)
+    return pd.concat([detail, totals], ignore_index=True)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from core.funnel_schema import metric_columns
+from core.date_index import sort_by_date, window_rows, date_ranges
+from core.funnel_sql import sql_aggregate_segments, use_sql
+
+# Breakdowns every report table can be cut by; the client's configured dimension is added per call
+WINDOW_KEYS = ('Ad Channel', 'Ad Platform', 'Channel', 'Week number (ISO)')
+
+
+def window_min_date(windows):
+    """Earliest day any window reaches, so the caller can bound its Funnel Import read."""
+    starts = [w[k] for w in windows.values() for k in ('start_date', 'compare_start_date') if w.get(k)]
+    return min(starts) if starts else None
+
+
+def window_keys(df, dimensions=()):
+    """The breakdown keys and metric columns the window aggregates of df are summed over."""
+    keys = list(dict.fromkeys(k for k in (*WINDOW_KEYS, *dimensions) if k in df.columns))
+    metrics = [col for col in metric_columns(df) if col not in keys]
+    return keys, metrics
+
+
+def window_segments(window):
+    """The disjoint (start, end, period) day spans a window covers: its date ranges with any overlap merged,
+    split at period_start so every span is wholly 'Current' or wholly 'Previous'."""
+    spans = []
+    for start, end in sorted((pd.Timestamp(start), pd.Timestamp(end)) for start, end in date_ranges(window)):
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+
+    period_start = pd.Timestamp(window['period_start'])
+    segments = []
+    for start, end in spans:
+        if start < period_start <= end:
+            segments.append((start, period_start - pd.Timedelta(days=1), 'Previous'))
+            segments.append((period_start, end, 'Current'))
+        else:
+            segments.append((start, end, 'Current' if start >= period_start else 'Previous'))
+    return segments
+
+
+def aggregate_segments(df, segments, keys, metrics):
+    """{segment: frame} of df's metrics summed by keys over each (start, end, period) segment.
+
+    Each segment's rows are sliced out of the Date-sorted frame by binary search and tagged, and all of
+    them are summed in a single groupby. Blank breakdown values are kept (dropna=False). With
+    FUNNEL_QUERY_ENGINE=duckdb the same aggregation runs as one SQL query (see funnel_sql)."""
+    if not segments:
+        return {}
+    if use_sql():
+        return sql_aggregate_segments(df, segments, keys, metrics)
+    df = sort_by_date(df)
+    rows = [window_rows(df, [(start, end)]) for start, end, _ in segments]
+    tagged = df.iloc[np.concatenate(rows)][keys + metrics]
+    tagged.insert(0, '__segment', np.repeat(np.arange(len(segments)), [len(idx) for idx in rows]))
+    grouped = (
+        tagged.groupby(['__segment'] + keys, sort=False, dropna=False, observed=True)[metrics]
+        .sum()
+        .reset_index()
+    )
+    parts = grouped.groupby('__segment', sort=False).indices
+    return {
+        segment: grouped.iloc[parts.get(i, [])].drop(columns='__segment').reset_index(drop=True)
+        for i, segment in enumerate(segments)
+    }
+
+
+def aggregate_windows(df, windows, dimensions=(), segment_frames=None):
+    """Aggregate a Funnel Import frame for several named date windows in one grouped pass.
+
+    windows maps a name to a date range as set_date_range builds it (start_date, end_date and optionally
+    compare_start_date/compare_end_date) plus period_start, the day rows start counting as 'Current'.
+    Each window is split into day segments (window_segments); segments shared by several windows are
+    summed once, by aggregate_segments, and each window is put back together from its segments.
+    segment_frames holds aggregates already known (e.g. from the window memo), which are not recomputed.
+
+    Every returned frame keeps the sheet's column order with Period appended, exactly like apply_filters
+    output, so the positional generate_df builders run on it unchanged. Columns that are neither keys nor
+    metrics are left blank. Blank breakdown values are kept (dropna=False); callers drop them per table."""
+    keys, metrics = window_keys(df, dimensions)
+    segments = {name: window_segments(window) for name, window in windows.items()}
+    known = dict(segment_frames or {})
+    needed = [seg for seg in dict.fromkeys(seg for segs in segments.values() for seg in segs) if seg not in known]
+    known.update(aggregate_segments(df, needed, keys, metrics))
+
+    layout = df.columns.tolist() + ['Period']
+    blanks = {col: '' for col in layout if col not in keys + metrics + ['Period', 'Date']}
+    frames = {}
+    for name, segs in segments.items():
+        part = pd.concat([known[seg].assign(Period=seg[2]) for seg in segs], ignore_index=True)
+        if len({seg[2] for seg in segs}) < len(segs):
+            # Two spans in the same period (compare and primary ranges both before or after period_start)
+            part = (
+                part.groupby(['Period'] + keys, sort=False, dropna=False, observed=True)[metrics]
+                .sum()
+                .reset_index()
+            )
+        frames[name] = part.assign(**blanks).reindex(columns=layout)
+    return frames
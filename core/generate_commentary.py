@@ -1,6 +1,7 @@
 import json
 from openai import OpenAI
 import pandas as pd
+from core.metric_values import strip_raw
 
 with open("storage/secrets.json", "r") as f:
     secrets = json.load(f)
@@ -216,7 +217,7 @@ def generate_weekly_commentary(client):
                                 "- You may reference overall_data only when it strengthens the story (e.g. 'this channel drove the overall change').\n"
                                 "- If paid_data[<channel>].total exists you may use it, but don't rely on it if it hides important opposing movements.\n"
                     "Input JSON:\n"
-                    + json.dumps(payload, ensure_ascii=False)
+                    + json.dumps(strip_raw(payload), ensure_ascii=False)
                 ),
             }
         ],
@@ -350,7 +351,7 @@ def generate_dimension_cut_commentary(data_mom, label, channel_filter, client):
                     "account_type: Ecommerce or Lead Gen — use the appropriate primary KPI "
                     "(ROAS for Ecommerce, CPA for Lead Gen).\n\n"
                     "Input JSON:\n"
-                    + json.dumps(payload, ensure_ascii=False)
+                    + json.dumps(strip_raw(payload), ensure_ascii=False)
                 )
             }
         ],
@@ -438,7 +439,7 @@ def generate_mtd_slide_content(client):
                 "Generate mtd_overview summary and bullets for the month-to-date performance slide.\n"
                 "Use paid_data_mtd as the primary source. Comparison is YoY (same days last year).\n"
                 "Input JSON:\n"
-                + json.dumps(payload, ensure_ascii=False)
+                + json.dumps(strip_raw(payload), ensure_ascii=False)
             )
         }],
         text={
@@ -772,7 +773,7 @@ def generate_monthly_slide_content(client):
                     "Choose graph_type, metrics, and style based on what would most clearly evidence the completed task's outcome.\n\n"
 
                     "Input JSON:\n"
-                    + json.dumps(payload, ensure_ascii=False)
+                    + json.dumps(strip_raw(payload), ensure_ascii=False)
                 )
             }
         ],
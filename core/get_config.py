@@ -1,32 +1,15 @@
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import gspread
 import json
-from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
 from core.error_logger import log_error
+from core.sheets_session import get_worksheet
 
 
 def init_clients():
-    with open("storage/secrets.json","r") as f:
-        secrets = json.load(f)
-
-    scope = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(
-        secrets["google_service_account"], 
-        scope
-    )
-    sa = gspread.authorize(creds)
-
-
     # Initial Config -- Declare Global Variables and initialise datasets
-    sh = sa.open('Weekly Reports')
-    cfg = sh.worksheet("Config")
+    cfg = get_worksheet("Config", source="secrets")
     ws_config = pd.DataFrame(cfg.get_all_records()).iloc[:, 1:]
     clients = []
     for column in ws_config:
@@ -3,18 +3,37 @@ import numpy as np
 import json
 import locale
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from core.safe_div import safe_div
+from core.error_logger import log_error
+from core.sheet_cache import find_snapshot, get_snapshot, peek_snapshot, put_snapshot
+from core.funnel_mirror import load_mirror, mirror_is_fresh
+from core.sheets_session import get_worksheet, open_spreadsheet, spreadsheet_revision
+from core.snapshot_store import read_snapshot, write_snapshot, variant_key
+from core.funnel_schema import apply_schema
+from core.category_dictionary import encode_dimensions
+from core.metric_values import RAW_KEY
+from core.funnel_windows import (
+    aggregate_windows, aggregate_segments, window_keys, window_min_date, window_segments,
+)
+from core.window_memo import MEMO_ENABLED, is_closed, memoised_segments, read_segments, write_segments
+from core.funnel_cube import build_cube
+from core.small_frames import pivot_periods
+from core.date_index import sort_by_date, window_rows, date_ranges
+from core.sheet_reader import read_worksheet, values_to_df
 from pandas.tseries.offsets import MonthEnd
 from weekly_reports.generate_df import *
 
 
-# Main workflow
-def get_funnel_data(client, table_type):
-    df = initialise_df(client)
-    date_range = set_date_range(client, table_type)
+# Main workflow. window_df is a frame already cut to this table's dates by aggregate_windows; without it the
+# Funnel Import is loaded and filtered here
+def get_funnel_data(client, table_type, window_df=None):
     breakdown_dimension = set_breakdown_dimensions(client,table_type)
-    df = apply_filters(df, client, breakdown_dimension, date_range)
+    if window_df is None:
+        df = load_cube(client, [client['dimension']])
+        date_range = set_date_range(client, table_type)
+        df = apply_filters(df, client, breakdown_dimension, date_range)
+    else:
+        df = window_df.loc[window_df[breakdown_dimension[0]] != '']
     
     # Basic Compare
     if table_type in ["paid_lead_gen", "paid_ecommerce","overall_lead_gen", "overall_ecommerce"]:
@@ -30,6 +49,54 @@ def get_funnel_data(client, table_type):
     return(final_data)
 
 
+# Build every table a report needs in one pass over the Funnel Import. windows maps a name to
+# (window, table_types), where window is window_range() output; returns {name: {table_type: data}}
+def get_funnel_data_windows(client, windows):
+    ranges = {name: window for name, (window, _) in windows.items()}
+    frames = memo_aggregate_windows(client, ranges, [client['dimension']])
+    return {
+        name: {table_type: get_funnel_data(client, table_type, frames[name]) for table_type in table_types}
+        for name, (_, table_types) in windows.items()
+    }
+
+# aggregate_windows over the client's cube, with closed segments (see window_memo) served from the on-disk
+# memo. The cube is loaded once, from the earliest segment not already on disk; closed segments computed
+# here are memoised once the data runs far enough past them
+def memo_aggregate_windows(client, windows, dimensions):
+    if not MEMO_ENABLED:
+        df = load_cube(client, dimensions, min_date=window_min_date(windows))
+        return aggregate_windows(df, windows, dimensions)
+
+    segments = list(dict.fromkeys(seg for window in windows.values() for seg in window_segments(window)))
+    closed = [seg for seg in segments if is_closed(seg)]
+    on_disk = memoised_segments(client['name'], dimensions, closed)
+    pending = [seg for seg in segments if seg not in on_disk] or segments[-1:]
+
+    min_date = min(seg[0] for seg in pending)
+    df = load_cube(client, dimensions, min_date=min_date)
+    keys, metrics = window_keys(df, dimensions)
+    memoised = read_segments(client['name'], df.columns, dimensions, on_disk)
+    missing = [seg for seg in closed if seg not in memoised]
+    if any(seg[0] < min_date for seg in missing):
+        # Only memoised under an older sheet layout: the cube has to reach back to them after all
+        df = load_cube(client, dimensions, min_date=min(seg[0] for seg in missing))
+    if missing:
+        computed = aggregate_segments(df, missing, keys, metrics)
+        last_date = df['Date'].max()
+        write_segments(client['name'], df.columns, dimensions, {
+            seg: frame for seg, frame in computed.items() if pd.notna(last_date) and is_closed(seg, last_date)
+        })
+        memoised.update(computed)
+    # Segments pickled earlier (possibly by another process) can carry an older or newer dictionary than the
+    # cube: encoding them first grows it to cover both, then the cube is brought up to the same categories
+    memoised = {seg: encode_dimensions(client['name'], frame) for seg, frame in memoised.items()}
+    df = encode_dimensions(client['name'], df)
+    return aggregate_windows(df, windows, dimensions, memoised)
+
+# The date range for a table type plus the day its rows start counting as 'Current' (the client's start date)
+def window_range(client, table_type):
+    return {**set_date_range(client, table_type), 'period_start': client['start_date']}
+
 # Set the date range that the dataset will be filtered by
 def set_date_range(client, table_type):
     if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
@@ -63,55 +130,28 @@ def set_breakdown_dimensions(client, table_type):
 
 # Generate a json object that has all the data for the 
 def get_llm_data(client, breakdown_dimension, df, table_type):
-    # Create a list of all the ad channels in the client dataset
+    # Create a list of all the ad channels in the client dataset, keeping those that have a table spec
     ad_channels = df['Ad Channel'].dropna().unique().tolist()
-    final_data = {}
+    specs = {channel: channel_spec(channel, client['account_type']) for channel in ad_channels}
+    specs = {channel: spec for channel, spec in specs.items() if spec is not None}
+    if not specs:
+        return {}
 
-    # Loop through all the channels and create a json entry broken down by breakdown
-    for channel in ad_channels:
-        # Skip over any channels that are not within logic
-        if channel not in ['Combined', 'Display', 'Shopping', 'Paid Search', 'Performance Max', 'Paid Social', 'Paid Social Static', 'Paid Social Video', 'Video']:
-            continue
+    # Sum every channel's metrics in one groupby; each channel's table then only picks its own columns
+    headers = list(df.columns.values)
+    sources = {channel: spec_sources(headers, spec) for channel, spec in specs.items()}
+    metric_union = list(dict.fromkeys(col for cols in sources.values() for col in cols))
+    keys = ['Ad Channel', breakdown_dimension[1], breakdown_dimension[0]]
+    grouped = df.groupby(keys, as_index=False, observed=True)[metric_union].sum()
 
-        # Create df and filter down to the current channel
-        df_llm = df.copy()
-        mask = (df['Ad Channel'] == channel)
-        df_llm = df_llm.loc[mask]
-
-        # Create a list of all the headers in the df
-        headers = list(df_llm.columns.values)
-
-        # Find the relevant function for the current ad channel
-        if channel == 'Paid Search':
-            if client['account_type'] == 'Lead Gen':
-                df_llm = paid_search_lead_gen(df_llm, breakdown_dimension,  headers, table_type)
-            else:
-                df_llm = paid_search_ecommerce(df_llm, breakdown_dimension,  headers, table_type)
-        if channel in ('Shopping', 'Combined', 'Performance Max'):
-            if client['account_type'] == 'Lead Gen':
-                df_llm = paid_shopping_lead_gen(df_llm, breakdown_dimension,  headers, table_type)
-            else:
-                df_llm = paid_shopping_ecommerce(df_llm, breakdown_dimension,  headers, table_type)
-        if channel == 'Display':
-            if client['account_type'] == 'Lead Gen':
-                df_llm = paid_display_lead_gen(df_llm, breakdown_dimension,  headers, table_type)
-            else:
-                df_llm = paid_display_ecommerce(df_llm, breakdown_dimension,  headers, table_type)
-        if channel == 'Video':
-            if client['account_type'] == 'Lead Gen':
-                df_llm = paid_video_lead_gen(df_llm, breakdown_dimension,  headers, table_type)
-            else:
-                df_llm = paid_video_ecommerce(df_llm, breakdown_dimension,  headers, table_type)
-        if channel == 'Paid Social Video':
-            if client['account_type'] == 'Lead Gen':
-                df_llm = paid_social_video_lead_gen(df_llm, breakdown_dimension,  headers, table_type)
-            else:
-                df_llm = paid_social_video_ecommerce(df_llm, breakdown_dimension,  headers, table_type)
-        if channel in ('Paid Social Static', 'Paid Social'):
-            if client['account_type'] == 'Lead Gen':
-                df_llm = paid_social_static_lead_gen(df_llm, breakdown_dimension,  headers, table_type)
-            else:
-                df_llm = paid_social_static_ecommerce(df_llm, breakdown_dimension,  headers, table_type)
+    # Partition the grouped rows by channel once; each channel takes its own rows by position
+    partitions = grouped.groupby('Ad Channel', observed=True, sort=False).indices
+
+    final_data = {}
+    for channel, spec in specs.items():
+        columns = [grouped.columns.get_loc(col) for col in keys[1:] + sources[channel]]
+        df_llm = grouped.iloc[partitions.get(channel, []), columns].reset_index(drop=True)
+        df_llm = finish_table(df_llm, sources[channel], spec, table_type)
 
         # Collate all the relevant metrics and create a pivot table that can be turned into json          
         metrics = [col for col in df_llm.columns if col not in breakdown_dimension]
@@ -128,58 +168,160 @@ def get_llm_data(client, breakdown_dimension, df, table_type):
 
 # Create the json for the datasets that are just looking to compare one period against another with one breakdown
 def get_comparison_data(df, breakdown_dimension, table_type):
-    if table_type == 'paid_ecommerce':
-        df = paid_ecommerce(df, breakdown_dimension, table_type)
-
-    if table_type == 'paid_lead_gen':
-        df = paid_lead_gen(df, breakdown_dimension, table_type)
-
-    if table_type == 'overall_ecommerce':
-        df = overall_ecommerce(df, breakdown_dimension, table_type)
-
-    if table_type == 'overall_lead_gen':
-        df = overall_lead_gen(df, breakdown_dimension, table_type)
+    df = build_table(df, breakdown_dimension, TABLE_SPECS[table_type], table_type)
 
     metrics = [col for col in df.columns if col not in breakdown_dimension]
     df = pivot_df(df, breakdown_dimension, metrics, table_type)
     final_data = df_to_json(df, breakdown_dimension, metrics, table_type)
     return(final_data)
 
-# Initialise the dataframe
-def initialise_df(client):
-    scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive.file", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name('storage/creds.json', scope)
-    sa = gspread.authorize(creds)
-    # Initial Config -- Declare Global Variables and initialise datasets (filename=serene-lotus-379510-b3f9b3b23758)
-    sh = sa.open('Weekly Reports')
+# Initialise the dataframe -- the Funnel Import tab is downloaded once per process and shared via the snapshot cache
+def initialise_df(client, columns=None, min_date=None):
     locale.setlocale(locale.LC_ALL, 'en_GB.UTF-8')
     client['report_type'] = 'normal'
-    ws = sh.worksheet(f"{client['name']} Funnel Import")
-    df = pd.DataFrame(ws.get_all_records())
-    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+    # Report runs set data_min_date to the earliest day any of their windows reach, so every call in the run
+    # shares one bounded read instead of pulling the client's whole history
+    min_date = client.get('data_min_date') if min_date is None else min_date
+    worksheet = f"{client['name']} Funnel Import"
+
+    # A full snapshot (e.g. one primed by prefetch_funnel_imports) already covers any projection
+    full = peek_snapshot(client['name'], worksheet)
+    if full is None and columns is None and min_date is None:
+        full = get_snapshot(client['name'], worksheet, lambda: _load_funnel_import(client['name'], worksheet))
+    # Cached frames were encoded against the dictionary as it was then; encode_dimensions brings them up to date
+    if full is not None:
+        return encode_dimensions(client['name'], project_df(full, columns, min_date))
+
+    min_date = pd.Timestamp(min_date) if min_date is not None else None
+    # So does a projected read held for wider columns and earlier dates (the MCP server's cuts and trends
+    # each ask for their own projection)
+    wider = find_snapshot(client['name'], lambda key: _covers(key, worksheet, columns, min_date))
+    if wider is not None:
+        return encode_dimensions(client['name'], project_df(wider, columns, min_date))
+
+    key = (worksheet, tuple(columns) if columns else None, min_date)
+    df = get_snapshot(client['name'], key, lambda: _load_funnel_import(client['name'], worksheet, columns, min_date))
+    return encode_dimensions(client['name'], df)
+
+# Whether a projected read cached under key = (worksheet, columns, min_date) holds every requested column
+# and every day from min_date on
+def _covers(key, worksheet, columns, min_date):
+    if not (isinstance(key, tuple) and len(key) == 3 and key[0] == worksheet):
+        return False
+    _, cached_columns, cached_min_date = key
+    if cached_columns is not None and (not columns or not set(columns) <= set(cached_columns)):
+        return False
+    return cached_min_date is None or (min_date is not None and cached_min_date <= min_date)
+
+# Whichever copy is read, its breakdowns are encoded against the client's stable category dictionary
+def _load_funnel_import(client_name, worksheet, columns=None, min_date=None):
+    return encode_dimensions(client_name, _read_funnel_import(client_name, worksheet, columns, min_date))
+
+# Prefer the local mirror when it has been synced recently, otherwise go to Google Sheets. Types are coerced
+# here, once per download, so nothing downstream has to run pd.to_numeric again
+def _read_funnel_import(client_name, worksheet, columns=None, min_date=None):
+    df = load_mirror(client_name)
+    if df is not None:
+        return project_df(apply_schema(df), columns, min_date)
+
+    # Reuse the copy stored by an earlier run (any process) when the spreadsheet has not changed since
+    revision = _sheet_revision()
+    df = read_snapshot(worksheet, revision)
+    if df is not None:
+        return project_df(df, columns, min_date)
+    variant = variant_key(columns, min_date)
+    df = read_snapshot(worksheet, revision, variant) if variant != 'full' else None
+    if df is not None:
+        return df
+
+    df = apply_schema(download_worksheet(worksheet, columns, min_date))
+    write_snapshot(worksheet, revision, df, variant)
     return df
 
-# Mask the dataframes so that they are within the correct date range
-def apply_filters(df, client, breakdown_dimension, date_range):
-    # Apply Date Mask
-    has_dimension = df[breakdown_dimension[0]] != ''
+# Drive version of the Weekly Reports spreadsheet; None (never matches a stored copy) if the lookup fails
+def _sheet_revision():
+    try:
+        return spreadsheet_revision('Weekly Reports')
+    except Exception as e:
+        log_error(f"get_funnel_data: revision check failed, downloading: {e}")
+        return None
 
-    primary_range = (
-        (df['Date'] >= date_range['start_date']) &
-        (df['Date'] <= date_range['end_date'])
+# The client's daily cube (see funnel_cube): initialise_df's rows rolled up to one row per day and breakdown.
+# Built once per read and cached beside the raw snapshot, so repeated queries in a run group the small frame
+def load_cube(client, dimensions=(), columns=None, min_date=None):
+    df = initialise_df(client, columns, min_date)
+    min_date = client.get('data_min_date') if min_date is None else min_date
+    key = (
+        f"{client['name']} Funnel Import", 'cube', tuple(dimensions),
+        tuple(columns) if columns else None,
+        pd.Timestamp(min_date) if min_date is not None else None,
     )
+    return encode_dimensions(client['name'], get_snapshot(client['name'], key, lambda: build_cube(df, dimensions)))
+
+# Keep the rows dated on/after min_date and the requested columns (plus Date), in sheet order
+def project_df(df, columns=None, min_date=None):
+    if min_date is not None:
+        df = df.loc[df['Date'] >= pd.Timestamp(min_date)]
+    if columns:
+        wanted = set(columns) | {'Date'}
+        df = df[[col for col in df.columns if col in wanted]]
+    return df
+
+# Download and parse a worksheet from the Weekly Reports spreadsheet. With columns or min_date only those
+# A1 ranges are fetched; the positional generate_df builders need the full width, so they pass neither
+def download_worksheet(worksheet, columns=None, min_date=None):
+    # Weekly Reports spreadsheet (filename=serene-lotus-379510-b3f9b3b23758)
+    ws = get_worksheet(worksheet)
+    if columns or min_date is not None:
+        return read_worksheet(ws, columns, min_date)
+    df = pd.DataFrame(ws.get_all_records())
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+    return df
 
-    compare_range = bool(date_range.get('compare_start_date')) and bool(date_range.get('compare_end_date'))
+# Tabs requested per values.batchGet call -- keeps each response a manageable size for the largest accounts
+BATCH_FETCH_CHUNK = 10
+
+# Download the Funnel Import tab for every client in a few values.batchGet calls and prime the snapshot cache,
+# so the per-client initialise_df calls that follow cost no further Sheets reads
+def prefetch_funnel_imports(client_names):
+    names = [name for name in dict.fromkeys(client_names) if not mirror_is_fresh(name)]
+    if not names:
+        return
+
+    # Tabs stored at the current revision are loaded from disk; only the rest are downloaded
+    revision = _sheet_revision()
+    stale = []
+    for name in names:
+        df = read_snapshot(f"{name} Funnel Import", revision)
+        if df is None:
+            stale.append(name)
+        else:
+            put_snapshot(name, f"{name} Funnel Import", encode_dimensions(name, df))
+    names = stale
+    if not names:
+        return
+
+    sh = open_spreadsheet('Weekly Reports')
+    for i in range(0, len(names), BATCH_FETCH_CHUNK):
+        chunk = names[i:i + BATCH_FETCH_CHUNK]
+        ranges = [gspread.utils.absolute_range_name(f"{name} Funnel Import") for name in chunk]
+        try:
+            response = sh.values_batch_get(ranges)
+        except Exception as e:
+            # A missing or renamed tab fails the whole batch; those clients fall back to single-tab downloads
+            log_error(f"prefetch_funnel_imports: batch of {', '.join(chunk)} failed: {e}")
+            continue
+        for name, value_range in zip(chunk, response.get('valueRanges', [])):
+            df = apply_schema(values_to_df(value_range.get('values', [])))
+            put_snapshot(name, f"{name} Funnel Import", encode_dimensions(name, df))
+            write_snapshot(f"{name} Funnel Import", revision, df)
 
-    if compare_range:
-        in_compare_range = (
-            (df['Date'] >= date_range['compare_start_date']) &
-            (df['Date'] <= date_range['compare_end_date'])
-        )
-        mask = has_dimension & (primary_range | in_compare_range)
-    else:
-        mask = has_dimension & primary_range
-    df = df.loc[mask]
+# Mask the dataframes so that they are within the correct date range
+def apply_filters(df, client, breakdown_dimension, date_range):
+    # Slice the date windows out of the Date-sorted frame by binary search; only the breakdown needs a mask
+    df = sort_by_date(df)
+    df = df.iloc[window_rows(df, date_ranges(date_range))]
+    df = df.loc[df[breakdown_dimension[0]] != '']
 
     # Categorise Date Periods //TO DO: Need to make sure this isn't pulling into the time series data
     df.loc[df['Date'] >= client['start_date'], 'Period'] = 'Current'
@@ -190,20 +332,15 @@ def apply_filters(df, client, breakdown_dimension, date_range):
 # Create a pivoted version of the data
 def pivot_df(df_grouped, breakdown_dimension, metrics, table_type):
     if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        df_pivot = (
-            df_grouped.pivot(index=breakdown_dimension[0], columns=breakdown_dimension[1], values=metrics)
-            .reindex(columns=pd.MultiIndex.from_product([metrics, ["Current", "Previous"]]))  # ensures both exist
-        )
-        
-        df_pivot.columns = [f"{metric}__{period.lower()}" for metric, period in df_pivot.columns]
-        df_pivot = df_pivot.reset_index()
-        
+        df_pivot = pivot_periods(df_grouped, breakdown_dimension[0], breakdown_dimension[1], metrics, ["Current", "Previous"])
+
+        # Deltas and percentage changes, added in one go rather than one column insert at a time
+        changes = {}
         for metric in metrics:
-            df_pivot[f"{metric}__delta"] = df_pivot[f"{metric}__current"] - df_pivot[f"{metric}__previous"]
-            df_pivot[f"{metric}__pct"] = (
-                df_pivot[f"{metric}__delta"]
-                / df_pivot[f"{metric}__previous"].replace(0, np.nan)
-            )
+            delta = df_pivot[f"{metric}__current"] - df_pivot[f"{metric}__previous"]
+            changes[f"{metric}__delta"] = delta
+            changes[f"{metric}__pct"] = delta / df_pivot[f"{metric}__previous"].replace(0, np.nan)
+        df_pivot = df_pivot.assign(**changes)
 
     else:
         df_pivot = (
@@ -212,63 +349,54 @@ def pivot_df(df_grouped, breakdown_dimension, metrics, table_type):
 
     return(df_pivot)
 
-# Convert datafram to json format
-def df_to_json(df_pivot, breakdown_dimension, metrics, table_type):    
-    int_metrics = ["Impressions", "Clicks", "Transactions", "Conversions", "Sessions", "Holds", "Hooks", "Views"]
-    pct_metrics = ["CTR", "Conversion Rate", "ROAS", "Impression Share", "Abs. Top Impression Share", "View Rate", "Hook Rate", "Hold Rate"]
-    gbp_metrics = ["Cost", "Transaction Revenue", "CPA", "CPC", "AOV", "CPV", "Cost Per Hook"]
-
-    output = {}
-    # Create a json for when there is comparison
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        for _, row in df_pivot.iterrows():
-            breakdown = row[breakdown_dimension[0]]
-            output[breakdown] = {}
-
-            for metric in metrics: 
-                if metric in int_metrics:
-                    output[breakdown][metric] = {
-                        "curr":  fmt_int(row[f"{metric}__current"]),
-                        "prev":  fmt_int(row[f"{metric}__previous"]),
-                        "delta": fmt_int(row[f"{metric}__delta"]),
-                        "pct":   pct_diff(row[f"{metric}__pct"]),
-                }
-                elif metric in pct_metrics:
-                    output[breakdown][metric] = {
-                        "curr":  fmt_pct(row[f"{metric}__current"]),
-                        "prev":  fmt_pct(row[f"{metric}__previous"]),
-                        "delta": fmt_pct(row[f"{metric}__delta"]),
-                        "pct":   pct_diff(row[f"{metric}__pct"]),
-                }
-                elif metric in gbp_metrics:
-                    output[breakdown][metric] = {
-                        "curr":  fmt_gbp(row[f"{metric}__current"]),
-                        "prev":  fmt_gbp(row[f"{metric}__previous"]),
-                        "delta": fmt_gbp(row[f"{metric}__delta"]),
-                        "pct":   pct_diff(row[f"{metric}__pct"]),
-                }
-                    
-    # Create a json for when there is comparison
-    else: 
-        for _, row in df_pivot.iterrows():
-            breakdown = row[breakdown_dimension[0]]
-            output[breakdown] = {}
-
-            for metric in metrics: 
-                if metric in int_metrics:
-                    output[breakdown][metric] = {
-                        "curr":  fmt_int(row[metric]),
-                }
-                elif metric in pct_metrics:
-                    output[breakdown][metric] = {
-                        "curr":  fmt_pct(row[metric]),
-                }
-                elif metric in gbp_metrics:
-                    output[breakdown][metric] = {
-                        "curr":  fmt_gbp(row[metric]),
-                }
-
-    return output
+# Metric formats for the json payloads; a metric in none of these lists is left out
+INT_METRICS = ["Impressions", "Clicks", "Transactions", "Conversions", "Sessions", "Holds", "Hooks", "Views"]
+PCT_METRICS = ["CTR", "Conversion Rate", "ROAS", "Impression Share", "Abs. Top Impression Share", "View Rate", "Hook Rate", "Hold Rate"]
+GBP_METRICS = ["Cost", "Transaction Revenue", "CPA", "CPC", "AOV", "CPV", "Cost Per Hook"]
+
+# Convert datafram to json format. Every metric column is formatted in one pass by its metric class and
+# the nested {breakdown: {metric: {curr, prev, delta, pct}}} dict is zipped together from those columns
+def df_to_json(df_pivot, breakdown_dimension, metrics, table_type):
+    column_formats = {
+        **{m: fmt_gbp_column for m in GBP_METRICS},
+        **{m: fmt_pct_column for m in PCT_METRICS},
+        **{m: fmt_int_column for m in INT_METRICS},
+    }
+    comparison = table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]
+
+    cells = {}
+    for metric in metrics:
+        fmt = column_formats.get(metric)
+        if fmt is None:
+            continue
+        # Create a json for when there is comparison
+        if comparison:
+            columns = {
+                "curr":  df_pivot[f"{metric}__current"],
+                "prev":  df_pivot[f"{metric}__previous"],
+                "delta": df_pivot[f"{metric}__delta"],
+                "pct":   df_pivot[f"{metric}__pct"] * 100,
+            }
+            fields = {
+                "curr":  fmt(columns["curr"]),
+                "prev":  fmt(columns["prev"]),
+                "delta": fmt(columns["delta"]),
+                "pct":   pct_diff_column(df_pivot[f"{metric}__pct"]),
+            }
+        else:
+            columns = {"curr": df_pivot[metric]}
+            fields = {"curr": fmt(columns["curr"])}
+        # The unformatted numbers ride along under RAW_KEY (pct as a percentage, like its display string)
+        raw = [dict(zip(columns, values)) for values in zip(*(_column_values(c) for c in columns.values()))]
+        cells[metric] = [{**dict(zip(fields, values)), RAW_KEY: r} for values, r in zip(zip(*fields.values()), raw)]
+
+    # A repeated breakdown keeps its first position and its last row, as assigning row by row would
+    breakdowns = df_pivot[breakdown_dimension[0]].tolist()
+    if cells:
+        rows = [dict(zip(cells, values)) for values in zip(*cells.values())]
+    else:
+        rows = [{} for _ in breakdowns]
+    return dict(zip(breakdowns, rows))
 
 # Ensure no numpy types are returned
 def to_py(v):
@@ -308,4 +436,21 @@ def fmt_gbp(v):
     v = to_py(v)
     if v is None:
         return "£0.00"  # e.g. "" or "—"
-    return f"£{float(v):,.2f}"
\ No newline at end of file
+    return f"£{float(v):,.2f}"
+
+# Whole-column versions of the formatters above, giving the same string for every cell
+def _column_values(column):
+    return column.astype(object).where(column.notna(), None).tolist()
+
+def fmt_int_column(column):
+    return ["0" if v is None else f"{int(round(v)):,}" for v in _column_values(column)]
+
+def fmt_pct_column(column):
+    return ["0.00%" if v is None else f"{float(v):.2f}%" for v in _column_values(column)]
+
+def fmt_gbp_column(column):
+    return ["£0.00" if v is None else f"£{float(v):,.2f}" for v in _column_values(column)]
+
+def pct_diff_column(column):
+    return ["-" if v is None else f"+{float(v):.2f}%" if v > 0 else f"{float(v):.2f}%"
+            for v in _column_values(column * 100)]
\ No newline at end of file
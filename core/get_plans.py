@@ -1,67 +1,140 @@
 import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import time
 import pandas as pd
 import numpy as np
 import json
+from concurrent.futures import ThreadPoolExecutor
+from core.error_logger import log_error
+from core.sheets_session import open_spreadsheet, spreadsheet_revision
+from core.client_config import get_client_config, get_clients
 
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Plan tabs downloaded at once; kept under sheets_session.POOL_SIZE so every fetch gets a pooled connection
+PLAN_FETCH_WORKERS = int(os.environ.get("PLAN_FETCH_WORKERS", 8))
 
-def _auth_sheets():
-    secrets_path = os.path.join(_PROJECT_ROOT, "storage", "secrets.json")
-    with open(secrets_path, "r") as f:
-        secrets = json.load(f)
-    scope = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(secrets["google_service_account"], scope)
-    return gspread.authorize(creds)
-
-
-def _build_client_plan_from_worksheets(client_name, worksheets):
-    client_plans = {}
-    for i, sheet in enumerate(worksheets):
-        values = sheet.get_all_values()
-        df = pd.DataFrame(values)
-        df.replace("", np.nan, inplace=True)
-        weeks = get_weeks(df)
-        plan_type = "current" if i == 0 else "old"
-        plan = {
-            "client_name": client_name,
-            "plan_start": weeks[0].strftime("%d/%m/%y"),
-            "plan_end": (weeks[-1] + pd.Timedelta(days=5)).strftime("%d/%m/%y"),
-            "plan_status": plan_type,
-            "tasks": get_tasks(df),
-        }
-        client_plans[sheet.title] = plan
-    return client_plans
+# Parsed plans are cached per worksheet under storage/plan_cache/<spreadsheet id>.json. While the spreadsheet's
+# Drive version is unchanged every tab is reused. After an edit the current (first) tab is always fetched again,
+# but archived quarterly tabs are only refreshed once their cached copy is older than this.
+PLAN_CACHE_DIR = os.path.join(_PROJECT_ROOT, "storage", "plan_cache")
+PLAN_ARCHIVE_MAX_AGE_DAYS = float(os.environ.get("PLAN_ARCHIVE_MAX_AGE_DAYS", 28))
+
+
+def _parse_plan_values(values):
+    df = pd.DataFrame(values)
+    df.replace("", np.nan, inplace=True)
+    weeks = get_weeks(df)
+    return {
+        "plan_start": weeks[0].strftime("%d/%m/%y"),
+        "plan_end": (weeks[-1] + pd.Timedelta(days=5)).strftime("%d/%m/%y"),
+        "tasks": get_tasks(df),
+    }
+
+
+def _cache_path(spreadsheet_id):
+    return os.path.join(PLAN_CACHE_DIR, f"{spreadsheet_id}.json")
+
+
+def _read_plan_cache(spreadsheet_id):
+    try:
+        with open(_cache_path(spreadsheet_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"revision": None, "tabs": {}}
+
+
+def _write_plan_cache(spreadsheet_id, cache):
+    os.makedirs(PLAN_CACHE_DIR, exist_ok=True)
+    tmp = f"{_cache_path(spreadsheet_id)}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, _cache_path(spreadsheet_id))
+
+
+def _plan_revision(url):
+    try:
+        return spreadsheet_revision(url=url, source="secrets")
+    except Exception as e:
+        log_error(f"get_plans: revision check failed for {url}, fetching every tab: {e}")
+        return None
+
+
+class _PlanSource:
+    """One client's plan spreadsheet: its tabs, Drive revision and whatever parsed tabs are cached for it."""
+
+    def __init__(self, client_name, url):
+        self.client_name = client_name
+        sh = open_spreadsheet(url=url, source="secrets")
+        self.spreadsheet_id = sh.id
+        self.revision = _plan_revision(url)
+        self.worksheets = sh.worksheets()
+        self.cache = _read_plan_cache(sh.id)
+        self.parsed = [self._cached(i, ws) for i, ws in enumerate(self.worksheets)]
+
+    def _cached(self, index, ws):
+        entry = self.cache["tabs"].get(str(ws.id))
+        if entry is None or entry["title"] != ws.title or self.revision is None:
+            return None
+        if self.cache["revision"] == self.revision:
+            return entry["plan"]
+        age_days = (time.time() - entry["fetched_at"]) / 86400
+        if index > 0 and age_days < PLAN_ARCHIVE_MAX_AGE_DAYS:
+            return entry["plan"]
+        return None
+
+    def stale(self):
+        return [ws for ws, plan in zip(self.worksheets, self.parsed) if plan is None]
+
+    def build(self, fetched):
+        """Combine cached and freshly fetched tabs ({worksheet id: parsed plan}) into the plan json."""
+        client_plans = {}
+        for i, ws in enumerate(self.worksheets):
+            plan = self.parsed[i]
+            if plan is None:
+                plan = fetched[ws.id]
+                self.cache["tabs"][str(ws.id)] = {"title": ws.title, "fetched_at": time.time(), "plan": plan}
+            client_plans[ws.title] = {
+                "client_name": self.client_name,
+                "plan_start": plan["plan_start"],
+                "plan_end": plan["plan_end"],
+                "plan_status": "current" if i == 0 else "old",
+                "tasks": plan["tasks"],
+            }
+        if fetched or self.cache["revision"] != self.revision:
+            live = {str(ws.id) for ws in self.worksheets}
+            self.cache["tabs"] = {k: v for k, v in self.cache["tabs"].items() if k in live}
+            self.cache["revision"] = self.revision
+            _write_plan_cache(self.spreadsheet_id, self.cache)
+        return client_plans
+
+
+def _fetch_tabs(executor, sources):
+    """Download and parse every stale tab of every source on the shared pool; returns {worksheet id: plan}."""
+    worksheets = [ws for source in sources for ws in source.stale()]
+    parsed = executor.map(lambda ws: _parse_plan_values(ws.get_all_values()), worksheets)
+    return {ws.id: plan for ws, plan in zip(worksheets, parsed)}
+
+
+def _load_client_plans(clients):
+    """Plans for [(client_name, plan_url), ...]. Spreadsheet metadata and stale tabs are each fetched concurrently."""
+    if not clients:
+        return {}
+    with ThreadPoolExecutor(max_workers=PLAN_FETCH_WORKERS) as executor:
+        sources = list(executor.map(lambda c: _PlanSource(*c), clients))
+        fetched = _fetch_tabs(executor, sources)
+    return {source.client_name: source.build(fetched) for source in sources}
 
 
 def get_client_plan(client_name: str) -> dict | None:
-    """Fetch the 90-day plan for a single client directly from Google Sheets."""
-    config_path = os.path.join(_PROJECT_ROOT, "storage", "config.json")
-    with open(config_path, "r") as f:
-        clients = json.load(f)
-    client = next((c for c in clients if c["name"] == client_name), None)
+    """Fetch the 90-day plan for a single client from Google Sheets, reusing cached tabs that have not changed."""
+    client = get_client_config(client_name)
     if client is None or not client.get("plan"):
         return None
-    sa = _auth_sheets()
-    sh = sa.open_by_url(client["plan"])
-    return _build_client_plan_from_worksheets(client_name, sh.worksheets())
+    return _load_client_plans([(client_name, client["plan"])])[client_name]
 
 
 def build_plan_json_from_sheet():
-    sa = _auth_sheets()
-    config_path = os.path.join(_PROJECT_ROOT, "storage", "config.json")
-    with open(config_path, "r") as config_json:
-        clients = json.load(config_json)
-    plans = {}
-    for client in clients:
-        sh = sa.open_by_url(client["plan"])
-        plans[client["name"]] = _build_client_plan_from_worksheets(client["name"], sh.worksheets())
+    plans = _load_client_plans([(client["name"], client["plan"]) for client in get_clients()])
     output_path = os.path.join(_PROJECT_ROOT, "storage", "plans.json")
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(plans, f, ensure_ascii=False, indent=2)
@@ -95,24 +168,35 @@ def get_tasks(df):
     df["Start Date"] = pd.to_datetime(df["Start Date"], dayfirst=True, errors="coerce", utc=True)
     df["End Date"]   = pd.to_datetime(df["End Date"],   dayfirst=True, errors="coerce", utc=True)
 
-    # Create a list of tasks, each task is a json objected appended to the 'task' list
-    tasks=[]
-    for idx, row in df.iterrows():
-        if pd.isna(row["Description"]):
-            ad_platform = row["Task"]
-            continue
-        tasks.append(
-            {
-                "name": row["Task"],
-                "desc": row["Description"],
-                "category": row["Category"],
-                "status": row["Status"],
-                "start_date": row["Start Date"].strftime("%d/%m/%y"),
-                "end_date": row["End Date"].strftime("%d/%m/%y"),
-                "platform": ad_platform,
-            }
-        )
-    return tasks
+    # Rows without a Description are platform headers and each task takes the nearest header above it
+    # (a forward fill by position, so a blank row still clears the platform for the tasks under it)
+    is_header = df["Description"].isna().to_numpy()
+    header_rows = np.flatnonzero(is_header)
+    last_header = np.searchsorted(header_rows, np.arange(len(df)), side="right") - 1
+    task_rows = ~is_header
+    if (last_header[task_rows] < 0).any():
+        raise ValueError("Found a task above the first platform header row.")
+    platform = df["Task"].to_numpy(dtype=object)[header_rows[last_header[task_rows]]]
+
+    tasks_df = df.loc[task_rows]
+    for col in ("Start Date", "End Date"):
+        if tasks_df[col].isna().any():
+            raise ValueError(f"Unreadable '{col}' on task(s): {tasks_df.loc[tasks_df[col].isna(), 'Task'].tolist()}")
+
+    # Build every task record in one go rather than row by row
+    tasks = pd.DataFrame({
+        "name": tasks_df["Task"].to_numpy(dtype=object),
+        "desc": tasks_df["Description"].to_numpy(dtype=object),
+        "category": tasks_df["Category"].to_numpy(dtype=object),
+        "status": tasks_df["Status"].to_numpy(dtype=object),
+        "start_date": tasks_df["Start Date"].dt.strftime("%d/%m/%y").to_numpy(dtype=object),
+        "end_date": tasks_df["End Date"].dt.strftime("%d/%m/%y").to_numpy(dtype=object),
+        "platform": platform,
+    }, dtype=object)
+    # Blank cells (a platform cleared by a blank row, an empty Category or Status) are NaN after
+    # _parse_plan_values; they go out as None, since json.dump would write NaN, which is not valid JSON
+    tasks = tasks.where(tasks.notna(), None)
+    return tasks.to_dict("records")
 
 if __name__ == "__main__":
     build_plan_json_from_sheet()
\ No newline at end of file
@@ -1,9 +1,10 @@
 import pandas as pd
 from pandas.tseries.offsets import MonthEnd
 import locale
+from core.metric_values import metric_value
 
 def get_run_rate(client):
-    current_spend = float(client['paid_data']['Total']['Cost']['curr'].replace("£", "").replace(",", ""))
+    current_spend = metric_value(client['paid_data']['Total']['Cost'])
     start_date = client['start_date']
     end_date = client['end_date']
 
@@ -0,0 +1,200 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import json
+import argparse
+import pandas as pd
+import gspread
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Offline stand-in for Google Sheets. Each spreadsheet is a directory under LOCAL_SHEETS_ROOT holding one
+# <tab>.csv or <tab>.parquet per worksheet, plus an optional _tabs.json listing the tab titles in sheet
+# order (get_plans treats the first tab as the current plan). Spreadsheets opened by URL live in a
+# directory named after the spreadsheet key.
+LOCAL_SHEETS_ROOT = os.environ.get("SHEETS_LOCAL_DIR", os.path.join(_PROJECT_ROOT, "storage", "local_sheets"))
+
+_EXTENSIONS = (".csv", ".parquet")
+
+
+def _cell(value):
+    """Render a Parquet value the way the Sheets API returns it: text, '' for blanks, whole floats without .0."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _read_grid(path):
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        return [list(map(str, df.columns))] + [[_cell(v) for v in row] for row in df.itertuples(index=False)]
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return [row for row in csv.reader(f)]
+
+
+class LocalWorksheet:
+    """Read-only worksheet backed by a CSV or Parquet file, covering the gspread calls the reports make."""
+
+    def __init__(self, title, path):
+        self.title = title
+        self.id = title
+        self.path = path
+        self._grid = None
+
+    def _values(self):
+        if self._grid is None:
+            grid = _read_grid(self.path)
+            width = max((len(row) for row in grid), default=0)
+            self._grid = [row + [""] * (width - len(row)) for row in grid]
+        return self._grid
+
+    @property
+    def row_count(self):
+        return len(self._values())
+
+    @property
+    def col_count(self):
+        values = self._values()
+        return len(values[0]) if values else 0
+
+    def get_all_values(self):
+        return [list(row) for row in self._values()]
+
+    def get_all_records(self):
+        values = self._values()
+        if not values:
+            return []
+        header = values[0]
+        return [dict(zip(header, gspread.utils.numericise_all(list(row)))) for row in values[1:]]
+
+    def row_values(self, row):
+        values = self._values()
+        cells = list(values[row - 1]) if row <= len(values) else []
+        while cells and cells[-1] == "":
+            cells.pop()
+        return cells
+
+    def col_values(self, col):
+        cells = [row[col - 1] for row in self._values()]
+        while cells and cells[-1] == "":
+            cells.pop()
+        return cells
+
+    def get(self, range_name):
+        """Values in an A1 range, trimmed like the API: no trailing blank rows or trailing blank cells."""
+        grid = gspread.utils.a1_range_to_grid_range(range_name)
+        values = self._values()
+        rows = values[grid.get("startRowIndex", 0):grid.get("endRowIndex", len(values))]
+        rows = [row[grid.get("startColumnIndex", 0):grid.get("endColumnIndex", self.col_count)] for row in rows]
+        trimmed = []
+        for row in rows:
+            row = list(row)
+            while row and row[-1] == "":
+                row.pop()
+            trimmed.append(row)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+        return trimmed
+
+    def batch_get(self, ranges):
+        return [self.get(range_name) for range_name in ranges]
+
+
+class LocalSpreadsheet:
+    def __init__(self, title, directory):
+        self.title = title
+        self.id = os.path.basename(directory)
+        self.directory = directory
+        self._worksheets = {}
+
+    def _tab_titles(self):
+        order_path = os.path.join(self.directory, "_tabs.json")
+        if os.path.exists(order_path):
+            with open(order_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        names = sorted(os.listdir(self.directory))
+        return [os.path.splitext(n)[0] for n in names if n.endswith(_EXTENSIONS)]
+
+    def worksheet(self, title):
+        ws = self._worksheets.get(title)
+        if ws is None:
+            path = next((os.path.join(self.directory, title + ext) for ext in _EXTENSIONS
+                         if os.path.exists(os.path.join(self.directory, title + ext))), None)
+            if path is None:
+                raise gspread.exceptions.WorksheetNotFound(title)
+            ws = self._worksheets[title] = LocalWorksheet(title, path)
+        return ws
+
+    def worksheets(self):
+        return [self.worksheet(title) for title in self._tab_titles()]
+
+    def values_batch_get(self, ranges):
+        value_ranges = []
+        for range_name in ranges:
+            title, _, a1 = range_name.rpartition("!") if "!" in range_name else (range_name, "", "")
+            ws = self.worksheet(title.strip("'").replace("''", "'"))
+            value_ranges.append({"range": range_name, "values": ws.get(a1) if a1 else ws.get_all_values()})
+        return {"valueRanges": value_ranges}
+
+    def revision(self):
+        """Stands in for the Drive version: the newest modification time of any tab file."""
+        stamps = [os.path.getmtime(os.path.join(self.directory, n)) for n in os.listdir(self.directory)]
+        return str(max(stamps, default=0))
+
+
+class LocalClient:
+    """Mimics the authorised gspread client: open() by title, open_by_url() by spreadsheet key."""
+
+    def __init__(self, root=None):
+        self.root = root or LOCAL_SHEETS_ROOT
+
+    def _open_dir(self, name):
+        directory = os.path.join(self.root, name)
+        if not os.path.isdir(directory):
+            raise gspread.exceptions.SpreadsheetNotFound(f"No local spreadsheet at {directory}")
+        return LocalSpreadsheet(name, directory)
+
+    def open(self, title):
+        return self._open_dir(title)
+
+    def open_by_url(self, url):
+        return self._open_dir(gspread.utils.extract_id_from_url(url))
+
+
+def export_spreadsheet(sh, directory):
+    """Copy every tab of a live spreadsheet into directory as CSV, keeping the tab order in _tabs.json."""
+    os.makedirs(directory, exist_ok=True)
+    titles = []
+    for ws in sh.worksheets():
+        with open(os.path.join(directory, f"{ws.title}.csv"), "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(ws.get_all_values())
+        titles.append(ws.title)
+    with open(os.path.join(directory, "_tabs.json"), "w", encoding="utf-8") as f:
+        json.dump(titles, f, indent=2)
+    return titles
+
+
+if __name__ == "__main__":
+    from core.sheets_session import get_client
+
+    parser = argparse.ArgumentParser(description="Snapshot Google Sheets into the local sheets directory for offline runs.")
+    parser.add_argument("--spreadsheet", default="Weekly Reports", help="Spreadsheet title to export")
+    parser.add_argument("--url", help="Export a spreadsheet by URL instead (stored under its key, as get_plans opens it)")
+    parser.add_argument("--source", default="creds", choices=["creds", "secrets"])
+    args = parser.parse_args()
+
+    sa = get_client(args.source, backend="google")
+    if args.url:
+        sh = sa.open_by_url(args.url)
+        target = os.path.join(LOCAL_SHEETS_ROOT, gspread.utils.extract_id_from_url(args.url))
+    else:
+        sh = sa.open(args.spreadsheet)
+        target = os.path.join(LOCAL_SHEETS_ROOT, args.spreadsheet)
+    tabs = export_spreadsheet(sh, target)
+    print(f"Exported {len(tabs)} tabs to {target}")
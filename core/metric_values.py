@@ -0,0 +1,38 @@
+# Report payloads hold each metric as display strings ({"curr": "£1,234.00", "pct": "+5.20%", ...}) plus the
+# same fields as plain numbers under RAW_KEY, so run rates, charts, totals and sorting work on numbers
+# instead of parsing the strings back. The raw values are dropped from what the MCP tools hand the model.
+RAW_KEY = "raw"
+
+
+def parse_display(s):
+    """Read a number back out of a display string ("£1,234.00", "+5.20%", "1,234"); 0.0 when there is none."""
+    clean = str(s).replace('£', '').replace('%', '').replace(',', '').replace('x', '').strip()
+    try:
+        return float(clean)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def metric_value(vals, field="curr"):
+    """The number behind one field of a metric payload (0.0 when missing).
+
+    Uses the raw value when the payload carries one, and parses the display string otherwise (payloads
+    written before raw values were added, or a bare string)."""
+    if not isinstance(vals, dict):
+        return parse_display(vals if vals is not None else '0')
+    raw = vals.get(RAW_KEY)
+    if isinstance(raw, dict) and field in raw:
+        value = raw[field]
+        return 0.0 if value is None else float(value)
+    return parse_display(vals.get(field, '0'))
+
+
+def strip_raw(payload):
+    """A copy of payload with every raw value block removed, leaving only the display strings."""
+    if isinstance(payload, dict):
+        # Only a metric payload (it has a "curr" field) carries raw values, so a breakdown named "raw" is kept
+        is_metric = "curr" in payload
+        return {k: strip_raw(v) for k, v in payload.items() if not (is_metric and k == RAW_KEY)}
+    if isinstance(payload, list):
+        return [strip_raw(v) for v in payload]
+    return payload
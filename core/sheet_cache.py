@@ -0,0 +1,78 @@
+import os
+import time
+import threading
+import pandas as pd
+
+# How long a downloaded worksheet is served before the next read goes back to Google Sheets.
+# Short-lived report runs never hit it; the long-running MCP server relies on it to pick up new data.
+SNAPSHOT_TTL_SECONDS = float(os.environ.get("SHEET_SNAPSHOT_TTL", 15 * 60))
+
+# Snapshots are shared between callers, so every caller gets its own copy. From pandas 3 copy-on-write is
+# always on and a shallow copy is enough to keep writes from reaching the cached frame; older pandas gets a
+# deep copy rather than having the process-wide copy-on-write option switched on from here.
+_SHALLOW_COPY = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _copy(df):
+    return df.copy(deep=not _SHALLOW_COPY)
+
+
+_snapshots = {}
+_lock = threading.Lock()
+
+
+def get_snapshot(client_name, worksheet, loader, ttl=None):
+    """Return the cached frame for (client_name, worksheet), calling loader() on a miss or once the TTL has passed.
+
+    The frame handed back is a copy of the snapshot (shallow on pandas 3), so writes to it never reach the cache."""
+    ttl = SNAPSHOT_TTL_SECONDS if ttl is None else ttl
+    key = (client_name, worksheet)
+    with _lock:
+        entry = _snapshots.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return _copy(entry[1])
+
+    df = loader()
+    with _lock:
+        _snapshots[key] = (time.monotonic(), df)
+    return _copy(df)
+
+
+def peek_snapshot(client_name, worksheet, ttl=None):
+    """Return the cached frame for (client_name, worksheet) if it is still fresh, otherwise None. Never loads."""
+    ttl = SNAPSHOT_TTL_SECONDS if ttl is None else ttl
+    with _lock:
+        entry = _snapshots.get((client_name, worksheet))
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return _copy(entry[1])
+    return None
+
+
+def find_snapshot(client_name, covers, ttl=None):
+    """Return a fresh cached frame for client_name whose worksheet key satisfies covers(key), or None. Never loads."""
+    ttl = SNAPSHOT_TTL_SECONDS if ttl is None else ttl
+    with _lock:
+        for (name, key), (loaded_at, df) in _snapshots.items():
+            if name == client_name and time.monotonic() - loaded_at < ttl and covers(key):
+                return _copy(df)
+    return None
+
+
+def put_snapshot(client_name, worksheet, df):
+    """Store an already-downloaded frame so later reads of (client_name, worksheet) skip the download."""
+    with _lock:
+        _snapshots[(client_name, worksheet)] = (time.monotonic(), df)
+
+
+def invalidate(client_name=None, worksheet=None):
+    """Drop cached snapshots. With no arguments everything is cleared; otherwise only matching entries are.
+
+    Projected reads are cached under (worksheet, columns, min_date) and are dropped along with their worksheet."""
+    with _lock:
+        for key in list(_snapshots):
+            if client_name is not None and key[0] != client_name:
+                continue
+            sheet = key[1][0] if isinstance(key[1], tuple) else key[1]
+            if worksheet is not None and sheet != worksheet:
+                continue
+            del _snapshots[key]
@@ -0,0 +1,101 @@
+import pandas as pd
+import gspread
+
+# Date cells sampled per probe round when looking for the first row of a date-bounded read
+PROBE_COUNT = 16
+# Once the candidate start rows fit inside this many rows the Date column is read outright
+PROBE_SPAN = 2000
+
+
+def column_letter(index):
+    return gspread.utils.rowcol_to_a1(1, index + 1).rstrip('0123456789')
+
+
+def _parse_date(cell):
+    return pd.to_datetime(cell, format='%Y-%m-%d', errors='coerce')
+
+
+def _first_cell(value_range):
+    return value_range[0][0] if value_range and value_range[0] else ''
+
+
+def first_row_on_or_after(ws, date_letter, min_date):
+    """Find the first sheet row dated on/after min_date, relying on Funnel Import tabs being appended in date order.
+
+    Each round samples PROBE_COUNT Date cells in a single batch_get and narrows the window to the pair of probes
+    either side of min_date. Blank cells (past the end of the data) count as 'after'."""
+    lo, hi = 2, ws.row_count + 1
+    while hi - lo > PROBE_SPAN:
+        step = (hi - lo) / (PROBE_COUNT + 1)
+        rows = sorted({int(lo + step * (i + 1)) for i in range(PROBE_COUNT)})
+        probes = ws.batch_get([f"{date_letter}{r}" for r in rows])
+        new_lo, new_hi = lo, hi
+        for row, value_range in zip(rows, probes):
+            date = _parse_date(_first_cell(value_range))
+            if pd.notna(date) and date < min_date:
+                new_lo = row + 1
+            else:
+                new_hi = row
+                break
+        lo, hi = new_lo, new_hi
+
+    column = ws.get(f"{date_letter}{lo}:{date_letter}{hi}")
+    for offset, cells in enumerate(column):
+        date = _parse_date(cells[0] if cells else '')
+        if not (pd.notna(date) and date < min_date):
+            return lo + offset
+    return lo + len(column)
+
+
+def _contiguous_runs(indices):
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    return runs
+
+
+def values_to_df(values):
+    """Build the same frame as get_all_records() from a raw values grid (header row first)."""
+    if not values:
+        return pd.DataFrame(columns=['Date'])
+    header, rows = values[0], values[1:]
+    width = len(header)
+    records = [gspread.utils.numericise_all((row + [''] * width)[:width]) for row in rows]
+    df = pd.DataFrame(records, columns=header)
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+    return df
+
+
+def read_worksheet(ws, columns=None, min_date=None):
+    """Read a Funnel Import style worksheet, fetching only the requested columns and the rows dated on/after min_date.
+
+    Columns keep their sheet order and Date is always included. The selected columns are fetched as one
+    open-ended A1 range per contiguous block, all in a single batch_get."""
+    header = ws.row_values(1)
+    wanted = set(columns) | {'Date'} if columns else set(header)
+    indices = [i for i, name in enumerate(header) if name in wanted]
+    date_letter = column_letter(header.index('Date'))
+
+    start_row = 2
+    if min_date is not None:
+        min_date = pd.Timestamp(min_date)
+        start_row = first_row_on_or_after(ws, date_letter, min_date)
+
+    runs = _contiguous_runs(indices)
+    blocks = ws.batch_get([f"{column_letter(a)}{start_row}:{column_letter(b)}" for a, b in runs])
+    n_rows = max((len(block) for block in blocks), default=0)
+
+    rows = [[] for _ in range(n_rows)]
+    for (a, b), block in zip(runs, blocks):
+        width = b - a + 1
+        block = list(block) + [[]] * (n_rows - len(block))
+        for row, cells in zip(rows, block):
+            row.extend((list(cells) + [''] * width)[:width])
+
+    df = values_to_df([[header[i] for i in indices]] + rows)
+    if min_date is not None:
+        df = df.loc[df['Date'] >= min_date]
+    return df
@@ -0,0 +1,118 @@
+import os
+import json
+import threading
+import gspread
+from requests.adapters import HTTPAdapter
+from oauth2client.service_account import ServiceAccountCredentials
+from core.local_sheets import LocalClient, LocalSpreadsheet
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCOPE = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.file",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# 'google' talks to Google Sheets; 'local' serves the same calls from files under SHEETS_LOCAL_DIR (see
+# core/local_sheets.py) so whole report runs can be profiled offline without spending API quota.
+BACKEND = os.environ.get("SHEETS_BACKEND", "google")
+
+# Connections kept open per host; sized for the concurrent plan fetches as well as the serial report runs.
+POOL_SIZE = 10
+
+# One authorised gspread client per credentials source. The keys are loaded as oauth2client
+# ServiceAccountCredentials; gspread.authorize converts them to google-auth service account credentials and
+# wraps them in a single pooled session that fetches a new OAuth token only once the current one has
+# expired, so every caller in the process shares one token exchange and one set of keep-alive connections.
+_clients = {}
+_spreadsheets = {}
+_worksheets = {}
+_lock = threading.Lock()
+
+
+def _load_credentials(source):
+    # 'creds' is the service account key file used by the report scripts, 'secrets' the copy held in secrets.json
+    if source == "creds":
+        return ServiceAccountCredentials.from_json_keyfile_name(os.path.join(_PROJECT_ROOT, "storage", "creds.json"), SCOPE)
+    if source == "secrets":
+        with open(os.path.join(_PROJECT_ROOT, "storage", "secrets.json"), "r") as f:
+            secrets = json.load(f)
+        return ServiceAccountCredentials.from_json_keyfile_dict(secrets["google_service_account"], SCOPE)
+    raise ValueError(f"Unknown credentials source '{source}'. Must be 'creds' or 'secrets'")
+
+
+def get_client(source="creds", backend=None):
+    """Return the process-wide authorised gspread client (or its local stand-in) for a credentials source."""
+    backend = BACKEND if backend is None else backend
+    with _lock:
+        sa = _clients.get((backend, source))
+    if sa is not None:
+        return sa
+
+    # Built outside the lock so other threads' lookups are not held up; if two threads race, the first
+    # client stored wins and the other is dropped
+    if backend == "local":
+        sa = LocalClient()
+    elif backend == "google":
+        sa = gspread.authorize(_load_credentials(source))
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        sa.session.mount("https://", adapter)
+    else:
+        raise ValueError(f"Unknown sheets backend '{backend}'. Must be 'google' or 'local'")
+    with _lock:
+        return _clients.setdefault((backend, source), sa)
+
+
+def open_spreadsheet(name=None, url=None, source="creds"):
+    """Open a spreadsheet by title or URL, reusing the handle from earlier calls.
+
+    The lock only guards the handle cache; the open itself is a network call and runs outside it, so
+    concurrent callers (e.g. the plan fetch pool) open their spreadsheets in parallel."""
+    key = (source, name, url)
+    with _lock:
+        sh = _spreadsheets.get(key)
+    if sh is not None:
+        return sh
+
+    sa = get_client(source)
+    sh = sa.open_by_url(url) if url else sa.open(name)
+    with _lock:
+        return _spreadsheets.setdefault(key, sh)
+
+
+def get_worksheet(title, spreadsheet="Weekly Reports", source="creds"):
+    """Return a worksheet handle from the named spreadsheet, reusing the handle from earlier calls."""
+    key = (source, spreadsheet, title)
+    with _lock:
+        ws = _worksheets.get(key)
+    if ws is not None:
+        return ws
+
+    ws = open_spreadsheet(spreadsheet, source=source).worksheet(title)
+    with _lock:
+        return _worksheets.setdefault(key, ws)
+
+
+def spreadsheet_revision(spreadsheet="Weekly Reports", url=None, source="creds"):
+    """Return the spreadsheet's Drive version, which changes whenever any tab is edited.
+
+    A single metadata request; callers compare it with the revision a stored copy was downloaded at."""
+    sh = open_spreadsheet(None if url else spreadsheet, url=url, source=source)
+    if isinstance(sh, LocalSpreadsheet):
+        return sh.revision()
+    response = sh.client.request(
+        "get",
+        f"{gspread.urls.DRIVE_FILES_API_V3_URL}/{sh.id}",
+        params={"fields": "version,modifiedTime", "supportsAllDrives": True},
+    )
+    meta = response.json()
+    return meta.get("version") or meta.get("modifiedTime")
+
+
+def reset():
+    """Forget every client and handle, e.g. after tabs are renamed under a long-running process."""
+    with _lock:
+        _clients.clear()
+        _spreadsheets.clear()
+        _worksheets.clear()
@@ -0,0 +1,73 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Most report tables are a few dozen rows: one per platform, channel or campaign per period. At that size
+# pandas' pivot and reindex machinery costs far more than moving the values, so frames up to this many rows
+# are pivoted with plain numpy instead (about 1.5-2 ms against 4.5-6 ms from 12 to 5000 rows). Larger
+# frames keep the pandas path. Sums stay on pandas' groupby, which numpy did not beat at any size.
+SMALL_FRAME_ROWS = int(os.environ.get('SMALL_FRAME_ROWS', 5000))
+
+
+def _is_small(df, metrics):
+    # Only int64/float64 values: bools, objects and nullable extension arrays keep pandas' own pivot rules
+    return 0 < len(df) <= SMALL_FRAME_ROWS and all(
+        isinstance(df[col].dtype, np.dtype) and df[col].dtype in (np.int64, np.float64) for col in metrics
+    )
+
+
+def _codes(column):
+    """Sorted factorisation of the pivot's index column, or None when it needs the pandas path. A categorical
+    index is left to pandas, whose pivot keeps unobserved categories as rows."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return None
+    try:
+        return pd.factorize(column, sort=True)
+    except TypeError:
+        return None
+
+
+def pivot_periods(df, index, columns, values, periods):
+    """df.pivot(index=index, columns=columns, values=values) reindexed to every (value, period) pair and
+    flattened to '{value}__{period}' columns (period lower-cased) after the index column.
+
+    Small frames are scattered into numpy arrays directly. Dtypes follow pandas: the values' common dtype
+    when every present cell is filled, float64 (NaN) otherwise and for periods with no rows."""
+    codes = _codes(df[index]) if _is_small(df, values) else None
+    period_codes = pd.Index(periods).get_indexer(df[columns]) if codes is not None else None
+    if codes is None or (period_codes < 0).any() or (codes[0] < 0).any():
+        return _pivot_periods_pandas(df, index, columns, values, periods)
+
+    row_codes, rows = codes
+    cells = row_codes * len(periods) + period_codes
+    if len(np.unique(cells)) < len(cells):
+        # Duplicate entries: let pandas raise its usual error
+        return _pivot_periods_pandas(df, index, columns, values, periods)
+
+    if rows.dtype == object:
+        # pivot's index infers its dtype from the values (str for names), so the keys are re-inferred too
+        rows = pd.Index(rows.tolist())
+    present = np.unique(period_codes)
+    full = len(df) == len(rows) * len(present)
+    common = np.result_type(*[df[value].dtype for value in values])
+    out = {index: rows}
+    for value in values:
+        source = df[value].to_numpy()
+        for j, period in enumerate(periods):
+            if full and j in present:
+                column = np.empty(len(rows), dtype=common)
+            else:
+                column = np.full(len(rows), np.nan)
+            selected = period_codes == j
+            column[row_codes[selected]] = source[selected]
+            out[f"{value}__{period.lower()}"] = column
+    return pd.DataFrame(out)
+
+
+def _pivot_periods_pandas(df, index, columns, values, periods):
+    df_pivot = (
+        df.pivot(index=index, columns=columns, values=values)
+        .reindex(columns=pd.MultiIndex.from_product([values, list(periods)]))  # ensures every period exists
+    )
+    df_pivot.columns = [f"{value}__{period.lower()}" for value, period in df_pivot.columns]
+    return df_pivot.reset_index()
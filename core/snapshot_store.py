@@ -0,0 +1,52 @@
+import os
+import glob
+import hashlib
+import pandas as pd
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_ROOT = os.path.join(_PROJECT_ROOT, "storage", "snapshots")
+
+# Typed Funnel Import frames are kept on disk under the spreadsheet revision they were downloaded at, so the
+# weekly run, trap checks, monthly run and MCP server can share a download until the sheet next changes.
+# Pickle keeps the frames exactly as apply_schema left them (categoricals, mixed object columns), which
+# Parquet cannot. The files are only ever written and read by this process tree.
+
+
+def variant_key(columns=None, min_date=None):
+    """Name a projected read; the unprojected tab is 'full'."""
+    if not columns and min_date is None:
+        return "full"
+    spec = repr((tuple(columns) if columns else None, str(pd.Timestamp(min_date)) if min_date is not None else None))
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()[:12]
+
+
+def _safe(text):
+    return "".join(c if c.isalnum() or c in " -_." else "_" for c in str(text))
+
+
+def _path(worksheet, revision, variant):
+    return os.path.join(SNAPSHOT_ROOT, f"{_safe(worksheet)}@{_safe(revision)}@{variant}.pkl")
+
+
+def read_snapshot(worksheet, revision, variant="full"):
+    """Return the stored frame for worksheet at revision, or None when there is none (or revision is unknown)."""
+    if revision is None:
+        return None
+    try:
+        return pd.read_pickle(_path(worksheet, revision, variant))
+    except (FileNotFoundError, EOFError):
+        return None
+
+
+def write_snapshot(worksheet, revision, df, variant="full"):
+    """Store df for worksheet at revision and drop every copy stored at an older revision."""
+    if revision is None:
+        return
+    os.makedirs(SNAPSHOT_ROOT, exist_ok=True)
+    path = _path(worksheet, revision, variant)
+    for stale in glob.glob(os.path.join(SNAPSHOT_ROOT, f"{glob.escape(_safe(worksheet))}@*.pkl")):
+        if not os.path.basename(stale).startswith(f"{_safe(worksheet)}@{_safe(revision)}@"):
+            os.remove(stale)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_pickle(tmp)
+    os.replace(tmp, path)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+# Time grains a series can be rolled up to. Every grain is derived from Date through the calendar table,
+# so a frame at day grain (the daily cube) is all any of them needs
+TIME_GRAINS = ('Date', 'Week number (ISO)', 'Month', 'Quarter', 'Year')
+
+
+def calendar_table(dates):
+    """One row per distinct day in dates, with the label of every time grain that day rolls up to.
+
+    Month and Quarter are period labels ('2026-04', '2026Q2'), which sort chronologically; Week number (ISO)
+    and Year are ints."""
+    days = pd.DatetimeIndex(pd.unique(pd.Series(dates).dropna())).sort_values()
+    iso = days.isocalendar()
+    return pd.DataFrame({
+        'Date': days,
+        'Week number (ISO)': iso['week'].to_numpy(dtype='int64'),
+        'Month': days.to_period('M').astype(str),
+        'Quarter': days.to_period('Q').astype(str),
+        'Year': days.year.to_numpy(dtype='int64'),
+    })
+
+
+def time_grain(dates, grain):
+    """The grain label of each date in the dates Series (missing for NaT). Labels are worked out once per
+    distinct day from the calendar table and spread back over the rows by position."""
+    if grain == 'Date':
+        return dates
+    codes, days = pd.factorize(dates)
+    labels = calendar_table(days).set_index('Date')[grain].reindex(days).to_numpy()
+    values = labels.take(np.where(codes < 0, 0, codes)) if len(labels) else np.full(len(codes), None)
+    return pd.Series(values, index=dates.index, name=grain).where(codes >= 0)
+
+
+def rollup_time(df, by, metrics):
+    """df's metrics summed by the columns in by, where any TIME_GRAINS entry is derived from Date.
+
+    df should already be at day grain (the daily cube, or rows sliced from it), so each grain is a small
+    reduction of it rather than a fresh scan of the Funnel Import."""
+    grains = {col: time_grain(df['Date'], col) for col in by if col in TIME_GRAINS and col != 'Date'}
+    work = df[[col for col in by if col not in grains] + list(metrics)].assign(**grains)
+    return work.groupby(list(by), as_index=False, observed=True)[list(metrics)].sum()
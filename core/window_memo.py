@@ -0,0 +1,90 @@
+import os
+import shutil
+import hashlib
+import pandas as pd
+from core.funnel_mirror import MIRROR_LOOKBACK_DAYS, mirror_generation
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEMO_ROOT = os.path.join(_PROJECT_ROOT, "storage", "window_memo")
+
+# A window segment (see funnel_windows.window_segments) that ended more than this many days before the
+# latest data is closed: it is past the days GA4 restates (the mirror's look-back), so its aggregate only
+# changes when the whole tab is pulled again (a back-dated restatement, a Funnel re-import, funnel_mirror
+# --full). Memo files are keyed on the mirror's generation and a full pull clears them (see invalidate).
+CLOSED_AFTER_DAYS = MIRROR_LOOKBACK_DAYS
+# Set FUNNEL_WINDOW_MEMO=0 to aggregate every window from the cube, as before the memo existed
+MEMO_ENABLED = os.environ.get("FUNNEL_WINDOW_MEMO", "1") != "0"
+
+# Bump when the stored aggregate's shape changes so older memo files are ignored
+MEMO_VERSION = 2
+
+
+def is_closed(segment, last_date=None):
+    """Whether a (start, end, period) segment ended CLOSED_AFTER_DAYS before last_date (default today)."""
+    last_date = pd.Timestamp.today() if last_date is None else pd.Timestamp(last_date)
+    return pd.Timestamp(segment[1]) < last_date.normalize() - pd.Timedelta(days=CLOSED_AFTER_DAYS)
+
+
+def _client_dir(client_name):
+    safe = "".join(c if c.isalnum() or c in " -_." else "_" for c in str(client_name))
+    return os.path.join(MEMO_ROOT, safe)
+
+
+def _segment_dir(client_name, generation, dimensions, segment):
+    # One directory per segment, keyed on what the caller knows before reading the sheet, so whether a
+    # segment is memoised can be checked without its layout
+    start, end, period = segment
+    spec = repr((
+        MEMO_VERSION, generation, tuple(dimensions), str(pd.Timestamp(start)), str(pd.Timestamp(end)), period,
+    ))
+    return os.path.join(_client_dir(client_name), hashlib.sha1(spec.encode("utf-8")).hexdigest()[:16])
+
+
+def _path(client_name, generation, layout, dimensions, segment):
+    # The sheet layout names the file: the positional table builders read the memo exactly like the cube,
+    # so a tab whose columns moved must not be served aggregates from before the move
+    spec = repr(tuple(map(str, layout)))
+    name = f"{hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]}.pkl"
+    return os.path.join(_segment_dir(client_name, generation, dimensions, segment), name)
+
+
+def memoised_segments(client_name, dimensions, segments):
+    """The segments with a memo file for this client and dimensions, under any sheet layout."""
+    generation = mirror_generation(client_name)
+    found = []
+    for segment in segments:
+        try:
+            names = os.listdir(_segment_dir(client_name, generation, dimensions, segment))
+        except FileNotFoundError:
+            continue
+        if any(name.endswith(".pkl") for name in names):
+            found.append(segment)
+    return found
+
+
+def read_segments(client_name, layout, dimensions, segments):
+    """{segment: frame} for the segments memoised for this client, sheet layout and dimensions."""
+    generation = mirror_generation(client_name)
+    found = {}
+    for segment in segments:
+        try:
+            found[segment] = pd.read_pickle(_path(client_name, generation, layout, dimensions, segment))
+        except (FileNotFoundError, EOFError):
+            continue
+    return found
+
+
+def write_segments(client_name, layout, dimensions, frames):
+    """Store each {segment: frame} aggregate; callers only pass segments that are closed."""
+    generation = mirror_generation(client_name)
+    for segment, frame in frames.items():
+        path = _path(client_name, generation, layout, dimensions, segment)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        frame.to_pickle(tmp)
+        os.replace(tmp, path)
+
+
+def invalidate(client_name):
+    """Delete every memo file for the client; the next run aggregates its windows from the cube again."""
+    shutil.rmtree(_client_dir(client_name), ignore_errors=True)
@@ -25,6 +25,9 @@ from mcp.server.auth.provider import (
 from mcp.server.auth.settings import AuthSettings, ClientRegistrationOptions
 from mcp.shared.auth import OAuthClientInformationFull, OAuthToken
 
+from core.client_config import client_names
+from core.metric_values import strip_raw
+
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TOKENS_PATH = os.path.join(PROJECT_ROOT, "storage", "tokens.json")
 
@@ -204,17 +207,11 @@ mcp = FastMCP(
 @mcp.tool()
 def list_clients() -> str:
     """List all available clients for weekly report generation."""
-    config_path = os.path.join(PROJECT_ROOT, "storage", "config.json")
-    with open(config_path, "r", encoding="utf-8") as f:
-        clients = json.load(f)
-    return json.dumps([c["name"] for c in clients])
+    return json.dumps(client_names())
 
 
 def _validate_client_name(client_name: str) -> None:
-    config_path = os.path.join(PROJECT_ROOT, "storage", "config.json")
-    with open(config_path, "r", encoding="utf-8") as f:
-        clients = json.load(f)
-    known = [c["name"] for c in clients]
+    known = client_names()
     if client_name not in known:
         raise ValueError(f"Unknown client '{client_name}'. Known clients: {known}")
 
@@ -232,7 +229,8 @@ def fetch_client_data(client_name: str) -> str:
         raise Exception(f"Data fetch failed: {result.stderr}")
     data_path = os.path.join(PROJECT_ROOT, "storage", f"{client_name}_data.json")
     with open(data_path, "r", encoding="utf-8") as f:
-        return f.read()
+        client = json.load(f)
+    return json.dumps(strip_raw(client), ensure_ascii=False, indent=2)
 
 
 @mcp.tool()
@@ -270,7 +268,7 @@ def fetch_monthly_client_data(client_name: str) -> str:
         },
         "plan": client.get("plan_json"),
     }
-    return json.dumps(structured, ensure_ascii=False)
+    return json.dumps(strip_raw(structured), ensure_ascii=False)
 
 
 @mcp.tool()
@@ -352,7 +350,7 @@ def fetch_trend_data(client_name: str, channel: str, dimension: str, channel_fil
         parsed_channel_filter, platform or None, parsed_platform_filter,
         time_dimension or None, date_range
     )
-    return json.dumps(result, ensure_ascii=False)
+    return json.dumps(strip_raw(result), ensure_ascii=False)
 
 
 def _render_markdown_table(headers, rows, totals_row):
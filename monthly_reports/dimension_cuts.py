@@ -1,8 +1,14 @@
 import os
 import json
 import pandas as pd
-from core.get_funnel_data import initialise_df, apply_filters, pivot_df, df_to_json, fmt_int, fmt_pct, fmt_gbp
-from core.safe_div import safe_div
+from core.get_funnel_data import initialise_df, apply_filters, pivot_df, df_to_json, fmt_int, fmt_pct, fmt_gbp, to_py
+from core.metric_values import RAW_KEY
+from core.funnel_cube import build_cube
+from core.date_index import sort_by_date, window_rows
+from core.derived_metrics import add_derived
+from core.time_grains import TIME_GRAINS, rollup_time
+from core.funnel_rollup import rollup
+from core.funnel_sql import sql_rollup_periods, use_sql
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -124,6 +130,20 @@ _ADDITIVE_METRIC_CANDIDATES = [
 ]
 
 
+def _sheet_columns(dimension_column, filters):
+    """Columns a cut or timeseries can touch; initialise_df reads only these from the sheet."""
+    columns = [dimension_column, 'Ad Channel', 'Ad Platform', 'Week number (ISO)']
+    columns += list(filters or {})
+    columns += [name for _, candidates in _ADDITIVE_METRIC_CANDIDATES for name in candidates]
+    return columns
+
+
+def _cut_cube(client, dimension_column, filters):
+    """The cut's columns rolled up to one row per day and breakdown, keyed on its dimension and filter columns."""
+    df = initialise_df(client, columns=_sheet_columns(dimension_column, filters))
+    return build_cube(df, [dimension_column, *(filters or {})])
+
+
 def _find_column(columns_set, candidates):
     for name in candidates:
         if name in columns_set:
@@ -131,46 +151,14 @@ def _find_column(columns_set, candidates):
     return None
 
 
-def _compute_derived_metrics(df_work):
-    if 'Cost' in df_work.columns and 'Transaction Revenue' in df_work.columns:
-        df_work['ROAS'] = safe_div(df_work['Transaction Revenue'], df_work['Cost'], multiplier=100)
-    if 'Cost' in df_work.columns and 'Conversions' in df_work.columns:
-        df_work['CPA'] = safe_div(df_work['Cost'], df_work['Conversions'], multiplier=1)
-    if 'Impressions' in df_work.columns and 'Clicks' in df_work.columns:
-        df_work['CTR'] = safe_div(df_work['Clicks'], df_work['Impressions'], multiplier=100)
-    if 'Clicks' in df_work.columns and 'Cost' in df_work.columns:
-        df_work['CPC'] = safe_div(df_work['Cost'], df_work['Clicks'], multiplier=1)
-    conv_col = (
-        'Transactions' if 'Transactions' in df_work.columns
-        else ('Conversions' if 'Conversions' in df_work.columns else None)
-    )
-    if 'Clicks' in df_work.columns and conv_col:
-        df_work['Conversion Rate'] = safe_div(df_work[conv_col], df_work['Clicks'], multiplier=100)
-    if 'Transactions' in df_work.columns and 'Transaction Revenue' in df_work.columns:
-        df_work['AOV'] = safe_div(df_work['Transaction Revenue'], df_work['Transactions'], multiplier=1)
-    if 'Views' in df_work.columns and 'Impressions' in df_work.columns:
-        df_work['View Rate'] = safe_div(df_work['Views'], df_work['Impressions'], multiplier=100)
-    if 'Hooks' in df_work.columns and 'Impressions' in df_work.columns:
-        df_work['Hook Rate'] = safe_div(df_work['Hooks'], df_work['Impressions'], multiplier=100)
-    if 'Holds' in df_work.columns and 'Impressions' in df_work.columns:
-        df_work['Hold Rate'] = safe_div(df_work['Holds'], df_work['Impressions'], multiplier=100)
-    if 'Cost' in df_work.columns and 'Views' in df_work.columns:
-        df_work['CPV'] = safe_div(df_work['Cost'], df_work['Views'], multiplier=1)
-    if 'Cost' in df_work.columns and 'Hooks' in df_work.columns:
-        df_work['Cost Per Hook'] = safe_div(df_work['Cost'], df_work['Hooks'], multiplier=1)
-    return df_work
-
-
 def get_dimension_cut(client, dimension_column, filters=None):
     """MoM comparison data sliced by dimension_column. Uses client compare_start/end_date."""
-    from weekly_reports.generate_df import get_total_row
-
-    df = initialise_df(client)
+    df = _cut_cube(client, dimension_column, filters)
 
     if dimension_column not in df.columns:
         raise ValueError(
             f"Column '{dimension_column}' not found in sheet. "
-            f"Available columns: {df.columns.tolist()}"
+            f"Columns read for this cut: {df.columns.tolist()}"
         )
 
     account_type = client.get('account_type', 'Ecommerce')
@@ -184,12 +172,6 @@ def get_dimension_cut(client, dimension_column, filters=None):
         'compare_end_date':   client['compare_end_date'],
     }
 
-    df = apply_filters(df, client, breakdown_dimension, date_range)
-    for col in ('Ad Channel', 'Ad Platform'):
-        if col in df.columns:
-            df = df[df[col].notna() & (df[col] != '')]
-    df = _apply_scope_filters(df, filters)
-
     columns_set = set(df.columns.tolist())
     selected = {}
     for canonical, candidates in _ADDITIVE_METRIC_CANDIDATES:
@@ -200,19 +182,24 @@ def get_dimension_cut(client, dimension_column, filters=None):
     if not selected:
         raise ValueError(f"No recognised metric columns found for dimension cut on '{dimension_column}'.")
 
-    work_cols = [breakdown_dimension[1], breakdown_dimension[0]] + list(selected.values())
-    df_work = df[work_cols].copy()
-    df_work[list(selected.values())] = df_work[list(selected.values())].apply(pd.to_numeric, errors='coerce')
-    df_work = df_work.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
+    # The date windows, blank and scope filters and the period rollup are one SQL query on the duckdb engine
+    if use_sql():
+        df_work = sql_rollup_periods(
+            df, date_range, client['start_date'], dimension_column, list(selected.values()),
+            nonblank=('Ad Channel', 'Ad Platform'), filters=filters,
+        )
+    else:
+        df = apply_filters(df, client, breakdown_dimension, date_range)
+        for col in ('Ad Channel', 'Ad Platform'):
+            if col in df.columns:
+                df = df[df[col].notna() & (df[col] != '')]
+        df = _apply_scope_filters(df, filters)
+        df_work = rollup(df, [breakdown_dimension[1], breakdown_dimension[0]], list(selected.values()))
 
     rename_map = {v: k for k, v in selected.items()}
     df_work = df_work.rename(columns=rename_map)
 
-    curr_df = get_total_row(df_work[df_work['Period'].eq('Current')].copy(), 'Current')
-    prev_df = get_total_row(df_work[df_work['Period'].eq('Previous')].copy(), 'Previous')
-    df_work = pd.concat([curr_df, prev_df], ignore_index=True)
-
-    df_work = _compute_derived_metrics(df_work)
+    df_work = add_derived(df_work)
 
     metrics = [col for col in df_work.columns if col not in breakdown_dimension]
     df_pivot = pivot_df(df_work, breakdown_dimension, metrics, table_type)
@@ -222,11 +209,11 @@ def get_dimension_cut(client, dimension_column, filters=None):
 def get_dimension_timeseries(client, dimension_column, filters=None, time_dimension='Week number (ISO)', start_date_override=None, end_date_override=None):
     """Timeseries data sliced by dimension_column, grouped by time_dimension.
 
-    time_dimension: 'Week number (ISO)' | 'Month' | 'Year' | 'Date'
+    time_dimension: 'Week number (ISO)' | 'Month' | 'Quarter' | 'Year' | 'Date' (see core/time_grains)
     start_date_override: ISO date string to extend the lookback beyond the default 90 days.
     end_date_override: ISO date string to cap the window (e.g. for fetching a historical period).
     Returns {dim_val: {time_key: {metric: {curr}}}}."""
-    df = initialise_df(client)
+    df = _cut_cube(client, dimension_column, filters)
 
     if dimension_column not in df.columns:
         raise ValueError(f"Column '{dimension_column}' not found in sheet.")
@@ -237,13 +224,9 @@ def get_dimension_timeseries(client, dimension_column, filters=None, time_dimens
     else:
         start_date = (end_date - pd.DateOffset(days=90)).normalize()
 
-    mask = (
-        (df['Date'] >= start_date) &
-        (df['Date'] <= end_date) &
-        (df[dimension_column].notna()) &
-        (df[dimension_column] != '')
-    )
-    df = df.loc[mask].copy()
+    df = sort_by_date(df)
+    df = df.iloc[window_rows(df, [(start_date, end_date)])]
+    df = df.loc[df[dimension_column].notna() & (df[dimension_column] != '')].copy()
     for col in ('Ad Channel', 'Ad Platform'):
         if col in df.columns:
             df = df[df[col].notna() & (df[col] != '')]
@@ -252,16 +235,8 @@ def get_dimension_timeseries(client, dimension_column, filters=None, time_dimens
     if df.empty:
         return {}
 
-    if time_dimension == 'Week number (ISO)':
-        if 'Week number (ISO)' not in df.columns:
-            df['Week number (ISO)'] = df['Date'].dt.isocalendar().week.astype(int)
-    elif time_dimension == 'Month':
-        df['Month'] = df['Date'].dt.to_period('M').astype(str)
-    elif time_dimension == 'Year':
-        df['Year'] = df['Date'].dt.year.astype(int)
-    # 'Date' column is already present
-
-    if time_dimension not in df.columns:
+    # Calendar grains (week, month, quarter, year) are rolled up from Date; anything else must be a column
+    if time_dimension not in TIME_GRAINS and time_dimension not in df.columns:
         raise ValueError(f"Time dimension '{time_dimension}' is not available in the data.")
 
     columns_set = set(df.columns.tolist())
@@ -274,14 +249,11 @@ def get_dimension_timeseries(client, dimension_column, filters=None, time_dimens
     if not selected:
         return {}
 
-    work_cols = [dimension_column, time_dimension] + list(selected.values())
-    df_work = df[work_cols].copy()
-    df_work[list(selected.values())] = df_work[list(selected.values())].apply(pd.to_numeric, errors='coerce')
-    df_work = df_work.groupby([dimension_column, time_dimension], as_index=False).sum()
+    df_work = rollup_time(df, [dimension_column, time_dimension], list(selected.values()))
 
     rename_map = {v: k for k, v in selected.items()}
     df_work = df_work.rename(columns=rename_map)
-    df_work = _compute_derived_metrics(df_work)
+    df_work = add_derived(df_work)
 
     int_metrics = ['Impressions', 'Clicks', 'Transactions', 'Conversions', 'Sessions', 'Views', 'Hooks', 'Holds']
     pct_metrics = ['CTR', 'Conversion Rate', 'ROAS', 'Impression Share', 'Abs. Top Impression Share', 'View Rate', 'Hook Rate', 'Hold Rate']
@@ -298,11 +270,11 @@ def get_dimension_timeseries(client, dimension_column, filters=None, time_dimens
         for metric in metrics:
             val = row[metric]
             if metric in int_metrics:
-                time_data[metric] = {'curr': fmt_int(val)}
+                time_data[metric] = {'curr': fmt_int(val), RAW_KEY: {'curr': to_py(val)}}
             elif metric in pct_metrics:
-                time_data[metric] = {'curr': fmt_pct(val)}
+                time_data[metric] = {'curr': fmt_pct(val), RAW_KEY: {'curr': to_py(val)}}
             elif metric in gbp_metrics:
-                time_data[metric] = {'curr': fmt_gbp(val)}
+                time_data[metric] = {'curr': fmt_gbp(val), RAW_KEY: {'curr': to_py(val)}}
         result[dim_val][time_key] = time_data
 
     return result
@@ -345,6 +317,9 @@ def fetch_trend_data(client_name, channel, dimension, channel_filter=None, platf
 
     filters = filters or None
 
+    # Earliest window start, so the cuts and timeseries below share one bounded read
+    client['data_min_date'] = min(d for k, d in windows.items() if k.endswith('_start') and d is not None)
+
     # Previous Period (omitted for YTD)
     if windows['prev_period_available']:
         client['compare_start_date'] = windows['prev_start']
@@ -382,6 +357,7 @@ def fetch_trend_data(client_name, channel, dimension, channel_filter=None, platf
     else:
         data_mom_timeseries = {}
 
+    client.pop('data_min_date')
     data_key = _build_data_key(dimension, filters, date_range)
 
     fmt = '%d/%m/%Y'
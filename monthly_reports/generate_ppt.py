@@ -7,6 +7,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 import argparse
 import shutil
 import json
+import pandas as pd
 from calendar import monthrange
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
@@ -18,7 +19,9 @@ from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.oxml.ns import qn
 from PIL import Image
 from core.generate_commentary import generate_monthly_slide_content, generate_mtd_slide_content
-from core.get_funnel_data import fmt_int, fmt_pct, fmt_gbp
+from core.get_funnel_data import fmt_int, fmt_pct, fmt_gbp, GBP_METRICS
+from core.derived_metrics import add_derived, resolve_derived
+from core.metric_values import metric_value
 from monthly_reports.generate_visualisation import render_graph, initialise_brand, BRAND
 from monthly_reports.generate_data_export import export_slide_data
 
@@ -957,36 +960,15 @@ _ADDITIVE_METRICS = {
     'Clicks', 'Transactions', 'Views', 'Hooks', 'Holds',
 }
 
-# (numerator, denominator, multiplier, format_type)
-_DERIVED_METRIC_FORMULAS = {
-    'ROAS':            ('Transaction Revenue', 'Cost',               100, 'pct'),
-    'CPA':             ('Cost',                'Conversions',           1, 'gbp'),
-    'CTR':             ('Clicks',              'Impressions',         100, 'pct'),
-    'CPC':             ('Cost',                'Clicks',                1, 'gbp'),
-    'Conversion Rate': ('Conversions',         'Clicks',              100, 'pct'),
-    'AOV':             ('Transaction Revenue', 'Transactions',          1, 'gbp'),
-    'View Rate':       ('Views',               'Impressions',         100, 'pct'),
-    'Hook Rate':       ('Hooks',               'Impressions',         100, 'pct'),
-    'Hold Rate':       ('Holds',               'Impressions',         100, 'pct'),
-    'Cost Per Hook':   ('Cost',                'Hooks',                 1, 'gbp'),
-}
-
 _FMT_INT_METRICS = {
     'Conversions', 'Impressions', 'Clicks', 'Transactions', 'Views', 'Hooks', 'Holds',
 }
 
 
-def _parse_num(s):
-    try:
-        return float(str(s).replace('£', '').replace('%', '').replace(',', '').replace('x', '').strip())
-    except (ValueError, AttributeError):
-        return 0.0
-
-
 def _fmt_metric(metric, value):
     if metric in _FMT_INT_METRICS:
         return fmt_int(value)
-    elif metric in ('Cost', 'Transaction Revenue') or metric in _DERIVED_METRIC_FORMULAS and _DERIVED_METRIC_FORMULAS[metric][3] == 'gbp':
+    elif metric in GBP_METRICS:
         return fmt_gbp(value)
     else:
         return fmt_pct(value)
@@ -1007,9 +989,8 @@ def _apply_row_filters(items, row_filters, dimension_col):
                 elif op == '!='           and s == sv:       return False
             else:
                 raw = metric_dict.get(col, {})
-                curr_str = raw.get('curr', '0') if isinstance(raw, dict) else '0'
                 try:
-                    n  = _parse_num(curr_str)
+                    n  = metric_value(raw) if isinstance(raw, dict) else 0.0
                     fv = float(val)
                     if   op == '>'  and not (n >  fv): return False
                     elif op == '<'  and not (n <  fv): return False
@@ -1023,45 +1004,38 @@ def _apply_row_filters(items, row_filters, dimension_col):
     return [(dv, md) for dv, md in items if _passes(dv, md)]
 
 
-def _compute_metric_raw(metric, sums):
-    if metric in _ADDITIVE_METRICS:
-        return sums.get(metric, 0.0)
-    if metric in _DERIVED_METRIC_FORMULAS:
-        num_key, denom_key, mult, _ = _DERIVED_METRIC_FORMULAS[metric]
-        denom = sums.get(denom_key, 0.0)
-        if denom == 0:
-            return None
-        return (sums.get(num_key, 0.0) / denom) * mult
-    return None
-
-
 def _compute_totals_row(items, metrics, comparison):
-    needed = set()
-    for m in metrics:
-        if m in _ADDITIVE_METRICS:
-            needed.add(m)
-        elif m in _DERIVED_METRIC_FORMULAS:
-            num_key, denom_key, _, _ = _DERIVED_METRIC_FORMULAS[m]
-            needed.add(num_key)
-            needed.add(denom_key)
-
-    curr_sums = {k: 0.0 for k in needed}
-    prev_sums = {k: 0.0 for k in needed} if comparison else {}
-
+    # Sum the additive measures across the rows, then derive the ratios on the summed row from the same
+    # registry the tables use. Ratios prefer the measures the rows actually carry; a missing one sums to 0
+    fields = ['curr', 'prev'] if comparison else ['curr']
+    present = {k for _, metric_dict in items for k in metric_dict if k in _ADDITIVE_METRICS}
+    derived = resolve_derived(present, metrics)
+    derived += resolve_derived(_ADDITIVE_METRICS, set(metrics) - {name for name, _, _, _ in derived})
+    needed = {m for m in metrics if m in _ADDITIVE_METRICS} | {c for _, num, den, _ in derived for c in (num, den)}
+
+    sums = {field: dict.fromkeys(needed, 0.0) for field in fields}
     for _, metric_dict in items:
         for comp in needed:
             vals = metric_dict.get(comp, {})
             if isinstance(vals, dict):
-                curr_sums[comp] += _parse_num(vals.get('curr', '0'))
-                if comparison:
-                    prev_sums[comp] += _parse_num(vals.get('prev', '0'))
+                for field in fields:
+                    sums[field][comp] += metric_value(vals, field)
+
+    # A zero denominator leaves the ratio NaN, shown as a dash
+    totals = pd.DataFrame.from_dict(sums, orient='index', columns=sorted(needed))
+    totals = add_derived(totals, derived, default=float('nan'))
+
+    def _raw(m, field):
+        if m not in totals.columns or pd.isna(totals.at[field, m]):
+            return None
+        return float(totals.at[field, m])
 
     row = ['Totals']
     for m in metrics:
-        curr_raw = _compute_metric_raw(m, curr_sums)
+        curr_raw = _raw(m, 'curr')
         row.append(_fmt_metric(m, curr_raw) if curr_raw is not None else '—')
         if comparison:
-            prev_raw = _compute_metric_raw(m, prev_sums)
+            prev_raw = _raw(m, 'prev')
             row.append(_fmt_metric(m, prev_raw) if prev_raw is not None else '—')
             if curr_raw is not None and prev_raw and prev_raw != 0:
                 pct = (curr_raw - prev_raw) / abs(prev_raw) * 100
@@ -1102,8 +1076,14 @@ def render_table_data(graph, client, max_rows=12, comparison=True):
 
     totals_row = _compute_totals_row(items, metrics, comparison) if show_totals else None
 
+    # Sort on the current value of sort_by, defaulting to the first metric
+    sort_metric = sort_by if sort_by in metrics else metrics[0]
+
     rows = []
+    sort_values = []
     for dim_val, metric_dict in items:
+        vals = metric_dict.get(sort_metric, {})
+        sort_values.append(metric_value(vals) if isinstance(vals, dict) else 0.0)
         row = [str(dim_val)]
         for m in metrics:
             vals = metric_dict.get(m, {})
@@ -1118,17 +1098,8 @@ def render_table_data(graph, client, max_rows=12, comparison=True):
                     row.extend(['—', '—'])
         rows.append(row)
 
-    # Sort: find column index for sort_by, default to first metric col
-    if sort_by and sort_by in metrics:
-        col_idx = 1 + metrics.index(sort_by) * (3 if comparison else 1)
-    else:
-        col_idx = 1
-
-    def _sort_key(r):
-        return _parse_num(r[col_idx]) if col_idx < len(r) else 0.0
-
-    rows.sort(key=_sort_key, reverse=(sort_dir != 'asc'))
-    rows = rows[:max_rows]
+    order = sorted(range(len(rows)), key=sort_values.__getitem__, reverse=(sort_dir != 'asc'))
+    rows = [rows[i] for i in order][:max_rows]
 
     headers = [dimension_col]
     for m in metrics:
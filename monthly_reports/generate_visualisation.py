@@ -5,6 +5,7 @@ import matplotlib.dates as mdates
 import matplotlib.font_manager as fm
 import matplotlib.ticker as mticker
 import os
+from core.metric_values import metric_value
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -47,12 +48,7 @@ def build_monthly_df(client):
         for week_str, metrics in weeks.items():
             row = {'Ad Channel': channel, 'Week number (ISO)': int(week_str)}
             for metric, vals in metrics.items():
-                raw = vals.get('curr', '0') if isinstance(vals, dict) else vals
-                clean = str(raw).replace('£', '').replace('%', '').replace(',', '').replace('x', '').strip()
-                try:
-                    row[metric] = float(clean)
-                except (ValueError, TypeError):
-                    row[metric] = 0.0
+                row[metric] = metric_value(vals)
             rows.append(row)
     df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=['Ad Channel', 'Week number (ISO)'])
     if not df.empty:
@@ -61,14 +57,6 @@ def build_monthly_df(client):
     return df
 
 
-def _parse_val(raw):
-    clean = str(raw).replace('£', '').replace('%', '').replace(',', '').replace('x', '').strip()
-    try:
-        return float(clean)
-    except (ValueError, TypeError):
-        return 0.0
-
-
 _NULL_STRINGS = {'', 'None', 'nan', 'NaN', 'null', '(not set)'}
 _TOTAL_STRINGS = {'total', 'totals', 'grand total'}
 
@@ -114,7 +102,7 @@ def build_dimension_df(client, data_source, comparison_type):
                 parsed_key = int(time_key) if time_col in ('Week number (ISO)', 'Year') else time_key
                 row = {dimension_col: dim_val, time_col: parsed_key}
                 for metric, vals in metrics.items():
-                    row[metric] = _parse_val(vals.get('curr', '0') if isinstance(vals, dict) else vals)
+                    row[metric] = metric_value(vals)
                 rows.append(row)
         df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=[dimension_col, time_col])
         if not df.empty:
@@ -125,7 +113,7 @@ def build_dimension_df(client, data_source, comparison_type):
                 continue
             row = {dimension_col: dim_val}
             for metric, vals in metrics.items():
-                row[metric] = _parse_val(vals.get('curr', '0') if isinstance(vals, dict) else vals)
+                row[metric] = metric_value(vals)
             rows.append(row)
         df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=[dimension_col])
 
@@ -148,12 +136,8 @@ def build_comparison_df(client, data_source, comparison_type):
         curr_row = {dimension_col: dim_val, 'Period': 'Current'}
         prev_row = {dimension_col: dim_val, 'Period': 'Previous'}
         for metric, vals in metrics.items():
-            if isinstance(vals, dict):
-                curr_row[metric] = _parse_val(vals.get('curr', '0'))
-                prev_row[metric] = _parse_val(vals.get('prev', '0'))
-            else:
-                curr_row[metric] = _parse_val(vals)
-                prev_row[metric] = 0.0
+            curr_row[metric] = metric_value(vals)
+            prev_row[metric] = metric_value(vals, 'prev') if isinstance(vals, dict) else 0.0
         rows.extend([curr_row, prev_row])
     df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=[dimension_col, 'Period'])
     return _drop_null_paid_dims(df, dimension_col)
@@ -7,7 +7,8 @@ import argparse
 import pandas as pd
 from pandas.tseries.offsets import MonthEnd
 from core.error_logger import log_error
-from core.get_funnel_data import get_funnel_data
+from core.client_config import get_client_config
+from core.get_funnel_data import get_funnel_data_windows, window_range
 from core.get_run_rate import get_run_rate
 
 
@@ -53,10 +54,7 @@ def config_monthly_dates(client):
 def run_monthly_report(client_name, data_only=False):
     os.makedirs("charts", exist_ok=True)
 
-    with open("storage/config.json", "r") as f:
-        clients = json.load(f)
-
-    client = next((c for c in clients if c['name'] == client_name), None)
+    client = get_client_config(client_name)
     if client is None:
         raise ValueError(f"Client '{client_name}' not found in config")
 
@@ -84,12 +82,23 @@ def run_monthly_report(client_name, data_only=False):
     ts_type = 'time_series_lead_gen' if account_type == 'Lead Gen' else 'time_series_ecommerce'
 
     try:
-        # MoM comparison pass
-        client['compare_start_date'] = compare_start_mom
-        client['compare_end_date'] = compare_end_mom
-        client['paid_data_mom'] = get_funnel_data(client, paid_type)
-        client['llm_data_mom'] = get_funnel_data(client, llm_type)
-        client['overall_data_mom'] = get_funnel_data(client, overall_type)
+        # MoM, YoY, timeseries and MTD windows are all aggregated from one read of the sheet
+        comparison_types = [paid_type, llm_type, overall_type]
+        current = {'start_date': start_date, 'end_date': end_date, 'period_start': start_date}
+        windows = {
+            'mom': ({**current, 'compare_start_date': compare_start_mom, 'compare_end_date': compare_end_mom}, comparison_types),
+            'yoy': ({**current, 'compare_start_date': compare_start_yoy, 'compare_end_date': compare_end_yoy}, comparison_types),
+            'timeseries': (window_range(client, ts_type), [ts_type]),
+        }
+        # MTD pass: current month 1st → today-2, compared to same days last year
+        if mtd_end_date >= mtd_start_date:
+            windows['mtd'] = ({'start_date': mtd_start_date, 'end_date': mtd_end_date,
+                               'compare_start_date': compare_start_mtd, 'compare_end_date': compare_end_mtd,
+                               'period_start': mtd_start_date}, comparison_types)
+        tables = get_funnel_data_windows(client, windows)
+
+        client['paid_data_mom'], client['llm_data_mom'], client['overall_data_mom'] = (tables['mom'][t] for t in comparison_types)
+        client['paid_data_yoy'], client['llm_data_yoy'], client['overall_data_yoy'] = (tables['yoy'][t] for t in comparison_types)
 
         # Store comparison dates explicitly so dimension cut fetches can reuse them
         client['compare_start_mom'] = compare_start_mom
@@ -97,32 +106,15 @@ def run_monthly_report(client_name, data_only=False):
         client['compare_start_yoy'] = compare_start_yoy
         client['compare_end_yoy']   = compare_end_yoy
 
-        # YoY comparison pass
-        client['compare_start_date'] = compare_start_yoy
-        client['compare_end_date'] = compare_end_yoy
-        client['paid_data_yoy'] = get_funnel_data(client, paid_type)
-        client['llm_data_yoy'] = get_funnel_data(client, llm_type)
-        client['overall_data_yoy'] = get_funnel_data(client, overall_type)
-
         # Timeseries (90-day window, no comparison)
-        client['timeseries_data'] = get_funnel_data(client, ts_type)
+        client['timeseries_data'] = tables['timeseries'][ts_type]
 
-        # MTD pass: current month 1st → today-2, compared to same days last year
-        if mtd_end_date >= mtd_start_date:
-            client['start_date'] = mtd_start_date
-            client['end_date'] = mtd_end_date
-            client['compare_start_date'] = compare_start_mtd
-            client['compare_end_date'] = compare_end_mtd
-            client['paid_data_mtd'] = get_funnel_data(client, paid_type)
-            client['llm_data_mtd'] = get_funnel_data(client, llm_type)
-            client['overall_data_mtd'] = get_funnel_data(client, overall_type)
+        if 'mtd' in tables:
+            client['paid_data_mtd'], client['llm_data_mtd'], client['overall_data_mtd'] = (tables['mtd'][t] for t in comparison_types)
             client['mtd_start_date_string'] = mtd_start_date.strftime("%d/%m/%Y")
             client['mtd_end_date_string'] = mtd_end_date.strftime("%d/%m/%Y")
             client['compare_start_mtd'] = compare_start_mtd
             client['compare_end_mtd'] = compare_end_mtd
-            # Restore main period dates
-            client['start_date'] = start_date
-            client['end_date'] = end_date
 
         # Alias MoM as the primary paid_data so existing helpers (add_kpi_boxes, get_run_rate) work
         client['paid_data'] = client['paid_data_mom']
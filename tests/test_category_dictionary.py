@@ -0,0 +1,54 @@
+"""
+Tests for core/category_dictionary.py.
+"""
+
+import pandas as pd
+import pytest
+
+from core import category_dictionary
+from core.category_dictionary import encode_dimensions
+from core.funnel_schema import apply_schema
+
+
+@pytest.fixture(autouse=True)
+def _dictionary_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(category_dictionary, "DICTIONARY_ROOT", str(tmp_path))
+    monkeypatch.setattr(category_dictionary, "_DICTIONARIES", {})
+
+
+def _frame(campaigns):
+    return apply_schema(pd.DataFrame({
+        "Date": ["2026-04-01"] * len(campaigns),
+        "Campaign": campaigns,
+        "Notes": [""] * len(campaigns),
+    }))
+
+
+class TestEncodeDimensions:
+
+    def test_frames_share_sorted_categories(self):
+        first = encode_dimensions("A", _frame(["Brand", ""]))
+        second = encode_dimensions("A", _frame(["Generic", "Brand"]))
+        assert first["Campaign"].cat.categories.tolist() == ["", "Brand"]
+        assert second["Campaign"].cat.categories.tolist() == ["", "Brand", "Generic"]
+        assert second["Campaign"].tolist() == ["Generic", "Brand"]
+        assert pd.concat([second, encode_dimensions("A", _frame(["Brand"]))])["Campaign"].dtype == "category"
+
+    def test_dictionary_persists_per_client(self):
+        encode_dimensions("A", _frame(["Brand"]))
+        category_dictionary._DICTIONARIES.clear()
+        assert category_dictionary.load_dictionary("A") == {"Campaign": ["Brand"]}
+        assert category_dictionary.load_dictionary("B") == {}
+
+    def test_other_columns_untouched(self):
+        df = encode_dimensions("A", _frame(["Brand"]))
+        assert not isinstance(df["Notes"].dtype, pd.CategoricalDtype)
+
+    def test_older_frame_brought_up_to_date(self):
+        old = encode_dimensions("A", _frame(["Brand"]))
+        encode_dimensions("A", _frame(["Generic"]))
+        current = encode_dimensions("A", old)
+        assert current["Campaign"].cat.categories.tolist() == ["Brand", "Generic"]
+        assert current["Campaign"].tolist() == ["Brand"]
+        # A frame already on the current dictionary is returned as it is
+        assert encode_dimensions("A", current) is current
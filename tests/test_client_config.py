@@ -0,0 +1,42 @@
+"""
+Tests for core/client_config.py.
+"""
+
+import os
+import json
+import pytest
+from unittest.mock import patch
+
+from core import client_config
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps([{"name": "A", "account_type": "Ecommerce"}, {"name": "B", "account_type": "Lead Gen"}]))
+    with patch.object(client_config, "CONFIG_PATH", str(path)):
+        yield path
+
+
+class TestClientConfig:
+
+    def test_lookup_by_name(self, config_file):
+        assert client_config.get_client_config("B")["account_type"] == "Lead Gen"
+        assert client_config.get_client_config("Nope") is None
+        assert client_config.client_names() == ["A", "B"]
+
+    def test_callers_get_copies(self, config_file):
+        client = client_config.get_client_config("A")
+        client["start_date"] = "mutated"
+        client_config.get_clients()[0]["name"] = "mutated"
+        assert "start_date" not in client_config.get_client_config("A")
+        assert client_config.client_names() == ["A", "B"]
+
+    def test_parsed_once_until_file_changes(self, config_file):
+        client_config.get_clients()
+        with patch("core.client_config.json.load", side_effect=AssertionError("re-read")):
+            client_config.get_clients()
+
+        config_file.write_text(json.dumps([{"name": "C"}]))
+        os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 10**9))
+        assert client_config.client_names() == ["C"]
@@ -0,0 +1,52 @@
+"""
+Tests for core/date_index.py.
+"""
+
+import pandas as pd
+
+from core.date_index import sort_by_date, window_rows, date_ranges
+from core.get_funnel_data import apply_filters
+
+
+def _frame():
+    return pd.DataFrame({
+        "Date": pd.to_datetime(["2026-04-03", "2026-04-01", "2026-04-02", "2026-04-01", None]),
+        "Ad Platform": ["Meta", "Google Ads", "", "Meta", "Meta"],
+        "Clicks": [3, 1, 2, 4, 5],
+    })
+
+
+class TestSortByDate:
+
+    def test_stable_with_missing_dates_last(self):
+        df = sort_by_date(_frame())
+        assert df["Clicks"].tolist() == [1, 4, 2, 3, 5]
+        assert sort_by_date(df) is df
+
+    def test_leaves_input_untouched(self):
+        df = _frame()
+        sort_by_date(df)
+        assert df["Clicks"].tolist() == [3, 1, 2, 4, 5]
+        assert not df.attrs
+
+
+class TestWindowRows:
+
+    def test_merges_overlapping_ranges(self):
+        df = sort_by_date(_frame())
+        rows = window_rows(df, [("2026-04-02", "2026-04-03"), ("2026-04-01", "2026-04-02")])
+        assert rows.tolist() == [0, 1, 2, 3]
+        assert window_rows(df, [("2026-05-01", "2026-05-31")]).tolist() == []
+
+    def test_apply_filters_matches_date_masks(self):
+        df = _frame()
+        date_range = {"start_date": pd.Timestamp("2026-04-02"), "end_date": pd.Timestamp("2026-04-03"),
+                      "compare_start_date": pd.Timestamp("2026-04-01"), "compare_end_date": pd.Timestamp("2026-04-01")}
+        got = apply_filters(df, {"start_date": pd.Timestamp("2026-04-02")}, ["Ad Platform", "Period"], date_range)
+
+        mask = pd.Series(False, index=df.index)
+        for start, end in date_ranges(date_range):
+            mask |= (df["Date"] >= start) & (df["Date"] <= end)
+        expected = df.loc[mask & (df["Ad Platform"] != "")]
+        assert sorted(got["Clicks"]) == sorted(expected["Clicks"])
+        assert got.set_index("Clicks")["Period"].to_dict() == {1: "Previous", 4: "Previous", 3: "Current"}
@@ -0,0 +1,48 @@
+"""
+Tests for core/derived_metrics.py.
+"""
+
+import pandas as pd
+
+from core.derived_metrics import CPC, CTR, ROAS, add_derived, resolve_derived
+from core.safe_div import safe_div
+
+
+def _grouped():
+    return pd.DataFrame({
+        "Impressions": [1000, 0, 500],
+        "Clicks": [100, 0, 0],
+        "Cost": [50.0, 10.0, 0.0],
+        "Transactions": [5, 0, 1],
+        "Conversions": [7, 0, 0],
+        "Transaction Revenue": [400.0, 0.0, 20.0],
+    })
+
+
+class TestAddDerived:
+
+    def test_matches_safe_div(self):
+        df = add_derived(_grouped(), [CTR, CPC, ROAS])
+        assert df.columns.tolist()[-3:] == ["CTR", "CPC", "ROAS"]
+        for name, numerator, denominator, multiplier in (CTR, CPC, ROAS):
+            expected = safe_div(_grouped()[numerator], _grouped()[denominator], multiplier=multiplier)
+            assert df[name].tolist() == expected.tolist()
+
+    def test_default_for_zero_denominator(self):
+        df = add_derived(_grouped(), [CPC], default=float("nan"))
+        assert pd.isna(df["CPC"].iloc[1])
+
+    def test_chained_definitions(self):
+        df = add_derived(_grouped(), [("Cost Per CTR Point", "Cost", "CTR", 1), CTR])
+        assert df["Cost Per CTR Point"].iloc[0] == 5.0
+
+
+class TestResolveDerived:
+
+    def test_conversion_rate_prefers_transactions_then_sessions(self):
+        assert ("Conversion Rate", "Transactions", "Clicks", 100) in resolve_derived(_grouped().columns)
+        resolved = resolve_derived(["Sessions", "Conversions"])
+        assert resolved == [("Conversion Rate", "Conversions", "Sessions", 100)]
+
+    def test_limited_to_names(self):
+        assert [d[0] for d in resolve_derived(_grouped().columns, ["ROAS", "CTR"])] == ["ROAS", "CTR"]
@@ -206,7 +206,9 @@ class TestGetDimensionCut:
     def test_raises_when_column_missing(self):
         """A ValueError is raised if the requested dimension column does not exist."""
         df = _make_funnel_df()
-        with patch("monthly_reports.dimension_cuts.initialise_df", return_value=df):
+        with patch("monthly_reports.dimension_cuts.initialise_df", return_value=df) as initialise:
             from monthly_reports.dimension_cuts import get_dimension_cut
             with pytest.raises(ValueError, match="not found in sheet"):
                 get_dimension_cut(CLIENT_BASE, "NonExistentDimension")
+        # The error lists the columns already read rather than downloading the whole tab
+        assert all(call.kwargs.get("columns") for call in initialise.call_args_list)
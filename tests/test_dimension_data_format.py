@@ -3,7 +3,7 @@ Round-trip format tests for the dimension data pipeline.
 
 Verifies that data produced by dimension_cuts.py (formatted strings like
 "£1,234.56", "3.45%", "1,234") can be correctly parsed back to floats by
-build_dimension_df / _parse_val in generate_visualisation.py, so graph
+build_dimension_df in generate_visualisation.py (via core.metric_values), so graph
 renderers always receive numeric DataFrames.
 
 No network calls, no matplotlib, no Google Sheets access required.
@@ -67,8 +67,8 @@ _stub_matplotlib()
 _stub_google_deps()
 
 from monthly_reports.dimension_cuts import _apply_scope_filter
+from core.metric_values import parse_display as _parse_val
 from monthly_reports.generate_visualisation import (
-    _parse_val,
     build_dimension_df,
     build_monthly_df,
     _build_df_for_spec,
@@ -0,0 +1,40 @@
+"""
+Tests for core/funnel_cube.py.
+"""
+
+import pandas as pd
+
+from core.funnel_cube import build_cube
+
+
+def _raw():
+    return pd.DataFrame({
+        "Date": pd.to_datetime(["2026-04-01", "2026-04-01", "2026-04-01", "2026-04-02"]),
+        "Ad Channel": ["Paid Search", "Paid Search", "Display", "Paid Search"],
+        "Campaign": ["Brand", "Brand", "", "Brand"],
+        "Asset": ["a1", "a2", "a3", "a1"],
+        "Department ": ["Sales", "Sales", "Ops", "Sales"],
+        "Cost (GBP)": [1.0, 2.0, 3.0, 4.0],
+        "Clicks": [1, 1, 1, 1],
+    })
+
+
+class TestBuildCube:
+
+    def test_rolls_up_to_day_and_breakdown(self):
+        cube = build_cube(_raw())
+        assert len(cube) == 3
+        assert cube.columns.tolist() == _raw().columns.tolist()
+        first = cube.iloc[0]
+        assert (first["Ad Channel"], first["Cost (GBP)"], first["Clicks"]) == ("Paid Search", 3.0, 2)
+        assert (cube["Asset"] == "").all()
+        assert cube["Cost (GBP)"].sum() == _raw()["Cost (GBP)"].sum()
+
+    def test_blank_breakdowns_kept_as_rows(self):
+        cube = build_cube(_raw())
+        assert "" in cube["Campaign"].tolist()
+
+    def test_extra_dimensions_match_stripped_headers(self):
+        cube = build_cube(_raw(), ["Asset", "Department"])
+        assert len(cube) == 4
+        assert cube["Department "].tolist() == ["Sales", "Sales", "Ops", "Sales"]
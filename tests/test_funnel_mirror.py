@@ -0,0 +1,109 @@
+"""
+Tests for core/funnel_mirror.py.
+
+A fake worksheet stands in for gspread and the mirror is written under tmp_path, so no network calls are made.
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+from core import funnel_mirror, window_memo
+
+
+HEADER = ["Date", "Ad Channel", "Cost (GBP)"]
+
+
+class FakeWorksheet:
+    def __init__(self, rows):
+        self.rows = rows
+        self.get_calls = []
+
+    @property
+    def row_count(self):
+        return len(self.rows) + 1
+
+    def row_values(self, n):
+        return HEADER
+
+    def get_all_records(self):
+        return [dict(zip(HEADER, r)) for r in self.rows]
+
+    def get(self, a1):
+        self.get_calls.append(a1)
+        start, _, end = a1.partition(":")
+        first_row = int(start[1:])
+        last_row = int(end[1:]) if end[1:] else len(self.rows) + 1
+        first_col, last_col = ord(start[0]) - 65, ord((end or start)[0]) - 65
+        return [[str(v) for v in r[first_col:last_col + 1]] for r in self.rows[first_row - 2:last_row - 1]]
+
+
+def _rows(dates, cost=10):
+    return [[d, "Paid Search", cost] for d in dates]
+
+
+@pytest.fixture
+def mirror_root(tmp_path):
+    with (
+        patch.object(funnel_mirror, "MIRROR_ROOT", str(tmp_path)),
+        patch.object(window_memo, "MEMO_ROOT", str(tmp_path / "_memo")),
+    ):
+        yield tmp_path
+
+
+class TestSyncClient:
+
+    def test_first_sync_partitions_by_month(self, mirror_root):
+        """A full sync writes one Parquet file per month."""
+        ws = FakeWorksheet(_rows(["2026-03-30", "2026-03-31", "2026-04-01"]))
+        with patch.object(funnel_mirror, "_open_worksheet", return_value=ws):
+            funnel_mirror.sync_client("TEST")
+        files = sorted(p.name for p in (mirror_root / "TEST").glob("*.parquet"))
+        assert files == ["2026-03.parquet", "2026-04.parquet"]
+
+    def test_incremental_sync_pulls_only_lookback_rows(self, mirror_root):
+        """The second sync reads from the look-back cutoff down and restated values replace the old ones."""
+        dates = [f"2026-04-{d:02d}" for d in range(1, 11)]
+        ws = FakeWorksheet(_rows(dates))
+        with patch.object(funnel_mirror, "_open_worksheet", return_value=ws):
+            funnel_mirror.sync_client("TEST")
+
+            ws.rows = _rows(dates[:8]) + _rows(dates[8:], cost=99) + _rows(["2026-04-11"], cost=5)
+            pulled = funnel_mirror.sync_client("TEST", lookback_days=2)
+
+        assert ws.get_calls[-1] == "A9:C"
+        assert pulled == 4
+        df = funnel_mirror.load_mirror("TEST")
+        assert len(df) == 11
+        assert df.loc[df["Date"] == pd.Timestamp("2026-04-10"), "Cost (GBP)"].iloc[0] == 99
+
+    def test_full_pull_starts_a_generation_and_clears_the_memo(self, mirror_root):
+        """Incremental syncs keep the generation the window memo is keyed on; a full pull replaces it and
+        deletes the client's memo files."""
+        ws = FakeWorksheet(_rows(["2026-04-01", "2026-04-02"]))
+        memo = mirror_root / "_memo" / "TEST"
+        with patch.object(funnel_mirror, "_open_worksheet", return_value=ws):
+            funnel_mirror.sync_client("TEST")
+            first = funnel_mirror.mirror_generation("TEST")
+            memo.mkdir(parents=True)
+            funnel_mirror.sync_client("TEST")
+            assert funnel_mirror.mirror_generation("TEST") == first
+            assert memo.exists()
+
+            funnel_mirror.sync_client("TEST", full=True)
+        assert funnel_mirror.mirror_generation("TEST") not in (None, first)
+        assert not memo.exists()
+
+
+class TestLoadMirror:
+
+    def test_missing_mirror_returns_none(self, mirror_root):
+        assert funnel_mirror.load_mirror("NOPE") is None
+
+    def test_stale_mirror_returns_none(self, mirror_root):
+        """A mirror older than max_age_hours is ignored."""
+        ws = FakeWorksheet(_rows(["2026-04-01"]))
+        with patch.object(funnel_mirror, "_open_worksheet", return_value=ws):
+            funnel_mirror.sync_client("TEST")
+        assert funnel_mirror.load_mirror("TEST", max_age_hours=1) is not None
+        assert funnel_mirror.load_mirror("TEST", max_age_hours=-1) is None
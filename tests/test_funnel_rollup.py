@@ -0,0 +1,21 @@
+"""
+Tests for core/funnel_rollup.py.
+"""
+
+from core.funnel_rollup import rollup
+from tests.test_generate_df import _frame
+
+
+class TestRollup:
+
+    def test_total_row_per_period(self):
+        df = rollup(_frame(), ["Period", "Ad Platform"], ["Clicks", "Cost (GBP)"])
+        totals = df.loc[df["Ad Platform"] == "Total"].set_index("Period")
+        assert totals["Clicks"].to_dict() == {"Current": 200, "Previous": 0}
+        assert len(df) == 4
+
+    def test_empty_period_gets_zero_total(self):
+        current = _frame().loc[lambda d: d["Period"] == "Current"]
+        df = rollup(current, ["Period", "Ad Platform"], ["Clicks"])
+        assert df.loc[df["Period"] == "Previous", ["Ad Platform", "Clicks"]].values.tolist() == [["Total", 0]]
+
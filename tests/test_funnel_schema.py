@@ -0,0 +1,54 @@
+"""
+Tests for core/funnel_schema.py.
+"""
+
+import pandas as pd
+
+from core.funnel_schema import apply_schema, metric_columns
+
+
+def _raw_df():
+    """Shape of get_all_records() output: object columns mixing numbers and '' blanks."""
+    return pd.DataFrame([
+        {"Date": "2026-04-01", "Ad Channel": "Paid Search", "Ad Platform": "Google Ads", "Channel": "Paid",
+         "Campaign": "A", "Week number (ISO)": 14, "Month": "April", "Year": 2026,
+         "Sessions": 10, "Cost (GBP)": "", "Custom Metric": 3, "Notes": "x", "Department ": "Crime"},
+        {"Date": "2026-04-02", "Ad Channel": "Display", "Ad Platform": "", "Channel": "",
+         "Campaign": "", "Week number (ISO)": 14, "Month": "April", "Year": 2026,
+         "Sessions": "", "Cost (GBP)": 12.5, "Custom Metric": "", "Notes": "", "Department ": ""},
+    ])
+
+
+class TestApplySchema:
+
+    def test_dates_parsed(self):
+        df = apply_schema(_raw_df())
+        assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+
+    def test_metrics_become_float_with_blanks_as_nan(self):
+        df = apply_schema(_raw_df())
+        assert df["Cost (GBP)"].dtype == "float64"
+        assert pd.isna(df["Cost (GBP)"].iloc[0])
+        assert df["Cost (GBP)"].sum() == 12.5
+
+    def test_optional_float32(self):
+        df = apply_schema(_raw_df(), metric_dtype="float32")
+        assert df["Sessions"].dtype == "float32"
+
+    def test_breakdowns_are_categorical_and_keep_blanks(self):
+        df = apply_schema(_raw_df())
+        assert isinstance(df["Ad Channel"].dtype, pd.CategoricalDtype)
+        assert (df["Ad Platform"] != "").tolist() == [True, False]
+
+    def test_undeclared_columns_inferred_from_metric_block(self):
+        """Numeric columns after the metric start are metrics; text ones and declared breakdowns are not."""
+        metrics = metric_columns(_raw_df())
+        assert "Custom Metric" in metrics
+        assert "Notes" not in metrics
+        assert "Department " not in metrics
+        assert "Year" not in metrics
+
+    def test_raw_frame_not_mutated(self):
+        raw = _raw_df()
+        apply_schema(raw)
+        assert raw["Cost (GBP)"].iloc[0] == ""
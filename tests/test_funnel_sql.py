@@ -0,0 +1,68 @@
+"""
+Tests for core/funnel_sql.py.
+
+The DuckDB queries are checked against the pandas path over the same in-memory frames.
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+import core.funnel_sql as funnel_sql
+from core.funnel_rollup import rollup
+from core.funnel_sql import sql_aggregate_segments, sql_rollup_periods
+from core.funnel_windows import aggregate_segments, window_keys, window_segments
+from core.get_funnel_data import apply_filters
+from tests.test_funnel_windows import APRIL, _funnel
+
+
+def _encoded():
+    df = _funnel()
+    df.loc[df.index[::7], "Campaign"] = None
+    df["Ad Platform"] = df["Ad Platform"].astype("category")
+    return df
+
+
+class TestSqlAggregateSegments:
+
+    def test_matches_pandas(self):
+        df = _encoded()
+        keys, metrics = window_keys(df, ["Campaign"])
+        segments = window_segments(APRIL) + [(pd.Timestamp("2026-03-15"), pd.Timestamp("2026-04-10"), "Current")]
+        expected = aggregate_segments(df, segments, keys, metrics)
+        got = sql_aggregate_segments(df, segments, keys, metrics)
+        assert list(got) == list(expected)
+        for segment in segments:
+            pd.testing.assert_frame_equal(got[segment], expected[segment])
+
+
+class TestSqlRollupPeriods:
+
+    def test_matches_apply_filters_and_rollup(self):
+        df = _encoded()
+        df.loc[df.index[:4], "Ad Channel"] = ""
+        client = {"start_date": APRIL["start_date"]}
+        filters = {"Channel": "Paid", "Ad Channel": ["Paid Search", "Paid Social"]}
+        metrics = ["Clicks", "Cost (GBP)"]
+
+        expected = apply_filters(df, client, ["Ad Platform", "Period"], APRIL)
+        expected = expected[expected["Ad Channel"].notna() & (expected["Ad Channel"] != "")]
+        for col, val in filters.items():
+            expected = expected[expected[col].isin(val if isinstance(val, list) else [val])]
+        expected = rollup(expected, ["Period", "Ad Platform"], metrics)
+
+        got = sql_rollup_periods(df, APRIL, client["start_date"], "Ad Platform", metrics,
+                                 nonblank=("Ad Channel",), filters=filters)
+        pd.testing.assert_frame_equal(got, expected)
+
+    def test_missing_period_gets_zero_total(self):
+        window = {**APRIL, "compare_start_date": "", "compare_end_date": ""}
+        got = sql_rollup_periods(_funnel(), window, APRIL["start_date"], "Ad Platform", ["Clicks"])
+        assert got.loc[got["Period"] == "Previous", "Clicks"].tolist() == [0]
+
+
+def test_unknown_engine(monkeypatch):
+    monkeypatch.setattr(funnel_sql, "QUERY_ENGINE", "spark")
+    with pytest.raises(ValueError):
+        funnel_sql.use_sql()
@@ -0,0 +1,74 @@
+"""
+Tests for core/funnel_windows.py.
+
+Window aggregates are checked against apply_filters over the same in-memory Funnel Import frame.
+"""
+
+import pandas as pd
+
+from core.funnel_windows import aggregate_segments, aggregate_windows, window_keys, window_min_date, window_segments
+from core.get_funnel_data import apply_filters
+
+
+COLUMNS = ["Date", "Ad Channel", "Ad Platform", "Channel", "Campaign", "Week number (ISO)", "Month", "Year",
+           "Impressions", "Clicks", "Cost (GBP)"]
+
+
+def _funnel():
+    rows = []
+    for day in pd.date_range("2026-03-01", "2026-04-30"):
+        for channel, platform, campaign in (("Paid Search", "Google Ads", "Brand"), ("Paid Social", "Meta", "")):
+            rows.append([day, channel, platform, "Paid", campaign, day.isocalendar().week, day.month, day.year,
+                         100, day.day, float(day.day) / 2])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+APRIL = {"start_date": pd.Timestamp("2026-04-01"), "end_date": pd.Timestamp("2026-04-30"),
+         "compare_start_date": pd.Timestamp("2026-03-01"), "compare_end_date": pd.Timestamp("2026-03-30"),
+         "period_start": pd.Timestamp("2026-04-01")}
+LATE_APRIL = {"start_date": pd.Timestamp("2026-04-20"), "end_date": pd.Timestamp("2026-04-30"),
+              "compare_start_date": "", "compare_end_date": "", "period_start": pd.Timestamp("2026-04-01")}
+
+
+class TestAggregateWindows:
+
+    def test_sums_match_apply_filters(self):
+        df = _funnel()
+        frames = aggregate_windows(df, {"april": APRIL, "late": LATE_APRIL}, ["Campaign"])
+        client = {"start_date": pd.Timestamp("2026-04-01")}
+
+        for name, window in (("april", APRIL), ("late", LATE_APRIL)):
+            expected = apply_filters(df, client, ["Ad Platform", "Period"], window)
+            expected = expected.groupby(["Ad Platform", "Period"])[["Clicks", "Cost (GBP)"]].sum()
+            got = frames[name].groupby(["Ad Platform", "Period"])[["Clicks", "Cost (GBP)"]].sum()
+            pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+    def test_keeps_sheet_layout_and_blank_breakdowns(self):
+        """Columns stay in sheet order with Period last; blank Campaign rows survive for the caller to drop."""
+        frame = aggregate_windows(_funnel(), {"april": APRIL}, ["Campaign"])["april"]
+        assert frame.columns.tolist() == COLUMNS + ["Period"]
+        assert (frame["Month"] == "").all()
+        assert "" in frame["Campaign"].tolist()
+
+    def test_window_min_date(self):
+        assert window_min_date({"april": APRIL, "late": LATE_APRIL}) == pd.Timestamp("2026-03-01")
+
+    def test_segments_split_at_period_start(self):
+        window = {"start_date": pd.Timestamp("2026-03-20"), "end_date": pd.Timestamp("2026-04-30"),
+                  "compare_start_date": pd.Timestamp("2026-03-01"), "compare_end_date": pd.Timestamp("2026-03-25"),
+                  "period_start": pd.Timestamp("2026-04-01")}
+        assert window_segments(window) == [
+            (pd.Timestamp("2026-03-01"), pd.Timestamp("2026-03-31"), "Previous"),
+            (pd.Timestamp("2026-04-01"), pd.Timestamp("2026-04-30"), "Current"),
+        ]
+
+    def test_known_segments_are_not_recomputed(self):
+        """A segment aggregate passed in (e.g. from the memo) is used as is."""
+        df = _funnel()
+        keys, metrics = window_keys(df)
+        known = aggregate_segments(df, window_segments(APRIL), keys, metrics)
+        known = {seg: frame.assign(Clicks=0) for seg, frame in known.items()}
+        frame = aggregate_windows(df, {"april": APRIL}, segment_frames=known)["april"]
+        assert frame["Clicks"].sum() == 0
+        in_window = df["Date"].between("2026-03-01", "2026-03-30") | (df["Date"] >= "2026-04-01")
+        assert frame["Cost (GBP)"].sum() == df.loc[in_window, "Cost (GBP)"].sum()
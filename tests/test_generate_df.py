@@ -0,0 +1,46 @@
+"""
+Tests for weekly_reports/generate_df.py table specs.
+"""
+
+import pandas as pd
+
+from weekly_reports.generate_df import TABLE_SPECS, build_table, channel_spec
+
+
+HEADERS = ["Date", "Ad Channel", "Ad Platform", "Channel", "Campaign", "Week number (ISO)", "Month", "Year",
+           "Sessions", "Impressions", "Clicks", "Cost (GBP)", "Transactions", "Transaction Revenue (GBP)",
+           "Search Impressions", "Total Eligible Impressions – Estimated", "Total Absolute Top Impressions"]
+
+
+def _frame():
+    rows = [
+        ["2026-04-01", "Paid Search", "Google Ads", "", "", 14, 4, 2026, 50, 1000, 100, 50.0, 5, 400.0, 800, 1000, 200, "Current"],
+        ["2026-04-02", "Paid Search", "Google Ads", "", "", 14, 4, 2026, 50, 1000, 100, 50.0, 5, 400.0, 800, 1000, 200, "Current"],
+        ["2026-03-01", "Paid Search", "Bing", "", "", 9, 3, 2026, 10, 500, 0, 0.0, 0, 0.0, 100, 400, 50, "Previous"],
+    ]
+    return pd.DataFrame(rows, columns=HEADERS + ["Period"])
+
+
+class TestBuildTable:
+
+    def test_paid_search_ecommerce(self):
+        """Named positions are renamed, the rest keep their sheet header, and ratios are derived after totals."""
+        df = build_table(_frame(), ["Ad Platform", "Period"], channel_spec("Paid Search", "Ecommerce"), "llm_ecommerce")
+        assert df.columns.tolist()[:9] == ["Period", "Ad Platform", "Impressions", "Clicks", "Cost", "Transactions",
+                                          "Transaction Revenue", "Search Impressions",
+                                          "Total Eligible Impressions – Estimated"]
+        total = df.loc[(df["Period"] == "Current") & (df["Ad Platform"] == "Total")].iloc[0]
+        assert total["Clicks"] == 200
+        assert total["ROAS"] == 800.0
+        assert total["Impression Share"] == 80.0
+        bing = df.loc[df["Ad Platform"] == "Bing"].iloc[0]
+        assert bing["CPC"] == 0.0
+
+    def test_time_series_has_no_totals(self):
+        df = build_table(_frame(), ["Week number (ISO)", "Ad Platform"], TABLE_SPECS["paid_ecommerce"], "time_series_ecommerce")
+        assert "Total" not in df["Ad Platform"].tolist()
+        assert df.columns.tolist() == ["Ad Platform", "Week number (ISO)", "Cost", "Transaction Revenue", "ROAS"]
+
+    def test_unreported_channel_has_no_spec(self):
+        assert channel_spec("Organic", "Lead Gen") is None
+        assert channel_spec("Performance Max", "Lead Gen") is TABLE_SPECS[("paid_shopping", "Lead Gen")]
@@ -0,0 +1,46 @@
+"""
+Tests for weekly_reports/get_context_data.py.
+
+load_cube is mocked with an in-memory Funnel Import cube so no network calls are made.
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+with patch("locale.setlocale"):
+    from weekly_reports import get_context_data as context
+
+
+COLUMNS = ["Date", "Ad Channel", "Ad Platform", "Channel", "Campaign", "Week number (ISO)", "Month", "Year",
+           "Sessions", "Impressions", "Clicks", "Cost (GBP)", "Transactions", "Transaction Revenue (GBP)"]
+
+
+def _cube():
+    days = pd.date_range("2026-08-01", "2026-10-20")
+    return pd.DataFrame({
+        "Date": days, "Ad Channel": "Paid Search", "Ad Platform": "Google Ads", "Channel": "Paid",
+        "Campaign": "", "Week number (ISO)": 0, "Month": "", "Year": 0,
+        "Sessions": 10.0, "Impressions": 0.0, "Clicks": 0.0, "Cost (GBP)": 0.0,
+        "Transactions": 1.0, "Transaction Revenue (GBP)": 5.0,
+    })[COLUMNS]
+
+
+@pytest.fixture
+def client():
+    return {"name": "TEST", "account_type": "Ecommerce", "start_date": pd.Timestamp("2026-10-01")}
+
+
+def test_mom_periods_are_calendar_months_in_order(client, monkeypatch):
+    monkeypatch.setattr(context, "yday", pd.Timestamp("2026-10-16"))
+    with patch("weekly_reports.get_context_data.load_cube", return_value=_cube()):
+        payload = context.get_context_data(client)
+
+    assert payload["comparison"]["granularity"] == "Month"
+    assert client["report_dates"] == "MoM"
+    # September's 1st-16th against October's, oldest first
+    assert [row["period"] for row in payload["series"]] == ["2026-09", "2026-10"]
+    assert [row["sessions"] for row in payload["series"]] == [160.0, 160.0]
+    assert payload["series"][0]["transaction_revenue"] == "£80.00"
+    assert payload["series"][0]["aov"] == "£5.00"
@@ -0,0 +1,207 @@
+"""
+Tests for core/get_funnel_data.py.
+
+Sheets access is replaced by fakes and in-memory DataFrames, so no network calls are made.
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+from core import category_dictionary, sheet_cache, snapshot_store
+from core.category_dictionary import encode_dimensions
+from core.funnel_schema import apply_schema
+from core.get_funnel_data import _load_funnel_import, df_to_json, initialise_df, pivot_df, prefetch_funnel_imports, values_to_df
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(tmp_path):
+    sheet_cache.invalidate()
+    with (
+        patch.object(snapshot_store, "SNAPSHOT_ROOT", str(tmp_path / "snapshots")),
+        patch.object(category_dictionary, "DICTIONARY_ROOT", str(tmp_path / "dictionaries")),
+        patch.object(category_dictionary, "_DICTIONARIES", {}),
+        patch("core.get_funnel_data.spreadsheet_revision", return_value="7"),
+    ):
+        yield
+    sheet_cache.invalidate()
+
+
+class FakeSpreadsheet:
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.batches = []
+
+    def values_batch_get(self, ranges):
+        self.batches.append(ranges)
+        titles = [r.strip("'") for r in ranges]
+        return {"valueRanges": [{"range": r, "values": self.tabs[t]} for r, t in zip(ranges, titles)]}
+
+
+def _tab(cost):
+    return [["Date", "Ad Channel", "Cost (GBP)"], ["2026-04-01", "Paid Search", str(cost)], ["2026-04-02", "Display"]]
+
+
+class TestValuesToDf:
+
+    def test_matches_get_all_records_shape(self):
+        """Short rows are padded with blanks, numbers are numericised and Date is parsed."""
+        df = values_to_df(_tab(12))
+        assert df.columns.tolist() == ["Date", "Ad Channel", "Cost (GBP)"]
+        assert df["Cost (GBP)"].tolist() == [12, ""]
+        assert df["Date"].iloc[0] == pd.Timestamp("2026-04-01")
+
+
+class TestDfToJson:
+
+    def test_comparison_payload(self):
+        grouped = pd.DataFrame({
+            "Period": ["Current", "Current", "Previous"],
+            "Ad Platform": ["Google Ads", "Meta", "Google Ads"],
+            "Clicks": [1200, 30, 1000],
+            "Cost": [50.0, 0.0, 40.0],
+            "Unformatted": [1, 2, 3],
+        })
+        metrics = ["Clicks", "Cost", "Unformatted"]
+        df_pivot = pivot_df(grouped, ["Ad Platform", "Period"], metrics, "paid_ecommerce")
+        payload = df_to_json(df_pivot, ["Ad Platform", "Period"], metrics, "paid_ecommerce")
+
+        assert list(payload) == ["Google Ads", "Meta"]
+        assert payload["Google Ads"]["Clicks"] == {
+            "curr": "1,200", "prev": "1,000", "delta": "200", "pct": "+20.00%",
+            "raw": {"curr": 1200, "prev": 1000, "delta": 200, "pct": 20.0},
+        }
+        assert payload["Meta"]["Cost"] == {
+            "curr": "£0.00", "prev": "£0.00", "delta": "£0.00", "pct": "-",
+            "raw": {"curr": 0.0, "prev": None, "delta": None, "pct": None},
+        }
+        assert "Unformatted" not in payload["Meta"]
+
+    def test_repeated_breakdown_keeps_last_row(self):
+        df = pd.DataFrame({"Week number (ISO)": [14, 15, 14], "Clicks": [1, 2, 3]})
+        payload = df_to_json(df, ["Week number (ISO)", "Ad Platform"], ["Clicks"], "time_series_ecommerce")
+        assert payload == {14: {"Clicks": {"curr": "3", "raw": {"curr": 3}}}, 15: {"Clicks": {"curr": "2", "raw": {"curr": 2}}}}
+
+
+class TestPrefetchFunnelImports:
+
+    def test_one_batch_primes_every_client(self):
+        """All tabs come back from a single batchGet and later loads hit the snapshot cache."""
+        sh = FakeSpreadsheet({"A Funnel Import": _tab(1), "B Funnel Import": _tab(2)})
+        with (
+            patch("core.get_funnel_data.open_spreadsheet", return_value=sh),
+            patch("core.get_funnel_data.mirror_is_fresh", return_value=False),
+        ):
+            prefetch_funnel_imports(["A", "B"])
+
+        assert len(sh.batches) == 1
+        loader_calls = []
+        df = sheet_cache.get_snapshot("B", "B Funnel Import", lambda: loader_calls.append(1))
+        assert df["Cost (GBP)"].iloc[0] == 2
+        assert loader_calls == []
+
+    def test_chunks_large_client_lists(self):
+        sh = FakeSpreadsheet({f"{n} Funnel Import": _tab(n) for n in range(25)})
+        with (
+            patch("core.get_funnel_data.open_spreadsheet", return_value=sh),
+            patch("core.get_funnel_data.mirror_is_fresh", return_value=False),
+            patch("core.get_funnel_data.BATCH_FETCH_CHUNK", 10),
+        ):
+            prefetch_funnel_imports([str(n) for n in range(25)])
+        assert [len(b) for b in sh.batches] == [10, 10, 5]
+
+
+class TestInitialiseDf:
+
+    def test_projection_served_from_full_snapshot(self):
+        """A primed full snapshot answers a bounded, projected read without touching Sheets."""
+        sheet_cache.put_snapshot("A", "A Funnel Import", values_to_df(_tab(1)))
+        client = {"name": "A", "data_min_date": pd.Timestamp("2026-04-02")}
+        with (
+            patch("core.get_funnel_data.locale.setlocale"),
+            patch("core.get_funnel_data.get_worksheet", side_effect=AssertionError("no download expected")),
+        ):
+            df = initialise_df(client, columns=["Ad Channel"])
+        assert df.columns.tolist() == ["Date", "Ad Channel"]
+        assert df["Ad Channel"].tolist() == ["Display"]
+
+    def test_projection_served_from_wider_projection(self):
+        """A cached projection with more columns and earlier dates answers a narrower read; one missing a
+        requested column does not."""
+        loads = []
+
+        def load(client_name, worksheet, columns=None, min_date=None):
+            loads.append((columns, min_date))
+            df = values_to_df(_tab(1))
+            return df[[col for col in df.columns if col in set(columns) | {"Date"}]]
+
+        client = {"name": "A"}
+        with (
+            patch("core.get_funnel_data.locale.setlocale"),
+            patch("core.get_funnel_data._load_funnel_import", side_effect=load),
+        ):
+            initialise_df(client, columns=["Ad Channel", "Cost (GBP)"], min_date="2026-04-01")
+            df = initialise_df(client, columns=["Ad Channel"], min_date="2026-04-02")
+            assert len(loads) == 1
+            assert df.columns.tolist() == ["Date", "Ad Channel"]
+            assert df["Ad Channel"].tolist() == ["Display"]
+
+            initialise_df(client, columns=["Ad Channel"], min_date="2026-03-01")
+            initialise_df(client, columns=["Campaign"], min_date="2026-04-02")
+        assert len(loads) == 3
+
+    def test_cached_frame_follows_grown_dictionary(self):
+        """A frame cached before the dictionary grew is read back on the current categories, so it concats
+        with a newer load without falling back to object."""
+        cached = encode_dimensions("A", apply_schema(values_to_df(_tab(1))))
+        sheet_cache.put_snapshot("A", "A Funnel Import", cached)
+        newer = encode_dimensions("A", apply_schema(values_to_df([["Date", "Ad Channel"], ["2026-04-03", "Social"]])))
+        with patch("core.get_funnel_data.locale.setlocale"):
+            df = initialise_df({"name": "A"})
+        assert df["Ad Channel"].cat.categories.tolist() == ["Display", "Paid Search", "Social"]
+        assert df["Ad Channel"].tolist() == ["Paid Search", "Display"]
+        assert pd.concat([df, newer])["Ad Channel"].dtype == "category"
+
+
+class TestRevisionCheck:
+
+    def _worksheet(self, downloads):
+        class FakeWorksheet:
+            def get_all_records(self):
+                downloads.append(1)
+                return [{"Date": "2026-04-01", "Ad Channel": "Paid Search", "Cost (GBP)": 3}]
+        return FakeWorksheet()
+
+    def test_unchanged_revision_reuses_stored_copy(self):
+        """A second load at the same Drive version reads the stored copy instead of downloading."""
+        downloads = []
+        with (
+            patch("core.get_funnel_data.load_mirror", return_value=None),
+            patch("core.get_funnel_data.get_worksheet", return_value=self._worksheet(downloads)),
+        ):
+            first = _load_funnel_import("A", "A Funnel Import")
+            second = _load_funnel_import("A", "A Funnel Import")
+        assert downloads == [1]
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_new_revision_downloads_again(self):
+        downloads = []
+        with (
+            patch("core.get_funnel_data.load_mirror", return_value=None),
+            patch("core.get_funnel_data.get_worksheet", return_value=self._worksheet(downloads)),
+        ):
+            _load_funnel_import("A", "A Funnel Import")
+            with patch("core.get_funnel_data.spreadsheet_revision", return_value="8"):
+                _load_funnel_import("A", "A Funnel Import")
+        assert downloads == [1, 1]
+
+    def test_prefetch_skips_tabs_stored_at_current_revision(self):
+        sh = FakeSpreadsheet({"A Funnel Import": _tab(1), "B Funnel Import": _tab(2)})
+        with (
+            patch("core.get_funnel_data.open_spreadsheet", return_value=sh),
+            patch("core.get_funnel_data.mirror_is_fresh", return_value=False),
+        ):
+            prefetch_funnel_imports(["A", "B"])
+            sheet_cache.invalidate()
+            prefetch_funnel_imports(["A", "B"])
+        assert len(sh.batches) == 1
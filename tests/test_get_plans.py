@@ -0,0 +1,113 @@
+"""
+Tests for core/get_plans.py plan loading and caching.
+
+Plan spreadsheets are fakes holding value grids and the cache is written under tmp_path.
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+
+from core import get_plans
+
+
+def _grid(week_one):
+    return [
+        [""] * 10,
+        [""] * 10,
+        ["", "Task", "Description", "Category", "Status", "Start Date", "End Date", "", "", ""],
+        ["", "Google Ads", "", "", "", "", "", week_one, "13/04/2026", "20/04/2026"],
+        ["", "Build", "Do it", "Active Workstream", "Live", "06/04/2026", "20/04/2026", "", "", ""],
+    ]
+
+
+class FakeWorksheet:
+    def __init__(self, ws_id, title, values, downloads):
+        self.id = ws_id
+        self.title = title
+        self._values = values
+        self._downloads = downloads
+
+    def get_all_values(self):
+        self._downloads.append(self.title)
+        return self._values
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheet_id, worksheets):
+        self.id = sheet_id
+        self._worksheets = worksheets
+
+    def worksheets(self):
+        return self._worksheets
+
+
+@pytest.fixture
+def plan_cache(tmp_path):
+    with patch.object(get_plans, "PLAN_CACHE_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+def _load(sheets, revision):
+    with (
+        patch("core.get_plans.open_spreadsheet", side_effect=lambda url, source: sheets[url]),
+        patch("core.get_plans.spreadsheet_revision", return_value=revision),
+    ):
+        return get_plans._load_client_plans([(name, name) for name in sheets])
+
+
+class TestLoadClientPlans:
+
+    def test_builds_plan_json_for_every_client(self, plan_cache):
+        downloads = []
+        sheets = {
+            "A": FakeSpreadsheet("a", [FakeWorksheet(1, "Q2", _grid("06/04/2026"), downloads),
+                                       FakeWorksheet(2, "Q1", _grid("05/01/2026"), downloads)]),
+            "B": FakeSpreadsheet("b", [FakeWorksheet(1, "Q2", _grid("06/04/2026"), downloads)]),
+        }
+        plans = _load(sheets, "1")
+        assert list(plans["A"]) == ["Q2", "Q1"]
+        assert plans["A"]["Q2"]["plan_status"] == "current"
+        assert plans["A"]["Q1"]["plan_status"] == "old"
+        assert plans["A"]["Q2"]["plan_start"] == "06/04/26"
+        assert plans["B"]["Q2"]["tasks"][0]["platform"] == "Google Ads"
+        assert sorted(downloads) == ["Q1", "Q2", "Q2"]
+
+    def test_unchanged_revision_downloads_nothing(self, plan_cache):
+        downloads = []
+        sheets = {"A": FakeSpreadsheet("a", [FakeWorksheet(1, "Q2", _grid("06/04/2026"), downloads)])}
+        first = _load(sheets, "1")
+        second = _load(sheets, "1")
+        assert downloads == ["Q2"]
+        assert first == second
+
+    def test_edit_refetches_current_tab_only(self, plan_cache):
+        """After an edit the current tab is fetched again; recently cached archive tabs are reused."""
+        downloads = []
+        sheets = {"A": FakeSpreadsheet("a", [FakeWorksheet(1, "Q2", _grid("06/04/2026"), downloads),
+                                             FakeWorksheet(2, "Q1", _grid("05/01/2026"), downloads)])}
+        _load(sheets, "1")
+        downloads.clear()
+        _load(sheets, "2")
+        assert downloads == ["Q2"]
+
+    def test_failed_revision_check_fetches_everything(self, plan_cache):
+        downloads = []
+        sheets = {"A": FakeSpreadsheet("a", [FakeWorksheet(1, "Q2", _grid("06/04/2026"), downloads)])}
+        _load(sheets, "1")
+        _load(sheets, None)
+        assert downloads == ["Q2", "Q2"]
+
+
+class TestGetTasks:
+
+    def test_blank_row_clears_platform_to_none(self):
+        """A blank separator row leaves the tasks under it without a platform, written as JSON null."""
+        grid = _grid("06/04/2026") + [
+            [""] * 10,
+            ["", "Report", "Send it", "", "Live", "07/04/2026", "21/04/2026", "", "", ""],
+        ]
+        tasks = get_plans._parse_plan_values(grid)["tasks"]
+        assert [task["platform"] for task in tasks] == ["Google Ads", None]
+        assert tasks[1]["category"] is None
+        assert json.loads(json.dumps(tasks, allow_nan=False))[1]["platform"] is None
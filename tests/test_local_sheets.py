@@ -0,0 +1,98 @@
+"""
+Tests for core/local_sheets.py and the 'local' backend in core/sheets_session.py.
+
+Spreadsheets are written as CSV/Parquet files under tmp_path.
+"""
+
+import os
+import csv
+import json
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+from core import local_sheets, sheets_session
+from core.sheet_reader import read_worksheet
+
+
+ROWS = [
+    ["Date", "Ad Channel", "Cost (GBP)"],
+    ["2026-04-01", "Paid Search", "12"],
+    ["2026-04-02", "Display", ""],
+    ["2026-04-03", "Paid Search", "4.5"],
+]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+@pytest.fixture
+def local_root(tmp_path):
+    sheet_dir = tmp_path / "Weekly Reports"
+    sheet_dir.mkdir()
+    _write_csv(sheet_dir / "A Funnel Import.csv", ROWS)
+    sheets_session.reset()
+    with patch.object(sheets_session, "BACKEND", "local"), patch.object(local_sheets, "LOCAL_SHEETS_ROOT", str(tmp_path)):
+        yield tmp_path
+    sheets_session.reset()
+
+
+class TestLocalBackend:
+
+    def test_get_all_records_numericises_like_gspread(self, local_root):
+        ws = sheets_session.get_worksheet("A Funnel Import")
+        records = ws.get_all_records()
+        assert records[0] == {"Date": "2026-04-01", "Ad Channel": "Paid Search", "Cost (GBP)": 12}
+        assert records[1]["Cost (GBP)"] == ""
+
+    def test_ranges_trim_like_the_api(self, local_root):
+        ws = sheets_session.get_worksheet("A Funnel Import")
+        assert ws.get("C2:C") == [["12"], [], ["4.5"]]
+        assert ws.batch_get(["A4", "A9"]) == [[["2026-04-03"]], []]
+
+    def test_projected_read_works_offline(self, local_root):
+        ws = sheets_session.get_worksheet("A Funnel Import")
+        df = read_worksheet(ws, columns=["Cost (GBP)"], min_date="2026-04-02")
+        assert df.columns.tolist() == ["Date", "Cost (GBP)"]
+        assert len(df) == 2
+
+    def test_parquet_tabs_and_tab_order(self, local_root):
+        """Parquet cells come back as sheet text and _tabs.json fixes worksheet order."""
+        plan_dir = local_root / "plankey"
+        plan_dir.mkdir()
+        pd.DataFrame({"Week": [1.0, 2.0], "Task": ["x", None]}).to_parquet(plan_dir / "Old.parquet")
+        _write_csv(plan_dir / "Current.csv", [["Week", "Task"], ["3", "y"]])
+        (plan_dir / "_tabs.json").write_text(json.dumps(["Current", "Old"]))
+
+        sh = sheets_session.open_spreadsheet(url="https://docs.google.com/spreadsheets/d/plankey/edit", source="secrets")
+        assert [ws.title for ws in sh.worksheets()] == ["Current", "Old"]
+        assert sh.worksheet("Old").get_all_values() == [["Week", "Task"], ["1", "x"], ["2", ""]]
+
+    def test_revision_changes_when_a_tab_is_rewritten(self, local_root):
+        before = sheets_session.spreadsheet_revision()
+        path = local_root / "Weekly Reports" / "A Funnel Import.csv"
+        _write_csv(path, ROWS[:2])
+        os.utime(path, (0, 10**10))
+        assert sheets_session.spreadsheet_revision() != before
+
+    def test_spreadsheets_open_concurrently(self, local_root):
+        """The handle cache's lock is not held across the open, so two threads open spreadsheets at once."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        (local_root / "Other").mkdir()
+        both_open = threading.Barrier(2, timeout=5)
+        client = sheets_session.get_client()
+        real_open = client.open
+
+        def open_together(name):
+            both_open.wait()
+            return real_open(name)
+
+        with patch.object(client, "open", side_effect=open_together):
+            with ThreadPoolExecutor(2) as pool:
+                handles = list(pool.map(sheets_session.open_spreadsheet, ["Weekly Reports", "Other"]))
+        assert len(handles) == 2
+        assert sheets_session.open_spreadsheet("Weekly Reports") is handles[0]
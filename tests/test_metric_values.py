@@ -0,0 +1,26 @@
+"""
+Tests for core/metric_values.py.
+"""
+
+from core.metric_values import metric_value, strip_raw
+
+
+class TestMetricValue:
+
+    def test_prefers_raw_value(self):
+        vals = {"curr": "£1,234.57", "prev": "£0.00", "raw": {"curr": 1234.5678, "prev": None}}
+        assert metric_value(vals) == 1234.5678
+        assert metric_value(vals, "prev") == 0.0
+
+    def test_parses_display_string_without_raw(self):
+        assert metric_value({"curr": "£1,234.56", "pct": "+12.24%"}) == 1234.56
+        assert metric_value({"curr": "£1,234.56", "pct": "+12.24%"}, "pct") == 12.24
+        assert metric_value({"pct": "-"}, "pct") == 0.0
+        assert metric_value("1,234") == 1234.0
+
+
+class TestStripRaw:
+
+    def test_drops_raw_only_from_metric_payloads(self):
+        payload = {"raw": {"Cost": {"curr": "£1.00", "raw": {"curr": 1.0}}}}
+        assert strip_raw(payload) == {"raw": {"Cost": {"curr": "£1.00"}}}
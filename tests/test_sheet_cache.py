@@ -0,0 +1,103 @@
+"""
+Tests for core/sheet_cache.py.
+
+Loaders are plain callables returning in-memory DataFrames, so no network calls are made.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+from core import sheet_cache
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    sheet_cache.invalidate()
+    yield
+    sheet_cache.invalidate()
+
+
+def _counting_loader(df):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return df
+    return loader, calls
+
+
+class TestGetSnapshot:
+
+    def test_loader_called_once_per_key(self):
+        """Repeated reads of the same worksheet only download it once."""
+        loader, calls = _counting_loader(pd.DataFrame({"Cost": [1.0, 2.0]}))
+        for _ in range(5):
+            sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader)
+        assert len(calls) == 1
+
+    def test_keys_are_independent(self):
+        """Different clients do not share a snapshot."""
+        loader_a, calls_a = _counting_loader(pd.DataFrame({"Cost": [1.0]}))
+        loader_b, calls_b = _counting_loader(pd.DataFrame({"Cost": [2.0]}))
+        a = sheet_cache.get_snapshot("A", "A Funnel Import", loader_a)
+        b = sheet_cache.get_snapshot("B", "B Funnel Import", loader_b)
+        assert a["Cost"].iloc[0] == 1.0
+        assert b["Cost"].iloc[0] == 2.0
+        assert len(calls_a) == len(calls_b) == 1
+
+    def test_caller_writes_do_not_leak(self):
+        """Mutating a returned frame leaves the snapshot seen by the next caller untouched."""
+        loader, _ = _counting_loader(pd.DataFrame({"Cost": [1.0, 2.0]}))
+        first = sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader)
+        first["Cost"] = 0.0
+        first["Period"] = "Current"
+        second = sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader)
+        assert second["Cost"].tolist() == [1.0, 2.0]
+        assert "Period" not in second.columns
+
+    def test_old_pandas_gets_deep_copies(self):
+        """Without copy-on-write (pandas < 3) every caller gets its own copy of the data."""
+        cached = pd.DataFrame({"Cost": [1.0, 2.0]})
+        loader, _ = _counting_loader(cached)
+        with patch.object(sheet_cache, "_SHALLOW_COPY", False):
+            first = sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader)
+            second = sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader)
+        assert not np.shares_memory(first["Cost"].to_numpy(), cached["Cost"].to_numpy())
+        assert not np.shares_memory(second["Cost"].to_numpy(), cached["Cost"].to_numpy())
+
+    def test_ttl_expiry_reloads(self):
+        """A snapshot older than the TTL is downloaded again."""
+        loader, calls = _counting_loader(pd.DataFrame({"Cost": [1.0]}))
+        with patch("core.sheet_cache.time.monotonic", return_value=0.0):
+            sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader, ttl=60)
+        with patch("core.sheet_cache.time.monotonic", return_value=30.0):
+            sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader, ttl=60)
+        with patch("core.sheet_cache.time.monotonic", return_value=61.0):
+            sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader, ttl=60)
+        assert len(calls) == 2
+
+
+class TestInvalidate:
+
+    def test_invalidate_single_client(self):
+        """Invalidating one client forces a reload for that client only."""
+        loader_a, calls_a = _counting_loader(pd.DataFrame({"Cost": [1.0]}))
+        loader_b, calls_b = _counting_loader(pd.DataFrame({"Cost": [2.0]}))
+        sheet_cache.get_snapshot("A", "A Funnel Import", loader_a)
+        sheet_cache.get_snapshot("B", "B Funnel Import", loader_b)
+
+        sheet_cache.invalidate("A")
+        sheet_cache.get_snapshot("A", "A Funnel Import", loader_a)
+        sheet_cache.get_snapshot("B", "B Funnel Import", loader_b)
+        assert len(calls_a) == 2
+        assert len(calls_b) == 1
+
+    def test_put_snapshot_primes_cache(self):
+        """A primed snapshot is served without calling the loader."""
+        sheet_cache.put_snapshot("TEST", "TEST Funnel Import", pd.DataFrame({"Cost": [3.0]}))
+        loader, calls = _counting_loader(pd.DataFrame({"Cost": [1.0]}))
+        df = sheet_cache.get_snapshot("TEST", "TEST Funnel Import", loader)
+        assert df["Cost"].iloc[0] == 3.0
+        assert calls == []
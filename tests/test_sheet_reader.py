@@ -0,0 +1,93 @@
+"""
+Tests for core/sheet_reader.py.
+
+A fake worksheet serves A1 ranges from an in-memory grid, so no network calls are made.
+"""
+
+import re
+import pandas as pd
+from unittest.mock import patch
+
+from core import sheet_reader
+from core.sheet_reader import first_row_on_or_after, read_worksheet
+
+
+HEADER = ["Date", "Ad Channel", "Campaign", "Cost (GBP)", "Clicks"]
+
+
+class FakeWorksheet:
+    """Answers get/batch_get from a grid; blank rows pad the sheet out to row_count like a real tab."""
+
+    def __init__(self, rows, spare_rows=0):
+        self.grid = [HEADER] + [[str(v) for v in r] for r in rows]
+        self.row_count = len(self.grid) + spare_rows
+        self.requests = []
+
+    def row_values(self, n):
+        return self.grid[n - 1]
+
+    def _range(self, a1):
+        m = re.fullmatch(r"([A-Z]+)(\d+)(?::([A-Z]+)(\d*))?", a1)
+        first_col = ord(m.group(1)) - 65
+        last_col = ord(m.group(3) or m.group(1)) - 65
+        first_row = int(m.group(2))
+        last_row = int(m.group(4)) if m.group(4) else (first_row if not m.group(3) else len(self.grid))
+        rows = [r[first_col:last_col + 1] for r in self.grid[first_row - 1:last_row]]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return rows
+
+    def get(self, a1):
+        self.requests.append([a1])
+        return self._range(a1)
+
+    def batch_get(self, ranges):
+        self.requests.append(list(ranges))
+        return [self._range(a1) for a1 in ranges]
+
+
+def _rows(n):
+    start = pd.Timestamp("2025-01-01")
+    return [[(start + pd.Timedelta(days=i)).strftime("%Y-%m-%d"), "Paid Search", f"C{i}", i, 2 * i] for i in range(n)]
+
+
+class TestFirstRowOnOrAfter:
+
+    def test_probes_narrow_large_sheets(self):
+        """A long tab is narrowed with batched probes before one short Date column read."""
+        ws = FakeWorksheet(_rows(400), spare_rows=600)
+        with patch.object(sheet_reader, "PROBE_SPAN", 50):
+            row = first_row_on_or_after(ws, "A", pd.Timestamp("2025-06-01"))
+        assert ws.grid[row - 1][0] == "2025-06-01"
+        assert ws.grid[row - 2][0] == "2025-05-31"
+        assert len(ws.requests) < 6
+
+    def test_date_past_the_end(self):
+        ws = FakeWorksheet(_rows(10))
+        assert first_row_on_or_after(ws, "A", pd.Timestamp("2030-01-01")) == 12
+
+
+class TestReadWorksheet:
+
+    def test_projects_columns_in_one_batch(self):
+        """Only the requested columns (plus Date) are fetched, one range per contiguous block."""
+        ws = FakeWorksheet(_rows(5))
+        df = read_worksheet(ws, columns=["Cost (GBP)", "Clicks"])
+        assert df.columns.tolist() == ["Date", "Cost (GBP)", "Clicks"]
+        assert ws.requests[-1] == ["A2:A", "D2:E"]
+        assert df["Clicks"].tolist() == [0, 2, 4, 6, 8]
+
+    def test_min_date_bounds_rows(self):
+        ws = FakeWorksheet(_rows(30))
+        df = read_worksheet(ws, min_date="2025-01-20")
+        assert df["Date"].min() == pd.Timestamp("2025-01-20")
+        assert len(df) == 11
+        assert df.columns.tolist() == HEADER
+
+    def test_matches_full_read(self):
+        """A bounded read equals the full read filtered to the same dates."""
+        rows = _rows(40)
+        full = sheet_reader.values_to_df([HEADER] + [[str(v) for v in r] for r in rows])
+        bounded = read_worksheet(FakeWorksheet(rows), columns=["Campaign"], min_date="2025-02-01")
+        expected = full.loc[full["Date"] >= "2025-02-01", ["Date", "Campaign"]]
+        pd.testing.assert_frame_equal(bounded.reset_index(drop=True), expected.reset_index(drop=True))
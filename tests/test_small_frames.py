@@ -0,0 +1,40 @@
+"""
+Tests for core/small_frames.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.small_frames import _pivot_periods_pandas, pivot_periods
+
+
+def _rows():
+    return pd.DataFrame({
+        "Period": ["Current", "Previous", "Current", "Current", "Previous", None],
+        "Ad Platform": ["Meta", "Meta", "Google Ads", "Meta", "Google Ads", "Meta"],
+        "Clicks": [1, 2, 3, 4, 5, 6],
+        "Cost": [0.1, 0.2, np.nan, 0.7, 1e16, 3.0],
+    })
+
+
+def _grouped(metrics):
+    return _rows().groupby(["Ad Platform", "Period"], as_index=False)[metrics].sum()
+
+
+class TestPivotPeriods:
+
+    def test_matches_pandas_pivot(self):
+        df = _grouped(["Clicks", "Cost"])
+        pivot = pivot_periods(df, "Ad Platform", "Period", ["Clicks", "Cost"], ["Current", "Previous"])
+        assert pivot.columns.tolist() == ["Ad Platform", "Clicks__current", "Clicks__previous", "Cost__current", "Cost__previous"]
+        assert pivot["Clicks__previous"].tolist() == [5, 2]
+        expected = _pivot_periods_pandas(df, "Ad Platform", "Period", ["Clicks", "Cost"], ["Current", "Previous"])
+        pd.testing.assert_frame_equal(pivot, expected)
+        clicks = pivot_periods(df, "Ad Platform", "Period", ["Clicks"], ["Current", "Previous"])
+        assert clicks["Clicks__current"].dtype == np.int64
+
+    def test_missing_period_is_nan(self):
+        df = _grouped(["Clicks"])
+        df = df[df["Period"] == "Current"]
+        pivot = pivot_periods(df, "Ad Platform", "Period", ["Clicks"], ["Current", "Previous"])
+        assert pivot["Clicks__previous"].isna().all()
@@ -0,0 +1,41 @@
+"""
+Tests for core/time_grains.py.
+"""
+
+import pandas as pd
+
+from core.time_grains import calendar_table, rollup_time, time_grain
+
+
+def _daily():
+    return pd.DataFrame({
+        "Date": pd.to_datetime(["2025-12-29", "2026-01-04", "2026-01-05", "2026-04-01", None]),
+        "Ad Platform": ["Meta", "Meta", "Google Ads", "Meta", "Meta"],
+        "Clicks": [1, 2, 3, 4, 5],
+    })
+
+
+class TestCalendarTable:
+
+    def test_one_row_per_day_with_every_grain(self):
+        cal = calendar_table(_daily()["Date"])
+        assert len(cal) == 4
+        first = cal.iloc[0]
+        assert (first["Week number (ISO)"], first["Month"], first["Quarter"], first["Year"]) == (1, "2025-12", "2025Q4", 2025)
+        assert cal["Month"].tolist() == ["2025-12", "2026-01", "2026-01", "2026-04"]
+
+
+class TestRollupTime:
+
+    def test_grain_labels_follow_rows(self):
+        weeks = time_grain(_daily()["Date"], "Week number (ISO)")
+        assert weeks.tolist()[:4] == [1, 1, 2, 14]
+        assert pd.isna(weeks.iloc[4])
+
+    def test_rolls_day_grain_up(self):
+        df = rollup_time(_daily(), ["Ad Platform", "Month"], ["Clicks"])
+        assert df.values.tolist() == [
+            ["Google Ads", "2026-01", 3], ["Meta", "2025-12", 1], ["Meta", "2026-01", 2], ["Meta", "2026-04", 4],
+        ]
+        by_year = rollup_time(_daily(), ["Year"], ["Clicks"])
+        assert by_year.set_index("Year")["Clicks"].to_dict() == {2025: 1, 2026: 9}
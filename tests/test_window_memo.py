@@ -0,0 +1,117 @@
+"""
+Tests for core/window_memo.py and the memoised window path in core/get_funnel_data.py.
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from core import category_dictionary, funnel_mirror, get_funnel_data, window_memo
+from core.category_dictionary import encode_dimensions
+from core.funnel_schema import apply_schema
+from core.funnel_mirror import MIRROR_LOOKBACK_DAYS
+from core.window_memo import CLOSED_AFTER_DAYS, is_closed
+from tests.test_funnel_windows import APRIL, _funnel
+
+
+@pytest.fixture(autouse=True)
+def _memo_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(window_memo, "MEMO_ROOT", str(tmp_path / "memo"))
+    monkeypatch.setattr(funnel_mirror, "MIRROR_ROOT", str(tmp_path / "mirror"))
+    monkeypatch.setattr(category_dictionary, "DICTIONARY_ROOT", str(tmp_path / "dictionaries"))
+    monkeypatch.setattr(category_dictionary, "_DICTIONARIES", {})
+
+
+def test_is_closed_after_lag():
+    # Segments stay open for as long as GA4 may restate them, the mirror's look-back
+    assert CLOSED_AFTER_DAYS == MIRROR_LOOKBACK_DAYS
+    segment = (pd.Timestamp("2026-04-01"), pd.Timestamp("2026-04-30"), "Current")
+    assert is_closed(segment, pd.Timestamp("2026-04-30") + pd.Timedelta(days=CLOSED_AFTER_DAYS + 1))
+    assert not is_closed(segment, pd.Timestamp("2026-04-30") + pd.Timedelta(days=CLOSED_AFTER_DAYS))
+
+
+class TestMemoAggregateWindows:
+
+    def _run(self, df, loads, window=APRIL):
+        def load_cube(client, dimensions=(), columns=None, min_date=None):
+            loads.append(min_date)
+            return df.loc[df["Date"] >= min_date] if min_date is not None else df
+        with patch("core.get_funnel_data.load_cube", side_effect=load_cube):
+            return get_funnel_data.memo_aggregate_windows({"name": "A"}, {"april": window}, ["Campaign"])
+
+    def test_closed_segments_served_from_memo(self):
+        df = _funnel()
+        # Data running into June, so both April segments are closed relative to the latest day
+        df = pd.concat([df, df.assign(Date=df["Date"] + pd.DateOffset(months=2))], ignore_index=True)
+        first_loads, second_loads = [], []
+        first = self._run(df, first_loads)["april"]
+        # Rows the closed segments covered are gone; the memo still answers for them
+        second = self._run(df.loc[df["Date"] > "2026-04-30"], second_loads)["april"]
+
+        # A cold memo still loads the cube once, from the earliest segment
+        assert first_loads == [pd.Timestamp("2026-03-01")]
+        assert second_loads == [pd.Timestamp("2026-04-01")]
+        pd.testing.assert_frame_equal(second, first, check_dtype=False)
+
+    def test_segments_near_the_latest_data_are_not_memoised(self):
+        loads = []
+        self._run(_funnel(), [])
+        self._run(_funnel(), loads)
+        # The March segment was memoised; April ends on the last day of data, so it is read again
+        assert loads == [pd.Timestamp("2026-04-01")]
+
+    def test_restated_days_inside_the_look_back_reach_the_tables(self):
+        """A segment ending a few days (more than the old 2-day lag) before the latest data stays open, so an
+        updated sheet changes its aggregate instead of the memo answering for it."""
+        window = {**APRIL, "end_date": pd.Timestamp("2026-04-25")}
+        df = _funnel()
+        first = self._run(df, [], window)["april"]
+        restated = df.assign(Clicks=df["Clicks"].where(df["Date"] != "2026-04-24", 1000))
+        second = self._run(restated, [], window)["april"]
+
+        current = lambda frame: frame.loc[frame["Period"] == "Current", "Clicks"].sum()
+        assert current(second) == current(first) + 2 * (1000 - 24)
+
+    def test_memo_from_an_older_layout_reloads_its_rows(self):
+        df = _funnel()
+        df = pd.concat([df, df.assign(Date=df["Date"] + pd.DateOffset(months=2))], ignore_index=True)
+        self._run(df, [])
+        loads = []
+        moved = df.assign(Extra="")
+        frame = self._run(moved, loads)["april"]
+        assert loads == [pd.Timestamp("2026-04-01"), pd.Timestamp("2026-03-01")]
+        assert frame.columns.tolist()[-2:] == ["Extra", "Period"]
+        assert frame.loc[frame["Period"] == "Previous", "Clicks"].sum() > 0
+
+    def test_memoised_segments_follow_a_grown_dictionary(self):
+        """A segment pickled before the dictionary grew is read back on the current categories, so it concats
+        with segments aggregated from a newer cube and the table stays categorical."""
+        self._run(encode_dimensions("A", apply_schema(_funnel())), [])
+        encode_dimensions("A", apply_schema(_funnel().assign(Campaign="Generic")))
+        frame = self._run(encode_dimensions("A", apply_schema(_funnel())), [])["april"]
+        assert frame["Campaign"].dtype == "category"
+        assert frame["Campaign"].cat.categories.tolist() == ["", "Brand", "Generic"]
+
+    def test_new_mirror_generation_recomputes_closed_segments(self):
+        """After a full mirror pull (a restatement further back than the look-back, say) closed segments are
+        aggregated again instead of coming from the memo."""
+        df = _funnel()
+        df = pd.concat([df, df.assign(Date=df["Date"] + pd.DateOffset(months=2))], ignore_index=True)
+        first = self._run(df, [])["april"]
+        restated = df.assign(Clicks=df["Clicks"].where(df["Date"] != "2026-04-10", 1000))
+        loads = []
+        with patch("core.window_memo.mirror_generation", return_value="2026-07-01T00:00:00"):
+            second = self._run(restated, loads)["april"]
+        assert loads == [pd.Timestamp("2026-03-01")]
+        current = lambda frame: frame.loc[frame["Period"] == "Current", "Clicks"].sum()
+        assert current(second) == current(first) + 2 * (1000 - 10)
+
+    def test_invalidate_drops_the_clients_memo(self):
+        df = _funnel()
+        df = pd.concat([df, df.assign(Date=df["Date"] + pd.DateOffset(months=2))], ignore_index=True)
+        self._run(df, [])
+        window_memo.invalidate("A")
+        loads = []
+        self._run(df, loads)
+        assert loads == [pd.Timestamp("2026-03-01")]
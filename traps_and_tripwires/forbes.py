@@ -2,11 +2,11 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import gspread
 import pandas as pd
 from datetime import datetime
-from oauth2client.service_account import ServiceAccountCredentials
+from core.sheets_session import get_worksheet
 from core.get_run_rate import tat_get_run_rate
+from core.date_index import sort_by_date, window_rows
 
 # Maps budget sheet abbreviations to raw funnel data Department column values
 FORBES_DEPARTMENT_MAP = {
@@ -28,15 +28,7 @@ STATUS_EMOJI = {"pass": "✅", "warn": "⚠️", "fail": "🔴", "skip": "➖"}
 
 def load_forbes_department_budgets():
     """Read Traps & Tripwires Budgets tab. Returns {raw_dept_name: budget_float}."""
-    scope = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_name('storage/creds.json', scope)
-    sa = gspread.authorize(creds)
-    sh = sa.open('Weekly Reports')
-    ws = sh.worksheet('Traps & Tripwires Budgets')
+    ws = get_worksheet('Traps & Tripwires Budgets')
     rows = ws.get_all_values()
 
     budget_col_name = f"{datetime.today().strftime('%b')} BUDGET"
@@ -101,17 +93,22 @@ def get_forbes_raw_departments(df):
     return sorted(d for d in df[col].unique() if d not in excluded)
 
 
+def _in_period(client, df):
+    df = sort_by_date(df)
+    return df.iloc[window_rows(df, [(client['start_date'], client['end_date'])])]
+
+
 def check_department_budget_pacing(client, df, dept_name, dept_budget):
     """Budget pacing for a single Forbes department. Returns (status, detail)."""
     col = _dept_col(df)
-    dept_df = df[df[col] == dept_name].copy().reset_index(drop=True)
-    date_mask = (
-        (dept_df['Date'] >= client['start_date']) &
-        (dept_df['Date'] <= client['end_date'])
-    )
-    dept_df = dept_df.loc[date_mask]
-    spend = pd.to_numeric(dept_df.iloc[:, 11], errors='coerce').sum() if not dept_df.empty else 0.0
+    dept_df = _in_period(client, df)
+    dept_df = dept_df.loc[dept_df[col] == dept_name]
+    spend = dept_df.iloc[:, 11].sum() if not dept_df.empty else 0.0
+    return department_budget_pacing(client, spend, dept_budget)
+
 
+def department_budget_pacing(client, spend, dept_budget):
+    """Budget pacing from a department's spend to date. Returns (status, detail)."""
     if dept_budget is None:
         return 'skip', f"No budget configured — spend to date £{spend:,.0f}"
     if dept_budget == 0:
@@ -132,10 +129,19 @@ def check_department_budget_pacing(client, df, dept_name, dept_budget):
 
 def run_forbes_department_checks(client, df, dept_budgets):
     """Returns list of (dept_name, (status, detail)) for all departments in funnel data."""
+    departments = get_forbes_raw_departments(df)
+    if not departments:
+        return []
+
+    # Spend for every department from one date filter and one groupby, rather than a masked copy per department
+    col = _dept_col(df)
+    in_period = _in_period(client, df)
+    spend = in_period.iloc[:, 11].groupby(in_period[col], observed=True, sort=False).sum()
+
     results = []
-    for dept in get_forbes_raw_departments(df):
+    for dept in departments:
         budget = dept_budgets.get(dept)
-        result = check_department_budget_pacing(client, df, dept, budget)
+        result = department_budget_pacing(client, spend.get(dept, 0.0), budget)
         results.append((dept, result))
     return results
 
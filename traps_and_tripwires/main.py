@@ -9,7 +9,8 @@ from datetime import datetime, timedelta
 from core.error_logger import log_error
 from core.get_config import init_clients
 from core.config_dates import config_dates
-from core.get_funnel_data import initialise_df, apply_filters
+from core.client_config import get_clients
+from core.get_funnel_data import load_cube, apply_filters, prefetch_funnel_imports
 from core.get_run_rate import tat_get_run_rate
 from weekly_reports.generate_df import *
 from traps_and_tripwires.forbes import (
@@ -30,8 +31,8 @@ def check_budget_pacing(client, df):
         "end_date": client['end_date'],
     }
 
-    df = apply_filters(df.copy(), client, ['Week number (ISO)', 'Ad Platform'], date_range)
-    spend = pd.to_numeric(df.iloc[:,11], errors='coerce').sum()
+    df = apply_filters(df, client, ['Week number (ISO)', 'Ad Platform'], date_range)
+    spend = df.iloc[:, 11].sum()
     budget = float(budget_str.replace(',', ''))
     if budget == 0:
         return 'skip', 'Budget is zero — department paused'
@@ -51,11 +52,11 @@ def check_conversion_tracking(client, df):
         "start_date": client['end_date'] - timedelta(days=7),
         "end_date": client['end_date'],
     }
-    df = apply_filters(df.copy(), client, ['Date', 'Channel'], date_range)
+    df = apply_filters(df, client, ['Date', 'Channel'], date_range)
 
     daily = (
-        df.groupby('Date')
-        .apply(lambda x: pd.to_numeric(x.iloc[:, 11], errors='coerce').sum(), include_groups=False)
+        df.groupby('Date')[df.columns[12]]
+        .sum()
         .reset_index()
         .sort_values('Date')
     )
@@ -81,11 +82,9 @@ def check_campaign_spend(client, df):
             "start_date": client['end_date'] - timedelta(days=3),
             "end_date": client['end_date'],
         }
-    df = apply_filters(df.copy(), client, ['Ad Platform', 'Date'], date_range)
-    if client['account_type'] == 'Ecommerce':
-        df = paid_ecommerce(df, ['Date', 'Ad Platform'], '')
-    else:
-        df = paid_lead_gen(df, ['Date', 'Ad Platform'], '')
+    df = apply_filters(df, client, ['Ad Platform', 'Date'], date_range)
+    table = 'paid_ecommerce' if client['account_type'] == 'Ecommerce' else 'paid_lead_gen'
+    df = build_table(df, ['Date', 'Ad Platform'], TABLE_SPECS[table], '')
     
     platform_col = df.columns[0]
     date_col = df.columns[1]
@@ -102,7 +101,7 @@ def check_campaign_spend(client, df):
 
     for platform in df[platform_col].unique():
         platform_df = df[df[platform_col] == platform].sort_values(date_col)
-        daily_cost = pd.to_numeric(platform_df[cost_col], errors='coerce').fillna(0)
+        daily_cost = platform_df[cost_col].fillna(0)
 
         streak = 0
         for val in reversed(daily_cost.values):
@@ -124,7 +123,7 @@ def check_campaign_spend(client, df):
 
 
 def run_checks(client):
-    df = initialise_df(client)
+    df = load_cube(client)
     return [
         {"name": "Budget Pacing",        "result": check_budget_pacing(client, df)},
         {"name": "Conversion Tracking",  "result": check_conversion_tracking(client, df)},
@@ -246,8 +245,7 @@ def main():
     slack_token = secrets["slack_bot_token"]
     slack_channel = "C093QSSCU1L"            #Official channel: C093QSSCU1L; Test: C05510P0Z7G
 
-    with open("storage/config.json") as f:
-        clients = json.load(f)
+    clients = get_clients()
 
     date_str = datetime.today().strftime("%a %d %b")
 
@@ -258,6 +256,8 @@ def main():
     if any(c['name'] == 'Forbes' for c in clients):
         forbes_dept_budgets = load_forbes_department_budgets()
 
+    prefetch_funnel_imports([c['name'] for c in clients])
+
     client_results = []
     client_channels = {}
     forbes_dept_results = []
@@ -268,12 +268,14 @@ def main():
         now = pd.Timestamp.now()
         client['start_date'] = now.replace(day=1).normalize()
         client['end_date'] = (now - pd.DateOffset(days=2)).normalize() + pd.Timedelta(days=1)
+        # The checks look back at most a week before end_date; load_cube keeps nothing older
+        client['data_min_date'] = min(client['start_date'], client['end_date'] - timedelta(days=7))
         client_channels[client['name']] = client.get('slack_channel_id', '')
         try:
             checks = run_checks(client)
             client_results.append((client["name"], checks))
             if client['name'] == 'Forbes':
-                forbes_df = initialise_df(client)
+                forbes_df = load_cube(client, ['Department'])
                 forbes_dept_results = run_forbes_department_checks(client, forbes_df, forbes_dept_budgets)
         except Exception as e:
             log_error(f"Checks failed for {client['name']}: {e}")
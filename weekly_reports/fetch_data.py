@@ -7,7 +7,8 @@ import argparse
 import pandas as pd
 from core.error_logger import log_error
 from core.config_dates import config_dates
-from core.get_funnel_data import get_funnel_data
+from core.client_config import get_client_config
+from core.get_funnel_data import get_funnel_data_windows, window_range
 from core.get_run_rate import get_run_rate
 from core.get_plans import get_client_plan
 
@@ -20,10 +21,7 @@ class TimestampEncoder(json.JSONEncoder):
 
 
 def fetch_client_data(client_name):
-    with open("storage/config.json", "r") as f:
-        clients = json.load(f)
-
-    client = next((c for c in clients if c['name'] == client_name), None)
+    client = get_client_config(client_name)
     if client is None:
         raise ValueError(f"Client '{client_name}' not found in config")
 
@@ -43,15 +41,7 @@ def fetch_client_data(client_name):
         overall_type = 'overall_lead_gen'     if account_type == 'Lead Gen' else 'overall_ecommerce'
         ts_type      = 'time_series_lead_gen' if account_type == 'Lead Gen' else 'time_series_ecommerce'
 
-        # Primary comparison dates already set by config_dates
-        primary_compare_start = client['compare_start_date']
-        primary_compare_end   = client['compare_end_date']
-
-        primary_paid    = get_funnel_data(client, paid_type)
-        primary_llm     = get_funnel_data(client, llm_type)
-        primary_overall = get_funnel_data(client, overall_type)
-
-        # Secondary comparison: opposite window to primary
+        # Secondary comparison window: opposite to primary
         if client['comparison_dates'] == 'MTD Monthly Comparison':
             sec_start = (client['start_date'] - pd.DateOffset(years=1)).normalize()
             sec_end   = (client['end_date']   - pd.DateOffset(years=1)).normalize()
@@ -59,18 +49,21 @@ def fetch_client_data(client_name):
             sec_start = (client['start_date'] - pd.DateOffset(months=1)).normalize()
             sec_end   = (client['end_date']   - pd.DateOffset(months=1)).normalize()
 
-        client['compare_start_date'] = sec_start
-        client['compare_end_date']   = sec_end
-        sec_paid    = get_funnel_data(client, paid_type)
-        sec_llm     = get_funnel_data(client, llm_type)
-        sec_overall = get_funnel_data(client, overall_type)
+        # Primary comparison dates already set by config_dates; every window is aggregated in one pass
+        comparison_types = [paid_type, llm_type, overall_type]
+        primary = window_range(client, paid_type)
+        secondary = {**primary, 'compare_start_date': sec_start, 'compare_end_date': sec_end}
+        tables = get_funnel_data_windows(client, {
+            'primary':    (primary, comparison_types),
+            'secondary':  (secondary, comparison_types),
+            'timeseries': (window_range(client, ts_type), [ts_type]),
+        })
 
-        # Restore primary compare dates
-        client['compare_start_date'] = primary_compare_start
-        client['compare_end_date']   = primary_compare_end
+        primary_paid, primary_llm, primary_overall = (tables['primary'][t] for t in comparison_types)
+        sec_paid, sec_llm, sec_overall = (tables['secondary'][t] for t in comparison_types)
 
         # Timeseries (90-day, no comparison window needed)
-        timeseries = get_funnel_data(client, ts_type)
+        timeseries = tables['timeseries'][ts_type]
 
         # Assign sections
         if client['comparison_dates'] == 'MTD Monthly Comparison':
@@ -1,831 +1,141 @@
 import pandas as pd
 import json
-from core.safe_div import safe_div
-
-def get_total_row(df, period_label, dim_cols=2):
-    # Initialise the total row as a dictionary
-    total_row = {
-        df.columns[0]: period_label,
-        df.columns[1]: "Total",
-        **df.iloc[:, dim_cols:].sum(numeric_only=True).to_dict()
-    }
-    # Return the dicitonary concated on the end of the dataframe
-    return pd.concat([df, pd.DataFrame([total_row])], ignore_index=True)
-
-# Email Data for Paid Ecomm
-def paid_ecommerce(df, breakdown_dimension, table_type):
-    headers = list(df.columns.values)
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[11], headers[13]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)    
-
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Cost',
-        numeric_headers[1]: 'Transaction Revenue'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Email Data for Paid Lead Gen
-def paid_lead_gen(df, breakdown_dimension, table_type):
-    # Group, filter and clean Dataframes
-    headers = list(df.columns.values)
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[11], headers[12]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Cost',
-        numeric_headers[1]: 'Conversions',
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-    return(df_grouped)
-
-# Paid Search Ecommerce
-def paid_search_ecommerce(df, breakdown_dimension, headers, table_type):
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13], headers[14], headers[15], headers[16]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Transactions',
-        numeric_headers[4]: 'Transaction Revenue'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-    df_grouped['Impression Share'] = safe_div(
-        df_grouped['Search Impressions'],
-        df_grouped['Total Eligible Impressions – Estimated'],
-        multiplier = 100
-    )
-    df_grouped['Abs. Top Impression Share'] = safe_div(
-        df_grouped['Total Absolute Top Impressions'],
-        df_grouped['Search Impressions'],
-        multiplier = 100
-    )
-
-    return(df_grouped)
-
-# Paid Search Lead Gen
-def paid_search_lead_gen(df, breakdown_dimension, headers, table_type):
-    # Group, filter and clean Dataframes
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13], headers[14], headers[15]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Conversions'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-    df_grouped['Impression Share'] = safe_div(
-        df_grouped['Search Impressions'],
-        df_grouped['Total Eligible Impressions – Estimated'],
-        multiplier = 100
-    )
-    df_grouped['Abs. Top Impression Share'] = safe_div(
-        df_grouped['Total Absolute Top Impressions'],
-        df_grouped['Search Impressions'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Paid Shopping Ecommerce
-def paid_shopping_ecommerce(df, breakdown_dimension, headers, table_type):
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13], headers[14], headers[15]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Transactions',
-        numeric_headers[4]: 'Transaction Revenue'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-    df_grouped['Impression Share'] = safe_div(
-        df_grouped['Search Impressions'],
-        df_grouped['Total Eligible Impressions – Estimated'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Paid Shopping Lead Gen
-def paid_shopping_lead_gen(df, breakdown_dimension, headers, table_type): 
-    # Group, filter and clean Dataframes
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Conversions'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-
-    return(df_grouped)
-
-# Paid Video Lead gen
-def paid_video_lead_gen(df, breakdown_dimension, headers, table_type):
-    # Group, filter and clean Dataframes
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[16], headers[17], headers[18]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Conversions',
-        numeric_headers[4]: 'Views',
-        numeric_headers[5]: 'Hooks',
-        numeric_headers[6]: 'Holds'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-    df_grouped['View Rate'] = safe_div(
-        df_grouped['Views'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hook Rate'] = safe_div(
-        df_grouped['Hooks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hold Rate'] = safe_div(
-        df_grouped['Holds'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Paid Video Ecommerce
-def paid_video_ecommerce(df, breakdown_dimension, headers, table_type):
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13], headers[17],headers[18],headers[19]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Transactions',
-        numeric_headers[4]: 'Transaction Revenue',
-        numeric_headers[5]: 'Views',
-        numeric_headers[6]: 'Hooks',
-        numeric_headers[7]: 'Holds'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-
-    df_grouped['View Rate'] = safe_div(
-        df_grouped['Views'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hook Rate'] = safe_div(
-        df_grouped['Hooks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hold Rate'] = safe_div(
-        df_grouped['Holds'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Paid Display Lead gen
-def paid_display_lead_gen(df, breakdown_dimension, headers, table_type):
-    # Group, filter and clean Dataframes
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Conversions'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-    return(df_grouped)
-
-# Paid Display Ecommerce
-def paid_display_ecommerce(df, breakdown_dimension, headers, table_type):
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Transactions',
-        numeric_headers[4]: 'Transaction Revenue'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-    return(df_grouped)
-
-# Paid Social Video Lead gen
-def paid_social_video_lead_gen(df, breakdown_dimension, headers, table_type):
-    # Group, filter and clean Dataframes
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[17], headers[18]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Conversions',
-        numeric_headers[4]: 'Hooks',
-        numeric_headers[5]: 'Holds'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-    df_grouped['Hook Rate'] = safe_div(
-        df_grouped['Hooks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hold Rate'] = safe_div(
-        df_grouped['Holds'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Paid Social Video Ecommerce
-def paid_social_video_ecommerce(df, breakdown_dimension, headers, table_type):
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13], headers[18], headers[19]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Transactions',
-        numeric_headers[4]: 'Transaction Revenue',
-        numeric_headers[5]: 'Hooks',
-        numeric_headers[6]: 'Holds'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-    df_grouped['Hook Rate'] = safe_div(
-        df_grouped['Hooks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hold Rate'] = safe_div(
-        df_grouped['Holds'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    return(df_grouped)
-
-# Paid Social Static Lead gen
-def paid_social_static_lead_gen(df, breakdown_dimension, headers, table_type):
-    # Group, filter and clean Dataframes
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost'})
-
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)   
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Conversions'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 1
-    )
-    return(df_grouped)
-
-# Paid Social Static Ecommerce
-def paid_social_static_ecommerce(df, breakdown_dimension, headers, table_type):
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[9], headers[10], headers[11], headers[12], headers[13]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={"Cost (GBP)": 'Cost','Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Impressions',
-        numeric_headers[1]: 'Clicks',
-        numeric_headers[2]: 'Cost',
-        numeric_headers[3]: 'Transactions',
-        numeric_headers[4]: 'Transaction Revenue'
-        })
-
-    # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-    return(df_grouped)
-
-def overall_ecommerce(df, breakdown_dimension, table_type):
-    # Group, filter and clean Dataframes
-    headers = list(df.columns.values)
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[8], headers[12], headers[13]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={'Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Sessions',
-        numeric_headers[1]: 'Transactions',
-        numeric_headers[2]: 'Transaction Revenue'
-        })
-    # Get Secondary Metrics
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Sessions'],
-        multiplier = 100
-    )
-    
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-
-    return(df_grouped)
-
-def overall_lead_gen(df, breakdown_dimension, table_type):
-    # Group, filter and clean Dataframes
-    headers = list(df.columns.values)
-    headers = [breakdown_dimension[1], breakdown_dimension[0], headers[8], headers[12]]
-    numeric_headers = headers[2:]
-    df_grouped = df[headers].copy()
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False).sum()
-    df_grouped = df_grouped.rename(columns={'Transaction Revenue (GBP)': 'Transaction Revenue'})
-    
-    # Add a total row for each period
-    if table_type in ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]:
-        curr_df = get_total_row(df_grouped[df_grouped["Period"].eq("Current")].copy(), "Current")
-        prev_df = get_total_row(df_grouped[df_grouped["Period"].eq("Previous")].copy(), "Previous")
-        df_grouped = pd.concat([curr_df, prev_df], ignore_index=True)
-    
-    # Standardise Column Names
-    df_grouped = df_grouped.rename(columns={
-        numeric_headers[0]: 'Sessions',
-        numeric_headers[1]: 'Conversions',
-        })
-    # Get Secondary Metrics
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Sessions'],
-        multiplier = 100
-    )
-    return(df_grouped)
+from core.derived_metrics import *
+from core.funnel_rollup import TOTAL_LABEL, TOTAL_PERIODS, rollup, rollup_totals
+
+# Table types that get a Current and Previous total row
+TOTAL_TABLE_TYPES = ["paid_lead_gen", "paid_ecommerce", "overall_lead_gen", "overall_ecommerce", "llm_lead_gen", "llm_ecommerce"]
+
+PAID_ECOMMERCE = ['Impressions', 'Clicks', 'Cost', 'Transactions', 'Transaction Revenue']
+PAID_LEAD_GEN = ['Impressions', 'Clicks', 'Cost', 'Conversions']
+
+# Each table is declared by the Funnel Import positions it sums (see core/funnel_schema), the names those
+# columns are reported under (positionally; any column past the end of names keeps its sheet header) and
+# the derived metrics added on top, in output order.
+TABLE_SPECS = {
+    # Email tables
+    'paid_ecommerce': {'columns': [11, 13], 'names': ['Cost', 'Transaction Revenue'], 'derived': [ROAS]},
+    'paid_lead_gen': {'columns': [11, 12], 'names': ['Cost', 'Conversions'], 'derived': [CPA]},
+    'overall_ecommerce': {
+        'columns': [8, 12, 13],
+        'names': ['Sessions', 'Transactions', 'Transaction Revenue'],
+        'derived': [SESSION_TRANSACTION_RATE, AOV],
+    },
+    'overall_lead_gen': {
+        'columns': [8, 12],
+        'names': ['Sessions', 'Conversions'],
+        'derived': [SESSION_CONVERSION_RATE],
+    },
+
+    # Per channel tables
+    ('paid_search', 'Ecommerce'): {
+        'columns': [9, 10, 11, 12, 13, 14, 15, 16],
+        'names': PAID_ECOMMERCE,
+        'derived': [CTR, CPC, TRANSACTION_RATE, ROAS, AOV, IMPRESSION_SHARE, ABS_TOP_IMPRESSION_SHARE],
+    },
+    ('paid_search', 'Lead Gen'): {
+        'columns': [9, 10, 11, 12, 13, 14, 15],
+        'names': PAID_LEAD_GEN,
+        'derived': [CTR, CPC, CONVERSION_RATE, CPA, IMPRESSION_SHARE, ABS_TOP_IMPRESSION_SHARE],
+    },
+    ('paid_shopping', 'Ecommerce'): {
+        'columns': [9, 10, 11, 12, 13, 14, 15],
+        'names': PAID_ECOMMERCE,
+        'derived': [CTR, CPC, TRANSACTION_RATE, ROAS, AOV, IMPRESSION_SHARE],
+    },
+    ('paid_shopping', 'Lead Gen'): {
+        'columns': [9, 10, 11, 12],
+        'names': PAID_LEAD_GEN,
+        'derived': [CTR, CPC, CONVERSION_RATE, CPA],
+    },
+    ('paid_video', 'Ecommerce'): {
+        'columns': [9, 10, 11, 12, 13, 17, 18, 19],
+        'names': PAID_ECOMMERCE + ['Views', 'Hooks', 'Holds'],
+        'derived': [CTR, CPC, TRANSACTION_RATE, ROAS, AOV, VIEW_RATE, HOOK_RATE, HOLD_RATE],
+    },
+    ('paid_video', 'Lead Gen'): {
+        'columns': [9, 10, 11, 12, 16, 17, 18],
+        'names': PAID_LEAD_GEN + ['Views', 'Hooks', 'Holds'],
+        'derived': [CTR, CPC, CONVERSION_RATE, CPA, VIEW_RATE, HOOK_RATE, HOLD_RATE],
+    },
+    ('paid_display', 'Ecommerce'): {
+        'columns': [9, 10, 11, 12, 13],
+        'names': PAID_ECOMMERCE,
+        'derived': [CTR, CPC, TRANSACTION_RATE, ROAS, AOV],
+    },
+    ('paid_display', 'Lead Gen'): {
+        'columns': [9, 10, 11, 12],
+        'names': PAID_LEAD_GEN,
+        'derived': [CTR, CPC, CONVERSION_RATE, CPA],
+    },
+    ('paid_social_video', 'Ecommerce'): {
+        'columns': [9, 10, 11, 12, 13, 18, 19],
+        'names': PAID_ECOMMERCE + ['Hooks', 'Holds'],
+        'derived': [CTR, CPC, TRANSACTION_RATE, ROAS, AOV, HOOK_RATE, HOLD_RATE],
+    },
+    ('paid_social_video', 'Lead Gen'): {
+        'columns': [9, 10, 11, 12, 17, 18],
+        'names': PAID_LEAD_GEN + ['Hooks', 'Holds'],
+        'derived': [CTR, CPC, CONVERSION_RATE, CPA, HOOK_RATE, HOLD_RATE],
+    },
+    ('paid_social_static', 'Ecommerce'): {
+        'columns': [9, 10, 11, 12, 13],
+        'names': PAID_ECOMMERCE,
+        'derived': [CTR, CPC, TRANSACTION_RATE, ROAS, AOV],
+    },
+    ('paid_social_static', 'Lead Gen'): {
+        'columns': [9, 10, 11, 12],
+        'names': PAID_LEAD_GEN,
+        'derived': [CTR, CPC, CONVERSION_RATE, CPA],
+    },
+}
+
+# The table each Ad Channel is reported with; channels not listed are left out of the llm data
+CHANNEL_TABLES = {
+    'Paid Search': 'paid_search',
+    'Shopping': 'paid_shopping',
+    'Combined': 'paid_shopping',
+    'Performance Max': 'paid_shopping',
+    'Display': 'paid_display',
+    'Video': 'paid_video',
+    'Paid Social Video': 'paid_social_video',
+    'Paid Social Static': 'paid_social_static',
+    'Paid Social': 'paid_social_static',
+}
+
+
+def channel_spec(channel, account_type):
+    """The TABLE_SPECS entry for an Ad Channel, or None if the channel is not reported."""
+    table = CHANNEL_TABLES.get(channel)
+    if table is None:
+        return None
+    return TABLE_SPECS[(table, 'Lead Gen' if account_type == 'Lead Gen' else 'Ecommerce')]
+
+
+def spec_sources(headers, spec):
+    """The sheet headers a spec sums, looked up by position."""
+    return [headers[i] for i in spec['columns']]
+
+
+# Sum a spec's columns by breakdown, add the period totals, apply the standard names and derive the ratios.
+# headers is the sheet's header row, which the spec's positions index into (defaults to df's own columns).
+def build_table(df, breakdown_dimension, spec, table_type, headers=None):
+    sources = spec_sources(headers if headers is not None else df.columns, spec)
+    df_grouped = df.groupby([breakdown_dimension[1], breakdown_dimension[0]], as_index=False, observed=True)[sources].sum()
+    return finish_table(df_grouped, sources, spec, table_type)
+
+
+# The steps after grouping, for a frame already summed by [breakdown_dimension[1], breakdown_dimension[0]]
+def finish_table(df_grouped, sources, spec, table_type):
+    # Add a total row for each period
+    if table_type in TOTAL_TABLE_TYPES:
+        df_grouped = rollup_totals(df_grouped, df_grouped.columns[:2].tolist(), sources)
+
+    # Standardise Column Names
+    df_grouped = df_grouped.rename(columns=dict(zip(sources, spec['names'])))
+
+    # Get Secondary Metrics
+    return add_derived(df_grouped, spec['derived'])
 
 
 def graph_ecommerce(df, filters, x_col, start, end):
@@ -852,8 +162,7 @@ def graph_ecommerce(df, filters, x_col, start, end):
             df_grouped = df_grouped[df_grouped[dim] == val]
 
     # Group
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby(x_col, as_index=False)[numeric_headers].sum()
+    df_grouped = df_grouped.groupby(x_col, as_index=False, observed=True)[numeric_headers].sum()
 
     # Rename Columns
     df_grouped = df_grouped.rename(columns={
@@ -862,53 +171,9 @@ def graph_ecommerce(df, filters, x_col, start, end):
         })
 
     # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Transactions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['ROAS'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Cost'],
-        multiplier = 100
-    )
-    df_grouped['AOV'] = safe_div(
-        df_grouped['Transaction Revenue'],
-        df_grouped['Transactions'],
-        multiplier = 1
-    )
-    df_grouped['Hook Rate'] = safe_div(
-        df_grouped['Hooks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hold Rate'] = safe_div(
-        df_grouped['Holds'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-
-    df_grouped['Impression Share'] = safe_div(
-        df_grouped['Search Impressions'],
-        df_grouped['Total Eligible Impressions – Estimated'],
-        multiplier = 100
-    )
-    df_grouped['Abs. Top Impression Share'] = safe_div(
-        df_grouped['Total Absolute Top Impressions'],
-        df_grouped['Search Impressions'],
-        multiplier = 100
-    )
+    df_grouped = add_derived(df_grouped, [
+        CTR, CPC, TRANSACTION_RATE, ROAS, AOV, HOOK_RATE, HOLD_RATE, IMPRESSION_SHARE, ABS_TOP_IMPRESSION_SHARE,
+    ])
 
     return(df_grouped)
 
@@ -934,8 +199,7 @@ def graph_lead_gen(df, filters, x_col, start, end):
             df_grouped = df_grouped[df_grouped[dim] == val]
 
     # Group
-    df_grouped[numeric_headers] = df_grouped[numeric_headers].apply(pd.to_numeric, errors="coerce")
-    df_grouped = df_grouped.groupby(x_col, as_index=False)[numeric_headers].sum()
+    df_grouped = df_grouped.groupby(x_col, as_index=False, observed=True)[numeric_headers].sum()
 
     # Rename Columns
     df_grouped = df_grouped.rename(columns={
@@ -944,48 +208,8 @@ def graph_lead_gen(df, filters, x_col, start, end):
         })
 
     # Get Secondary Metrics
-    df_grouped['CTR'] = safe_div(
-        df_grouped['Clicks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['CPC'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Clicks'],
-        multiplier = 1
-    ) 
-    df_grouped['Conversion Rate'] = safe_div(
-        df_grouped['Conversions'],
-        df_grouped['Clicks'],
-        multiplier = 100
-    )
-
-    df_grouped['CPA'] = safe_div(
-        df_grouped['Cost'],
-        df_grouped['Conversions'],
-        multiplier = 100
-    )
-
-    df_grouped['Hook Rate'] = safe_div(
-        df_grouped['Hooks'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-    df_grouped['Hold Rate'] = safe_div(
-        df_grouped['Holds'],
-        df_grouped['Impressions'],
-        multiplier = 100
-    )
-
-    df_grouped['Impression Share'] = safe_div(
-        df_grouped['Search Impressions'],
-        df_grouped['Total Eligible Impressions – Estimated'],
-        multiplier = 100
-    )
-    df_grouped['Abs. Top Impression Share'] = safe_div(
-        df_grouped['Total Absolute Top Impressions'],
-        df_grouped['Search Impressions'],
-        multiplier = 100
-    )
+    df_grouped = add_derived(df_grouped, [
+        CTR, CPC, CONVERSION_RATE, CPA, HOOK_RATE, HOLD_RATE, IMPRESSION_SHARE, ABS_TOP_IMPRESSION_SHARE,
+    ])
 
     return(df_grouped)
\ No newline at end of file
@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
 import locale
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from core.safe_div import safe_div
+from core.derived_metrics import add_derived, AOV, SESSION_TRANSACTION_RATE, SESSION_CONVERSION_RATE
+from core.get_funnel_data import load_cube
+from core.date_index import sort_by_date, window_rows
+from core.time_grains import rollup_time
 from pandas.tseries.offsets import MonthEnd
 
 
@@ -13,12 +14,6 @@ np.seterr(divide='ignore', invalid='ignore')
 pd.options.mode.chained_assignment = None  # default='warn'
 np.seterr(divide='ignore', invalid='ignore')
 
-scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive.file", "https://www.googleapis.com/auth/drive"]
-creds = ServiceAccountCredentials.from_json_keyfile_name('storage/creds.json', scope)
-sa = gspread.authorize(creds)
-
-# Initial Config -- Declare Global Variables and initialise datasets (filename=serene-lotus-379510-b3f9b3b23758)
-sh = sa.open('Weekly Reports')
 locale.setlocale(locale.LC_ALL, 'en_GB.UTF-8')
 
 # Time Variables
@@ -31,9 +26,7 @@ first_of_current_month = now.replace(day=1).normalize()
 end_of_current_month = now + pd.offsets.MonthEnd(0)
 
 def get_context_data(client):
-    ws = sh.worksheet(f"{client['name']} Funnel Import")
-    df = pd.DataFrame(ws.get_all_records())
-    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+    df = load_cube(client)
     yoy_date_check = (client['start_date'] - pd.DateOffset(years=1)).normalize()   
     # Minimum date in the dataset
     min_date = df['Date'].min()
@@ -44,21 +37,21 @@ def get_context_data(client):
         client['report_dates'] = 'YoY'
         granularity = 'Year'
         # Needs ad platform filter
-        mask = ((df['Date'] >= client['start_date']) & (df['Date'] <= yday)) | ((df['Date'] >= first_compare) & (df['Date'] <= yday_compare))
-        df = df.loc[mask]
-        group = df.groupby(['Year'])
+        group_by = 'Year'
     else: 
         first_compare = (client['start_date'] - pd.DateOffset(months=1)).normalize()
         yday_compare = (yday - pd.DateOffset(months=1)).normalize()
         client['report_dates'] = 'MoM'
         granularity = 'Month'
-        mask = ((df['Date'] >= client['start_date']) & (df['Date'] <= yday)) | ((df['Date'] >= first_compare) & (df['Date'] <= yday_compare))
-        df = df.loc[mask]
-        group = df.groupby(['Month'])
+        group_by = 'Month'
+    # Both periods sliced from the Date-sorted cube, then rolled up to the comparison grain
+    df = sort_by_date(df)
+    df = df.iloc[window_rows(df, [(client['start_date'], yday), (first_compare, yday_compare)])]
     if client['account_type'] == 'Ecommerce':
-        new_df=ecomm_context(df,group)
+        new_df=ecomm_context(df, group_by)
     else:
-        new_df=lead_gen_context(df,group)
+        new_df=lead_gen_context(df, group_by)
+    new_df.index.name = granularity
 
     # Build JSON object (dict) instead of returning a dataframe
     payload = {
@@ -93,7 +86,7 @@ def get_context_data(client):
                 "period": row[granularity],
                 "sessions": float(row["Sessions"]) if pd.notna(row["Sessions"]) else 0.0,
                 "transactions": float(row["Transactions"]) if pd.notna(row["Transactions"]) else 0.0,
-                "transaction_revenue": f"£{float(row["Transaction Revenue"]):.2f}" if pd.notna(row["Transaction Revenue"]) else "£0.00",
+                "transaction_revenue": f"£{float(row['Transaction Revenue']):.2f}" if pd.notna(row["Transaction Revenue"]) else "£0.00",
                 "conversion_rate": f"{float(row['Conversion Rate']):.0%}" if pd.notna(row["Conversion Rate"]) else "0%",
                 "aov": f"£{float(row['AOV']):.2f}" if pd.notna(row["AOV"]) else "£0.00",
             })
@@ -109,56 +102,27 @@ def get_context_data(client):
     return payload
 
 
-def ecomm_context(df,group):
-    # Sum of the main columns
-    df[df.columns[8]] = pd.to_numeric(df[df.columns[8]])
-    sessions = group[df.columns[8]].sum()
-    df[df.columns[12]] = pd.to_numeric(df[df.columns[12]])
-    transactions = group[df.columns[12]].sum()
-    df[df.columns[13]] = pd.to_numeric(df[df.columns[13]])
-    transaction_revenue = group[df.columns[13]].sum()
-
-    # Concatenate the columns
-    new_df = pd.concat([sessions, transactions, transaction_revenue], axis='columns', sort=False)
-    # Get the calculated columns
-    new_df['Conversion Rate'] = safe_div(
-        new_df[new_df.columns[1]],
-        new_df[new_df.columns[0]],
-        multiplier = 1
-    )
-    new_df['AOV'] = safe_div(
-        new_df[new_df.columns[2]],
-        new_df[new_df.columns[1]],
-        multiplier = 1
-    ) 
+def ecomm_context(df, group_by):
+    # Sum of the main columns at the comparison grain
+    new_df = rollup_time(df, [group_by], [df.columns[8], df.columns[12], df.columns[13]]).set_index(group_by)
+    new_df.columns = ['Sessions', 'Transactions', 'Transaction Revenue']
+    # Get the calculated columns; the context reports conversion rate as a fraction
+    new_df = add_derived(new_df, [SESSION_TRANSACTION_RATE, AOV])
+    new_df['Conversion Rate'] = new_df['Conversion Rate'] / 100
     new_df = new_df.astype('float64')
-    new_df = new_df.round({new_df.columns[0]: 0, new_df.columns[1]: 0, new_df.columns[2]: 2, new_df.columns[3]: 2, new_df.columns[4]: 2})
-
-    new_df = new_df.rename(columns={new_df.columns[0]: 'Sessions'})
-    new_df = new_df.rename(columns={new_df.columns[1]: 'Transactions'})
-    new_df = new_df.rename(columns={new_df.columns[2]: 'Transaction Revenue'})
+    new_df = new_df.round({'Sessions': 0, 'Transactions': 0, 'Transaction Revenue': 2, 'Conversion Rate': 2, 'AOV': 2})
     return new_df
 
 
-def lead_gen_context(df,group):
-    # Sum of the main columns
-    df[df.columns[8]] = pd.to_numeric(df[df.columns[8]])
-    sessions = group[df.columns[8]].sum()
-    df[df.columns[12]] = pd.to_numeric(df[df.columns[12]])
-    leads = group[df.columns[12]].sum()
-
-    # Concatenate the columns
-    new_df = pd.concat([sessions, leads], axis='columns', sort=False)
-    # Get the calculated columns
-    new_df['Conversion Rate'] = safe_div(
-        new_df[new_df.columns[1]],
-        new_df[new_df.columns[0]],
-        multiplier = 1
-    )
-
+def lead_gen_context(df, group_by):
+    # Sum of the main columns at the comparison grain
+    new_df = rollup_time(df, [group_by], [df.columns[8], df.columns[12]]).set_index(group_by)
+    new_df.columns = ['Sessions', 'Conversions']
+    # Get the calculated columns; the context reports conversion rate as a fraction
+    new_df = add_derived(new_df, [SESSION_CONVERSION_RATE])
+    new_df['Conversion Rate'] = new_df['Conversion Rate'] / 100
     new_df = new_df.astype('float64')
-    new_df = new_df.round({new_df.columns[0]: 0, new_df.columns[1]: 0, new_df.columns[2]: 2})
+    new_df = new_df.round({'Sessions': 0, 'Conversions': 0, 'Conversion Rate': 2})
 
-    new_df = new_df.rename(columns={new_df.columns[0]: 'Sessions'})
-    new_df = new_df.rename(columns={new_df.columns[1]: 'Leads'})
+    new_df = new_df.rename(columns={'Conversions': 'Leads'})
     return new_df
\ No newline at end of file
@@ -2,21 +2,20 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import json
 from datetime import datetime
 from core.error_logger import log_error
+from core.client_config import get_clients
 from core.generate_commentary import generate_weekly_commentary
+from core.get_funnel_data import prefetch_funnel_imports
 from weekly_reports.fetch_data import fetch_client_data
 from send_email import send_email
 
 
 def main():
-    with open("storage/config.json", "r") as f:
-        clients = json.load(f)
+    due = [c for c in get_clients() if c['report_due_date'] == datetime.today().strftime("%A")]
+    prefetch_funnel_imports([c['name'] for c in due])
 
-    for config in clients:
-        if config['report_due_date'] != datetime.today().strftime("%A"):
-            continue
+    for config in due:
         print(config['name'])
 
         try: